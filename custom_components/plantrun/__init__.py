@@ -19,6 +19,7 @@ from homeassistant.core import HomeAssistant, ServiceCall
 from homeassistant.exceptions import ServiceValidationError
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.event import async_call_later, async_track_utc_time_change
 
 from .const import (
     ACTIVE_RUN_STRATEGIES,
@@ -29,19 +30,47 @@ from .const import (
     ATTR_STRICT_ACTIVE_RESOLUTION,
     ATTR_USE_ACTIVE_RUN,
     ALLOWED_METRIC_TYPES,
+    CONF_ALERT_RULES,
+    DAILY_ROLLUP_UTC_HOUR,
+    DAILY_ROLLUP_UTC_MINUTE,
+    DEFAULT_ROLLUP_PAGE_SIZE,
     DOMAIN,
     INITIAL_PHASE_NAME,
+    MAX_ROLLUP_PAGE_SIZE,
+    METRIC_METADATA,
     PLATFORMS,
+    ROLLUP_RESOLUTION_DAILY,
+    ROLLUP_RESOLUTIONS,
+    ROLLUP_STARTUP_DELAY_S,
     UNSUPPORTED_BINDING_METRIC_TYPES,
 )
+from .alerts import parse_alert_rules
 from .coordinator import PlantRunCoordinator
+from .downsample import (
+    DEFAULT_SERIES_POINTS,
+    DOWNSAMPLE_METHOD_LTTB,
+    DOWNSAMPLE_METHODS,
+    MAX_SERIES_POINTS,
+    DownsampledSeriesCache,
+    build_aligned_series,
+)
 from .history_context import build_binding_history_context
+from .ingestion import SampleIngestor
+from .maintenance import async_run_maintenance
 from .models import Binding, CultivarSnapshot, Note, Phase, RunData
+from .resample import DEFAULT_RESAMPLE_INTERVAL_S, MIN_RESAMPLE_INTERVAL_S, RESAMPLE_METHOD_MEAN, RESAMPLE_METHODS
 from . import providers_seedfinder as _providers_seedfinder
-from .retention import async_capture_daily_rollup, get_summary_with_rollup_fallback
+from .retention import (
+    async_capture_daily_rollup,
+    async_capture_daily_rollups,
+    build_rollup_columns,
+    get_summary_with_rollup_fallback,
+)
 from .run_resolution import resolve_run_or_raise
+from .source_dispatcher import SourceStateDispatcher
 from .store import PlantRunStorage
-from .summary import summary_energy_preferences_from_options
+from .summary import clear_final_summary, freeze_final_summary, summary_energy_preferences_from_options
+from .tariff import bind_price_entity, time_zone_from_name
 
 async_fetch_cultivar_image = _providers_seedfinder.async_fetch_cultivar_image
 async_search_cultivar = _providers_seedfinder.async_search_cultivar
@@ -97,23 +126,36 @@ def _write_uploaded_image(output_dir: Path, output_name: str, raw: bytes) -> Non
     (output_dir / output_name).write_bytes(raw)
 
 
-def _storage_for_hass(hass: HomeAssistant) -> PlantRunStorage | None:
-    """Return the first configured PlantRun storage instance."""
+def _runtime_data_for_hass(hass: HomeAssistant) -> dict[str, Any] | None:
+    """Return runtime data of the first configured PlantRun entry."""
     domain_data = hass.data.get(DOMAIN, {})
     for entry_data in domain_data.values():
-        if isinstance(entry_data, dict) and "storage" in entry_data:
-            storage = entry_data["storage"]
-            if isinstance(storage, PlantRunStorage):
-                return storage
+        if isinstance(entry_data, dict) and isinstance(entry_data.get("storage"), PlantRunStorage):
+            return entry_data
     return None
 
 
+def _storage_for_hass(hass: HomeAssistant) -> PlantRunStorage | None:
+    """Return the first configured PlantRun storage instance."""
+    runtime_data = _runtime_data_for_hass(hass)
+    return runtime_data["storage"] if runtime_data is not None else None
+
+
 def _summary_energy_preferences_for_hass(hass: HomeAssistant) -> dict[str, Any]:
     """Return normalized pricing preferences for the single configured entry."""
     entries = hass.config_entries.async_entries(DOMAIN)
     if not entries:
         return summary_energy_preferences_from_options(None)
-    return summary_energy_preferences_from_options(entries[0].options)
+    preferences = summary_energy_preferences_from_options(
+        entries[0].options,
+        time_zone=time_zone_from_name(getattr(getattr(hass, "config", None), "time_zone", None)),
+    )
+    tariff = preferences["energy_tariff"]
+    if tariff is not None and tariff.price_entity_id:
+        states = getattr(hass, "states", None)
+        state = states.get(tariff.price_entity_id) if states is not None and hasattr(states, "get") else None
+        preferences["energy_tariff"] = bind_price_entity(tariff, state)
+    return preferences
 
 
 def _source_entity_exists(hass: HomeAssistant, entity_id: str) -> bool:
@@ -144,7 +186,25 @@ def _async_remove_obsolete_legacy_entities(hass: HomeAssistant, entry: ConfigEnt
     return removed
 
 
-@websocket_api.websocket_command({"type": "plantrun/get_runs"})
+def _run_payload(run: RunData, *, include_history: bool) -> dict[str, Any]:
+    """Serialize one run for websocket consumers, optionally without raw history."""
+    payload = run.to_dict()
+    payload.pop("energy_state", None)
+    payload.pop("final_summary", None)
+    if not include_history:
+        history = payload.pop("sensor_history", None) or {}
+        payload["sensor_history_counts"] = {
+            metric_type: len(points) for metric_type, points in history.items() if isinstance(points, list)
+        }
+    return payload
+
+
+@websocket_api.websocket_command(
+    {
+        "type": "plantrun/get_runs",
+        vol.Optional("include_history", default=True): bool,
+    }
+)
 @websocket_api.async_response
 async def websocket_get_runs(hass: HomeAssistant, connection: Any, msg: dict[str, Any]) -> None:
     """Return full PlantRun runtime state for the sidebar dashboard."""
@@ -153,10 +213,11 @@ async def websocket_get_runs(hass: HomeAssistant, connection: Any, msg: dict[str
         connection.send_error(msg["id"], "not_loaded", "PlantRun is not loaded")
         return
 
+    include_history = msg.get("include_history", True)
     connection.send_result(
         msg["id"],
         {
-            "runs": [run.to_dict() for run in storage.runs],
+            "runs": [_run_payload(run, include_history=include_history) for run in storage.runs],
             "active_run_id": storage.active_run_id,
         },
     )
@@ -176,7 +237,7 @@ async def websocket_get_run(hass: HomeAssistant, connection: Any, msg: dict[str,
         connection.send_error(msg["id"], "not_found", f"Run '{msg['run_id']}' not found")
         return
 
-    connection.send_result(msg["id"], {"run": run.to_dict()})
+    connection.send_result(msg["id"], {"run": _run_payload(run, include_history=True)})
 
 
 @websocket_api.websocket_command({"type": "plantrun/get_run_summary", "run_id": str})
@@ -244,6 +305,135 @@ async def websocket_get_run_binding_history_context(
     )
 
 
+@websocket_api.websocket_command(
+    {
+        "type": "plantrun/get_run_binding_series",
+        "run_id": str,
+        "binding_id": str,
+        vol.Optional("points", default=DEFAULT_SERIES_POINTS): vol.All(
+            vol.Coerce(int), vol.Range(min=2, max=MAX_SERIES_POINTS)
+        ),
+        vol.Optional("method", default=DOWNSAMPLE_METHOD_LTTB): vol.In(DOWNSAMPLE_METHODS),
+    }
+)
+@websocket_api.async_response
+async def websocket_get_run_binding_series(
+    hass: HomeAssistant, connection: Any, msg: dict[str, Any]
+) -> None:
+    """Return a downsampled run-window chart series for one run binding."""
+    runtime_data = _runtime_data_for_hass(hass)
+    if runtime_data is None:
+        connection.send_error(msg["id"], "not_loaded", "PlantRun is not loaded")
+        return
+
+    storage: PlantRunStorage = runtime_data["storage"]
+    run = storage.get_run(msg["run_id"])
+    if run is None:
+        connection.send_error(msg["id"], "not_found", f"Run '{msg['run_id']}' not found")
+        return
+
+    binding = run.get_binding(msg["binding_id"])
+    if binding is None:
+        connection.send_error(
+            msg["id"],
+            "not_found",
+            f"Binding '{msg['binding_id']}' not found on run '{run.id}'",
+        )
+        return
+
+    cache: DownsampledSeriesCache = runtime_data.setdefault("series_cache", DownsampledSeriesCache())
+    series = cache.get_or_build(
+        run,
+        binding.metric_type,
+        revision=storage.run_revision(run.id),
+        max_points=msg.get("points", DEFAULT_SERIES_POINTS),
+        method=msg.get("method", DOWNSAMPLE_METHOD_LTTB),
+    )
+    connection.send_result(msg["id"], {**series, "binding_id": binding.id})
+
+
+@websocket_api.websocket_command(
+    {
+        "type": "plantrun/get_run_aligned_series",
+        "run_id": str,
+        "metric_types": vol.All(
+            [vol.In([metric for metric in ALLOWED_METRIC_TYPES if metric not in UNSUPPORTED_BINDING_METRIC_TYPES])],
+            vol.Length(min=1),
+        ),
+        vol.Optional("interval_s", default=DEFAULT_RESAMPLE_INTERVAL_S): vol.All(
+            vol.Coerce(int), vol.Range(min=MIN_RESAMPLE_INTERVAL_S)
+        ),
+        vol.Optional("method", default=RESAMPLE_METHOD_MEAN): vol.In(RESAMPLE_METHODS),
+        vol.Optional("fill_forward", default=False): bool,
+    }
+)
+@websocket_api.async_response
+async def websocket_get_run_aligned_series(
+    hass: HomeAssistant, connection: Any, msg: dict[str, Any]
+) -> None:
+    """Return several run metrics resampled onto one shared time grid."""
+    storage = _storage_for_hass(hass)
+    if storage is None:
+        connection.send_error(msg["id"], "not_loaded", "PlantRun is not loaded")
+        return
+
+    run = storage.get_run(msg["run_id"])
+    if run is None:
+        connection.send_error(msg["id"], "not_found", f"Run '{msg['run_id']}' not found")
+        return
+
+    connection.send_result(
+        msg["id"],
+        build_aligned_series(
+            run,
+            list(dict.fromkeys(msg["metric_types"])),
+            interval_s=msg.get("interval_s", DEFAULT_RESAMPLE_INTERVAL_S),
+            method=msg.get("method", RESAMPLE_METHOD_MEAN),
+            fill_forward=msg.get("fill_forward", False),
+        ),
+    )
+
+
+@websocket_api.websocket_command(
+    {
+        "type": "plantrun/get_run_rollups",
+        "run_id": str,
+        vol.Optional("resolution", default=ROLLUP_RESOLUTION_DAILY): vol.In(ROLLUP_RESOLUTIONS),
+        vol.Optional("start_day"): str,
+        vol.Optional("end_day"): str,
+        vol.Optional("limit", default=DEFAULT_ROLLUP_PAGE_SIZE): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_ROLLUP_PAGE_SIZE)
+        ),
+        vol.Optional("cursor"): str,
+    }
+)
+@websocket_api.async_response
+async def websocket_get_run_rollups(hass: HomeAssistant, connection: Any, msg: dict[str, Any]) -> None:
+    """Return a columnar, paginated page of daily/weekly/monthly rollups for one run."""
+    storage = _storage_for_hass(hass)
+    if storage is None:
+        connection.send_error(msg["id"], "not_loaded", "PlantRun is not loaded")
+        return
+
+    run = storage.get_run(msg["run_id"])
+    if run is None:
+        connection.send_error(msg["id"], "not_found", f"Run '{msg['run_id']}' not found")
+        return
+
+    connection.send_result(
+        msg["id"],
+        build_rollup_columns(
+            storage,
+            run.id,
+            resolution=msg.get("resolution", ROLLUP_RESOLUTION_DAILY),
+            start_day=msg.get("start_day"),
+            end_day=msg.get("end_day"),
+            limit=msg.get("limit", DEFAULT_ROLLUP_PAGE_SIZE),
+            cursor=msg.get("cursor"),
+        ),
+    )
+
+
 @websocket_api.websocket_command(
     {
         "type": "plantrun/search_cultivar",
@@ -328,6 +518,9 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         websocket_api.async_register_command(hass, websocket_get_run)
         websocket_api.async_register_command(hass, websocket_get_run_summary)
         websocket_api.async_register_command(hass, websocket_get_run_binding_history_context)
+        websocket_api.async_register_command(hass, websocket_get_run_binding_series)
+        websocket_api.async_register_command(hass, websocket_get_run_aligned_series)
+        websocket_api.async_register_command(hass, websocket_get_run_rollups)
         websocket_api.async_register_command(hass, websocket_search_cultivar)
         hass.data[DOMAIN]["_ws_registered"] = True
 
@@ -336,10 +529,21 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     coordinator = PlantRunCoordinator(hass, storage)
     await coordinator.async_refresh()
+    entry.async_on_unload(coordinator.async_shutdown)
+
+    # Proxies and sample ingestion share one subscription and normalization per source.
+    source_dispatcher = SourceStateDispatcher(hass, METRIC_METADATA)
+    entry.async_on_unload(source_dispatcher.async_shutdown)
+    ingestor = SampleIngestor(hass, storage, source_dispatcher)
+    ingestor.async_start()
+    entry.async_on_unload(ingestor.async_shutdown)
 
     runtime_data = {
         "storage": storage,
         "coordinator": coordinator,
+        "series_cache": DownsampledSeriesCache(),
+        "source_dispatcher": source_dispatcher,
+        "ingestor": ingestor,
     }
     hass.data[DOMAIN][entry.entry_id] = runtime_data
     entry.runtime_data = runtime_data
@@ -371,9 +575,6 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         except ValueError as err:
             raise ServiceValidationError(f"Run resolution failed: {err}") from err
 
-    async def refresh_after_update() -> None:
-        await coordinator.async_request_refresh()
-
     async def handle_create_daily_rollup(call: ServiceCall) -> None:
         """Capture one daily summary snapshot for a target run."""
         run = resolve_target_run(call)
@@ -382,7 +583,46 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             run,
             **_summary_energy_preferences_for_hass(hass),
         )
-        await refresh_after_update()
+
+    async def async_capture_scheduled_rollups(_now: datetime | None = None) -> None:
+        """Capture missing closed-day rollups, then run background storage maintenance, saving once."""
+        async with storage.async_batched_saves():
+            captured = await async_capture_daily_rollups(
+                storage,
+                **_summary_energy_preferences_for_hass(hass),
+            )
+            report = await async_run_maintenance(
+                storage,
+                executor=hass.async_add_executor_job,
+                **_summary_energy_preferences_for_hass(hass),
+            )
+        if captured:
+            _LOGGER.info(
+                "Captured %s scheduled daily rollup(s) across %s run(s).",
+                sum(len(days) for days in captured.values()),
+                len(captured),
+            )
+        if report["orphaned_runs"] or report["compacted_runs"]:
+            _LOGGER.info(
+                "Storage maintenance pruned rollups of %s orphaned run(s) and compacted %s ended run(s), "
+                "dropping %s history point(s) and reclaiming %s bytes.",
+                report["orphaned_runs"],
+                report["compacted_runs"],
+                report["dropped_points"],
+                report["reclaimed_bytes"],
+            )
+
+    entry.async_on_unload(
+        async_track_utc_time_change(
+            hass,
+            async_capture_scheduled_rollups,
+            hour=DAILY_ROLLUP_UTC_HOUR,
+            minute=DAILY_ROLLUP_UTC_MINUTE,
+            second=0,
+        )
+    )
+    # Backfill days missed while Home Assistant was down, shortly after startup.
+    entry.async_on_unload(async_call_later(hass, ROLLUP_STARTUP_DELAY_S, async_capture_scheduled_rollups))
 
     async def handle_create_run(call: ServiceCall) -> None:
         """Handle the create_run service."""
@@ -398,7 +638,6 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         )
         await storage.async_add_run(new_run)
         await storage.async_set_active_run_id(new_run.id)
-        await refresh_after_update()
         _LOGGER.info("Created new run: %s", new_run.id)
 
     async def handle_add_phase(call: ServiceCall) -> None:
@@ -425,16 +664,18 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         if canonical_phase == "Harvested":
             run.end_time = now
             run.status = "ended"
+            ingestor.async_flush_run(run.id)
+            freeze_final_summary(run, **_summary_energy_preferences_for_hass(hass))
             if storage.active_run_id == run.id:
                 replacement = next((r.id for r in storage.runs if r.status == "active"), None)
                 await storage.async_set_active_run_id(replacement)
         else:
             run.end_time = None
             run.status = "active"
+            clear_final_summary(run)
             await storage.async_set_active_run_id(run.id)
 
         await storage.async_update_run(run)
-        await refresh_after_update()
         _LOGGER.info("Added phase %s to run %s", canonical_phase, run.id)
 
     async def handle_add_note(call: ServiceCall) -> None:
@@ -444,7 +685,6 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         now = datetime.now(timezone.utc).isoformat()
         run.notes.append(Note(text=text, timestamp=now))
         await storage.async_update_run(run)
-        await refresh_after_update()
         _LOGGER.info("Added note to run %s", run.id)
 
     async def handle_update_note(call: ServiceCall) -> None:
@@ -460,7 +700,6 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         note.text = new_text
         note.timestamp = datetime.now(timezone.utc).isoformat()
         await storage.async_update_run(run)
-        await refresh_after_update()
         _LOGGER.info("Updated note %s on run %s", note_id, run.id)
 
     async def handle_delete_note(call: ServiceCall) -> None:
@@ -474,7 +713,6 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             raise ServiceValidationError(f"Note '{note_id}' not found on run '{run.id}'.")
 
         await storage.async_update_run(run)
-        await refresh_after_update()
         _LOGGER.info("Deleted note %s from run %s", note_id, run.id)
 
     async def handle_end_run(call: ServiceCall) -> None:
@@ -486,12 +724,14 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         run.status = "ended"
         if run.phases:
             run.phases[-1].end_time = end_time
+        # Samples still buffered belong in the frozen summary; those after end_time are dropped.
+        ingestor.async_flush_run(run.id)
+        freeze_final_summary(run, **_summary_energy_preferences_for_hass(hass))
 
         await storage.async_update_run(run)
         if storage.active_run_id == run.id:
             replacement = next((r.id for r in storage.runs if r.status == "active"), None)
             await storage.async_set_active_run_id(replacement)
-        await refresh_after_update()
         _LOGGER.info("Ended run %s", run.id)
 
     async def handle_set_cultivar(call: ServiceCall) -> None:
@@ -537,7 +777,6 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             )
 
         await storage.async_update_run(run)
-        await refresh_after_update()
 
     async def handle_add_binding(call: ServiceCall) -> None:
         """Handle the add_binding service."""
@@ -568,7 +807,6 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         run.bindings.append(binding)
 
         await storage.async_update_run(run)
-        await refresh_after_update()
         _LOGGER.info(
             "Bound %s to %s for run %s (binding_id=%s)",
             sensor_id,
@@ -611,7 +849,6 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
         run.bindings = [item for item in run.bindings if item.id != binding.id]
         await storage.async_update_run(run)
-        await refresh_after_update()
         _LOGGER.info(
             "Removed binding %s from run %s (metric_type=%s, sensor_id=%s)",
             binding.id,
@@ -660,7 +897,6 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         binding.metric_type = new_metric_type
         binding.sensor_id = new_sensor_id
         await storage.async_update_run(run)
-        await refresh_after_update()
         _LOGGER.info(
             "Updated binding %s on run %s to metric_type=%s sensor_id=%s",
             binding.id,
@@ -691,6 +927,10 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             base_config = call.data["base_config"]
             if not isinstance(base_config, dict):
                 raise ServiceValidationError("base_config must be an object/map.")
+            try:
+                parse_alert_rules(base_config.get(CONF_ALERT_RULES))
+            except ValueError as err:
+                raise ServiceValidationError(str(err)) from err
             run.base_config = base_config
 
         if "image_url" in call.data:
@@ -698,8 +938,11 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         if "image_source" in call.data:
             run.image_source = call.data["image_source"]
 
+        if any(field in call.data for field in ("friendly_name", "status", "base_config")):
+            # Name, status and metric ranges feed the summary; refreeze lazily on next read.
+            clear_final_summary(run)
+
         await storage.async_update_run(run)
-        await refresh_after_update()
 
     async def handle_set_run_image(call: ServiceCall) -> None:
         """Handle image upload URL assignment for a run."""
@@ -744,7 +987,6 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             raise ServiceValidationError("Provide either image_data or image_url.")
 
         await storage.async_update_run(run)
-        await refresh_after_update()
 
     run_resolution_schema = {
         vol.Optional(ATTR_RUN_ID): str,
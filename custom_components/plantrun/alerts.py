@@ -0,0 +1,197 @@
+"""Per-run threshold alert rules evaluated incrementally on source events."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Mapping
+
+from .const import CONF_ALERT_RULES, DEFAULT_ALERT_MIN_DURATION_S
+from .models import RunData
+
+ALERT_KIND_HIGH = "high"
+ALERT_KIND_LOW = "low"
+ALERT_STATE_TRIGGERED = "triggered"
+ALERT_STATE_CLEARED = "cleared"
+
+
+def _to_float(value: Any) -> float | None:
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass(frozen=True)
+class AlertRule:
+    """Thresholds for one metric of one run.
+
+    An excursion beyond ``high`` or ``low`` must last ``min_duration_s`` before
+    the alert triggers; it clears once the value is back inside the band by
+    more than ``hysteresis``.
+    """
+
+    metric_type: str
+    high: float | None = None
+    low: float | None = None
+    hysteresis: float = 0.0
+    min_duration_s: float = DEFAULT_ALERT_MIN_DURATION_S
+
+    @classmethod
+    def from_config(cls, metric_type: str, config: Mapping[str, Any]) -> "AlertRule":
+        """Parse one rule; raises ValueError for malformed values."""
+        if not isinstance(config, Mapping):
+            raise ValueError(f"Alert rule for '{metric_type}' must be an object/map.")
+        values: dict[str, float | None] = {}
+        for key in ("high", "low", "hysteresis", "min_duration_s"):
+            raw = config.get(key)
+            value = _to_float(raw)
+            if raw is not None and value is None:
+                raise ValueError(f"Alert rule '{metric_type}.{key}' must be a number.")
+            values[key] = value
+        high, low = values["high"], values["low"]
+        if high is None and low is None:
+            raise ValueError(f"Alert rule for '{metric_type}' needs 'high' and/or 'low'.")
+        if high is not None and low is not None and low >= high:
+            raise ValueError(f"Alert rule for '{metric_type}' needs 'low' below 'high'.")
+        hysteresis = values["hysteresis"] or 0.0
+        min_duration_s = values["min_duration_s"]
+        if hysteresis < 0 or (min_duration_s is not None and min_duration_s < 0):
+            raise ValueError(f"Alert rule for '{metric_type}' cannot use negative hysteresis or duration.")
+        return cls(
+            metric_type=metric_type,
+            high=high,
+            low=low,
+            hysteresis=hysteresis,
+            min_duration_s=min_duration_s if min_duration_s is not None else DEFAULT_ALERT_MIN_DURATION_S,
+        )
+
+
+def parse_alert_rules(raw: Any) -> dict[str, AlertRule]:
+    """Parse ``base_config["alert_rules"]`` strictly; raises ValueError when malformed."""
+    if raw is None:
+        return {}
+    if not isinstance(raw, Mapping):
+        raise ValueError("alert_rules must be an object/map keyed by metric type.")
+    return {str(metric_type): AlertRule.from_config(str(metric_type), config) for metric_type, config in raw.items()}
+
+
+def alert_rule_for(run: RunData | None, metric_type: str) -> AlertRule | None:
+    """Return the run's rule for ``metric_type``; malformed rules are ignored."""
+    if run is None:
+        return None
+    rules = (run.base_config or {}).get(CONF_ALERT_RULES)
+    if not isinstance(rules, Mapping) or metric_type not in rules:
+        return None
+    try:
+        return AlertRule.from_config(metric_type, rules[metric_type])
+    except ValueError:
+        return None
+
+
+@dataclass(frozen=True)
+class AlertTransition:
+    """One alert state change, shaped for the Home Assistant event payload."""
+
+    state: str
+    kind: str
+    value: float
+    threshold: float
+    # Epoch seconds: excursion start (triggered) or recovery time (cleared).
+    since: float
+
+    def as_event_data(self) -> dict[str, Any]:
+        return {
+            "state": self.state,
+            "kind": self.kind,
+            "value": self.value,
+            "threshold": self.threshold,
+            "since": datetime.fromtimestamp(self.since, tz=timezone.utc).isoformat(),
+        }
+
+
+class ThresholdMonitor:
+    """O(1) alert state machine for one rule fed with one binding's values.
+
+    States: normal, pending (an excursion started at ``pending_since``) and
+    alerting. ``update`` takes each new value; ``check`` re-evaluates the held
+    value once the minimum duration may have elapsed without a new event.
+    """
+
+    __slots__ = ("rule", "alerting", "pending", "pending_since", "last_value")
+
+    def __init__(self, rule: AlertRule) -> None:
+        self.rule = rule
+        self.alerting: str | None = None
+        self.pending: str | None = None
+        self.pending_since: float | None = None
+        self.last_value: float | None = None
+
+    def reset(self) -> None:
+        self.alerting = None
+        self.pending = None
+        self.pending_since = None
+        self.last_value = None
+
+    def _threshold(self, kind: str) -> float:
+        return self.rule.high if kind == ALERT_KIND_HIGH else self.rule.low  # type: ignore[return-value]
+
+    def _breach(self, value: float) -> str | None:
+        if self.rule.high is not None and value > self.rule.high:
+            return ALERT_KIND_HIGH
+        if self.rule.low is not None and value < self.rule.low:
+            return ALERT_KIND_LOW
+        return None
+
+    def _recovered(self, value: float) -> bool:
+        if self.alerting == ALERT_KIND_HIGH:
+            return value <= self.rule.high - self.rule.hysteresis  # type: ignore[operator]
+        return value >= self.rule.low + self.rule.hysteresis  # type: ignore[operator]
+
+    def update(self, value: float | None, ts: float) -> list[AlertTransition]:
+        """Feed one value and return the resulting transitions (usually none).
+
+        Unavailable values (None) keep the current state.
+        """
+        if value is None:
+            return []
+        self.last_value = value
+        transitions: list[AlertTransition] = []
+        if self.alerting is not None:
+            if not self._recovered(value):
+                return transitions
+            kind, self.alerting = self.alerting, None
+            transitions.append(AlertTransition(ALERT_STATE_CLEARED, kind, value, self._threshold(kind), ts))
+        # After clearing, a swing straight past the opposite threshold starts a new excursion.
+        triggered = self._track_breach(value, ts)
+        if triggered is not None:
+            transitions.append(triggered)
+        return transitions
+
+    def _track_breach(self, value: float, ts: float) -> AlertTransition | None:
+        kind = self._breach(value)
+        if kind is None:
+            self.pending = self.pending_since = None
+            return None
+        if self.pending != kind:
+            self.pending, self.pending_since = kind, ts
+        return self.check(ts)
+
+    def check(self, ts: float) -> AlertTransition | None:
+        """Trigger a pending excursion once it lasted the rule's minimum duration."""
+        if self.pending is None or self.pending_since is None or self.last_value is None:
+            return None
+        if ts - self.pending_since < self.rule.min_duration_s:
+            return None
+        kind, since = self.pending, self.pending_since
+        self.alerting, self.pending, self.pending_since = kind, None, None
+        return AlertTransition(ALERT_STATE_TRIGGERED, kind, self.last_value, self._threshold(kind), since)
+
+    @property
+    def pending_deadline(self) -> float | None:
+        """Return when a pending excursion becomes an alert, if one is pending."""
+        if self.pending_since is None:
+            return None
+        return self.pending_since + self.rule.min_duration_s
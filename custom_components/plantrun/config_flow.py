@@ -15,12 +15,15 @@ from .const import (
     ALLOWED_METRIC_TYPES,
     CONF_CURRENCY,
     CONF_ELECTRICITY_PRICE_PER_KWH,
+    CONF_TARIFF_BANDS,
+    CONF_TARIFF_PRICE_ENTITY,
     DEFAULT_CURRENCY,
     DEFAULT_ELECTRICITY_PRICE_PER_KWH,
     DOMAIN,
     INITIAL_PHASE_NAME,
     METRIC_TYPE_CAMERA,
 )
+from .tariff import format_tariff_spec, parse_tariff_spec
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -158,21 +161,39 @@ class PlantRunOptionsFlowHandler(config_entries.OptionsFlow):
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
         """Manage summary pricing defaults stored as config entry options."""
+        errors: dict[str, str] = {}
+        current_options = self.plantrun_config_entry.options
         if user_input is not None:
             currency = str(user_input.get(CONF_CURRENCY, DEFAULT_CURRENCY)).strip().upper()
             if not currency:
                 currency = DEFAULT_CURRENCY
             price = float(user_input.get(CONF_ELECTRICITY_PRICE_PER_KWH, DEFAULT_ELECTRICITY_PRICE_PER_KWH))
-            return self.async_create_entry(
-                title="",
-                data={
-                    **self.plantrun_config_entry.options,
-                    CONF_ELECTRICITY_PRICE_PER_KWH: max(0.0, price),
-                    CONF_CURRENCY: currency,
-                },
-            )
+            try:
+                tariff_bands = parse_tariff_spec(str(user_input.get(CONF_TARIFF_BANDS) or ""))
+            except ValueError:
+                errors[CONF_TARIFF_BANDS] = "invalid_tariff_bands"
+            else:
+                price_entity = str(user_input.get(CONF_TARIFF_PRICE_ENTITY) or "").strip()
+                return self.async_create_entry(
+                    title="",
+                    data={
+                        **current_options,
+                        CONF_ELECTRICITY_PRICE_PER_KWH: max(0.0, price),
+                        CONF_CURRENCY: currency,
+                        CONF_TARIFF_BANDS: tariff_bands,
+                        CONF_TARIFF_PRICE_ENTITY: price_entity or None,
+                    },
+                )
 
-        current_options = self.plantrun_config_entry.options
+        try:
+            current_bands = format_tariff_spec(current_options.get(CONF_TARIFF_BANDS) or [])
+        except (KeyError, TypeError, ValueError):
+            current_bands = ""
+        price_entity_key = (
+            vol.Optional(CONF_TARIFF_PRICE_ENTITY, default=current_options[CONF_TARIFF_PRICE_ENTITY])
+            if current_options.get(CONF_TARIFF_PRICE_ENTITY)
+            else vol.Optional(CONF_TARIFF_PRICE_ENTITY)
+        )
         return self.async_show_form(
             step_id="summary_settings",
             data_schema=vol.Schema(
@@ -188,8 +209,13 @@ class PlantRunOptionsFlowHandler(config_entries.OptionsFlow):
                         CONF_CURRENCY,
                         default=current_options.get(CONF_CURRENCY, DEFAULT_CURRENCY),
                     ): str,
+                    vol.Optional(CONF_TARIFF_BANDS, default=current_bands): str,
+                    price_entity_key: selector.EntitySelector(
+                        selector.EntitySelectorConfig(domain=["sensor", "input_number"])
+                    ),
                 }
             ),
+            errors=errors,
         )
 
     # --- BRANCH A: STAR NEW RUN ---
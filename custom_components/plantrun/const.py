@@ -8,6 +8,56 @@ CONF_ELECTRICITY_PRICE_PER_KWH = "electricity_price_per_kwh"
 CONF_CURRENCY = "currency"
 DEFAULT_ELECTRICITY_PRICE_PER_KWH = 0.0
 DEFAULT_CURRENCY = "EUR"
+# Time-of-use bands: [{"start": "22:00", "end": "06:00", "price": 0.18, "weekdays": [0, ...]}]
+CONF_TARIFF_BANDS = "tariff_bands"
+# Optional entity whose state is the current price per kWh (e.g. a dynamic tariff).
+CONF_TARIFF_PRICE_ENTITY = "tariff_price_entity"
+
+# Scheduled daily rollups: one UTC trigger captures every closed day for all runs.
+DAILY_ROLLUP_UTC_HOUR = 0
+DAILY_ROLLUP_UTC_MINUTE = 5
+ROLLUP_BACKFILL_MAX_DAYS = 31
+ROLLUP_STARTUP_DELAY_S = 60
+# Rollup compaction: daily snapshots older than this merge into ISO-week aggregates,
+# and weekly aggregates older than the weekly horizon merge into calendar months.
+ROLLUP_DAILY_RETENTION_DAYS = 90
+ROLLUP_WEEKLY_RETENTION_DAYS = 365
+
+# plantrun/get_run_rollups paging.
+ROLLUP_RESOLUTION_DAILY = "daily"
+ROLLUP_RESOLUTION_WEEKLY = "weekly"
+ROLLUP_RESOLUTION_MONTHLY = "monthly"
+ROLLUP_RESOLUTIONS = [ROLLUP_RESOLUTION_DAILY, ROLLUP_RESOLUTION_WEEKLY, ROLLUP_RESOLUTION_MONTHLY]
+DEFAULT_ROLLUP_PAGE_SIZE = 90
+MAX_ROLLUP_PAGE_SIZE = 366
+
+# Background maintenance: ended runs keep full-resolution history for a grace
+# period, after which each metric series is clipped to the run window and
+# downsampled to at most ENDED_HISTORY_MAX_POINTS samples.
+ENDED_HISTORY_GRACE_DAYS = 30
+ENDED_HISTORY_MAX_POINTS = 1000
+
+# Sample ingestion from bound entities: pending samples are thinned to one per
+# resolution bucket (runs can override via base_config["sample_resolution_s"]),
+# moved into run history once per flush interval (persisted with a delayed store
+# write that coalesces several flushes), and each open run's metric series is
+# bounded by downsampling its older half past the point limit.
+CONF_SAMPLE_RESOLUTION_S = "sample_resolution_s"
+INGEST_RESOLUTION_S = 60
+INGEST_FLUSH_INTERVAL_S = 300
+INGEST_SAVE_DELAY_S = 900
+INGEST_MAX_POINTS_PER_METRIC = 10000
+
+# Threshold alerts evaluated on proxy source events, configured per run via
+# base_config["alert_rules"] = {"temperature": {"high": 30, "low": 16,
+# "hysteresis": 0.5, "min_duration_s": 300}}. Transitions fire EVENT_ALERT.
+CONF_ALERT_RULES = "alert_rules"
+EVENT_ALERT = f"{DOMAIN}_alert"
+DEFAULT_ALERT_MIN_DURATION_S = 0
+
+# Entities are pushed on storage commits; only time-dependent values (open-run
+# energy and cost) are re-evaluated on this tick.
+RUN_VALUE_TICK_INTERVAL_S = 300
 
 # Store constants
 STORE_KEY = "plantrun_store"
@@ -55,4 +105,63 @@ UNSUPPORTED_BINDING_METRIC_TYPES = [
     METRIC_TYPE_CAMERA,
 ]
 
+# Recorder metadata and canonical unit per bound metric type. Throttle keys (see
+# MirrorThrottle) limit how often proxies mirror chatty sources: min_interval_s,
+# deadband_abs / deadband_rel (significant change) and max_age_s.
+METRIC_METADATA: dict[str, dict[str, str | float]] = {
+    "temperature": {
+        "device_class": "temperature",
+        "state_class": "measurement",
+        "unit": "°C",
+        "min_interval_s": 10,
+        "deadband_abs": 0.05,
+        "max_age_s": 900,
+    },
+    "humidity": {
+        "device_class": "humidity",
+        "state_class": "measurement",
+        "unit": "%",
+        "min_interval_s": 10,
+        "deadband_abs": 0.5,
+        "max_age_s": 900,
+    },
+    "soil_moisture": {
+        "device_class": "moisture",
+        "state_class": "measurement",
+        "unit": "%",
+        "min_interval_s": 10,
+        "deadband_abs": 0.5,
+        "max_age_s": 900,
+    },
+    "light": {"state_class": "measurement", "min_interval_s": 10, "deadband_rel": 0.05, "max_age_s": 900},
+    "energy": {
+        "device_class": "energy",
+        "state_class": "total_increasing",
+        "unit": "kWh",
+        "min_interval_s": 30,
+        "max_age_s": 900,
+    },
+    "water": {"state_class": "measurement", "min_interval_s": 10, "max_age_s": 900},
+}
+
 INITIAL_PHASE_NAME = "Seedling"
+
+# Derived per-run metrics: vapour pressure deficit (kPa) from the aligned
+# temperature/humidity pair and daily light integral (mol/m²/d) from light.
+DERIVED_METRIC_VPD = "vpd"
+DERIVED_METRIC_DLI = "dli"
+# Recorded samples are held (and paired) across gaps of at most this many seconds.
+DERIVED_MAX_GAP_S = 6 * 3600
+# Light is read as lux unless the source reports PPFD (µmol/m²/s). Runs can
+# override the lux -> PPFD factor via base_config["light_ppfd_factor"].
+CONF_LIGHT_PPFD_FACTOR = "light_ppfd_factor"
+DEFAULT_LUX_TO_PPFD = 0.0185
+
+# Time-in-range bands for climate quality stats. Runs can override per metric via
+# base_config["metric_ranges"] = {"temperature": {"low": 20, "high": 28}}.
+CONF_METRIC_RANGES = "metric_ranges"
+DEFAULT_METRIC_RANGES: dict[str, tuple[float | None, float | None]] = {
+    METRIC_TYPE_TEMPERATURE: (18.0, 28.0),
+    METRIC_TYPE_HUMIDITY: (40.0, 70.0),
+    DERIVED_METRIC_VPD: (0.8, 1.2),
+}
@@ -1,18 +1,25 @@
 """Data update coordinator for PlantRun."""
 import logging
-from datetime import timedelta
+from datetime import datetime, timedelta
+from typing import Callable
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
-from .const import DOMAIN
+from .const import DOMAIN, RUN_VALUE_TICK_INTERVAL_S
 from .store import PlantRunStorage
 from .models import RunData
+from .run_lookup import RunLookup
 
 _LOGGER = logging.getLogger(__name__)
 
 class PlantRunCoordinator(DataUpdateCoordinator[list[RunData]]):
-    """Class to manage fetching PlantRun data."""
+    """Push-based hub for PlantRun data.
+
+    Storage commits push the affected run ids to entities; there is no polling.
+    Time-dependent values subscribe to a separate lightweight tick instead.
+    """
 
     def __init__(self, hass: HomeAssistant, storage: PlantRunStorage) -> None:
         """Initialize."""
@@ -20,13 +27,71 @@ class PlantRunCoordinator(DataUpdateCoordinator[list[RunData]]):
             hass,
             _LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(minutes=5),
+            update_interval=None,
         )
         self.storage = storage
+        # Entities resolve their run/binding through this index instead of scanning data.
+        self.run_lookup = RunLookup(lambda: self.data)
+        # Run ids committed since the last update; None means "all" (first update).
+        self._pending_run_ids: set[str] | None = None
+        self.changed_run_ids: set[str] | None = None
+        self._tick_listeners: list[Callable[[], None]] = []
+        self._cancel_tick: Callable[[], None] | None = None
+        self._remove_storage_listener = storage.async_add_change_listener(self._async_handle_storage_change)
+
+    @callback
+    def _async_handle_storage_change(self, run_ids: set[str]) -> None:
+        """Push a storage commit to listeners, tagged with the affected runs."""
+        if self._pending_run_ids is not None:
+            self._pending_run_ids |= run_ids
+        self.async_set_updated_data(self.storage.runs)
+
+    def run_changed(self, run_id: str) -> bool:
+        """Return True when the last update touched ``run_id``."""
+        return self.changed_run_ids is None or run_id in self.changed_run_ids
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Re-index runs and publish changed runs before entities read them."""
+        self.run_lookup.invalidate()
+        self.changed_run_ids = self._pending_run_ids
+        self._pending_run_ids = set()
+        super().async_update_listeners()
+
+    @callback
+    def async_add_tick_listener(self, action: Callable[[], None]) -> Callable[[], None]:
+        """Call ``action`` on the time-dependent value tick while subscribed."""
+        self._tick_listeners.append(action)
+        if self._cancel_tick is None:
+            self._cancel_tick = async_track_time_interval(
+                self.hass, self._async_tick, timedelta(seconds=RUN_VALUE_TICK_INTERVAL_S)
+            )
+
+        @callback
+        def _remove() -> None:
+            if action in self._tick_listeners:
+                self._tick_listeners.remove(action)
+            if not self._tick_listeners and self._cancel_tick is not None:
+                self._cancel_tick()
+                self._cancel_tick = None
+
+        return _remove
+
+    @callback
+    def _async_tick(self, _now: datetime | None = None) -> None:
+        for action in tuple(self._tick_listeners):
+            action()
+
+    async def async_shutdown(self) -> None:
+        """Stop listening to storage and the tick."""
+        self._remove_storage_listener()
+        if self._cancel_tick is not None:
+            self._cancel_tick()
+            self._cancel_tick = None
+        await super().async_shutdown()
 
     async def _async_update_data(self) -> list[RunData]:
         """Fetch data."""
-        # The main source of truth is the local storage.
-        # This coordinator acts as a central hub if we ever need to fetch/refresh
-        # from external sources (e.g. Cultivars). For now, it just returns storage runs.
+        # The main source of truth is the local storage, which pushes its own
+        # changes; an explicit refresh just republishes the current runs.
         return self.storage.runs
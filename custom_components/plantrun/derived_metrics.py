@@ -0,0 +1,203 @@
+"""Derived run metrics: vapour pressure deficit and daily light integral."""
+
+from __future__ import annotations
+
+import math
+from datetime import datetime, time, timedelta, tzinfo
+from typing import Iterable
+
+from .const import DEFAULT_LUX_TO_PPFD, DERIVED_MAX_GAP_S, METRIC_TYPE_HUMIDITY, METRIC_TYPE_TEMPERATURE
+from .resample import TimedValue, merge_series
+
+# Source units that already report photosynthetic photon flux density.
+PPFD_UNITS = frozenset({"µmol/m²/s", "μmol/m²/s", "µmol/(m²·s)", "μmol/(m²·s)", "umol/m2/s", "ppfd"})
+
+
+def saturation_vapor_pressure_kpa(temperature_c: float) -> float:
+    """Return the saturation vapour pressure over water (Tetens) in kPa."""
+    return 0.6108 * math.exp(17.27 * temperature_c / (temperature_c + 237.3))
+
+
+def vapor_pressure_deficit_kpa(temperature_c: float, humidity: float) -> float | None:
+    """Return the air VPD in kPa, or None for physically impossible inputs."""
+    if temperature_c <= -237.3 or not 0.0 <= humidity <= 100.0:
+        return None
+    return saturation_vapor_pressure_kpa(temperature_c) * (1.0 - humidity / 100.0)
+
+
+def ppfd_factor(unit: str | None, lux_factor: float = DEFAULT_LUX_TO_PPFD) -> float:
+    """Return the factor turning a light reading in ``unit`` into PPFD (µmol/m²/s)."""
+    if unit is not None and unit.strip().casefold() in {value.casefold() for value in PPFD_UNITS}:
+        return 1.0
+    return lux_factor
+
+
+class VpdTracker:
+    """Hold the last temperature/humidity pair and its VPD, updated in O(1).
+
+    Each side is held until replaced or cleared (``None``). With ``max_skew_s``
+    the pair only counts as aligned while both samples are that close in time.
+    """
+
+    __slots__ = ("max_skew_s", "temperature", "humidity", "temperature_ts", "humidity_ts", "value")
+
+    def __init__(self, max_skew_s: float | None = None) -> None:
+        self.max_skew_s = max_skew_s
+        self.temperature: float | None = None
+        self.humidity: float | None = None
+        self.temperature_ts: float | None = None
+        self.humidity_ts: float | None = None
+        self.value: float | None = None
+
+    def update(self, metric: str, value: float | None, ts: float | None = None) -> float | None:
+        """Replace one side of the pair and return the resulting VPD (or None)."""
+        if metric == METRIC_TYPE_TEMPERATURE:
+            self.temperature, self.temperature_ts = value, ts
+        elif metric == METRIC_TYPE_HUMIDITY:
+            self.humidity, self.humidity_ts = value, ts
+        else:
+            return self.value
+        self.value = None
+        if self.temperature is None or self.humidity is None:
+            return None
+        if self.max_skew_s is not None and self.temperature_ts is not None and self.humidity_ts is not None:
+            if abs(self.temperature_ts - self.humidity_ts) > self.max_skew_s:
+                return None
+        self.value = vapor_pressure_deficit_kpa(self.temperature, self.humidity)
+        return self.value
+
+
+class DayIntegral:
+    """Sample-and-hold integral of a rate that resets at local midnight.
+
+    Each sample's rate holds until the next sample, for at most ``max_gap_s``.
+    Feeding PPFD (µmol/m²/s) yields the daily light integral in mol/m²/d.
+    ``advance`` lets the held rate accrue (and the day roll) without a new sample;
+    a rolled-over day is left in ``closed`` as (day, integral).
+    """
+
+    __slots__ = (
+        "tz",
+        "max_gap_s",
+        "scale",
+        "day",
+        "total",
+        "closed",
+        "day_start_ts",
+        "_day_end_ts",
+        "_rate",
+        "_rate_ts",
+        "_last_ts",
+    )
+
+    def __init__(self, tz: tzinfo, *, max_gap_s: float = DERIVED_MAX_GAP_S, scale: float = 1e-6) -> None:
+        self.tz = tz
+        self.max_gap_s = max_gap_s
+        self.scale = scale
+        self.day: str | None = None
+        self.total = 0.0
+        self.closed: tuple[str, float] | None = None
+        self.day_start_ts: float | None = None
+        self._day_end_ts: float | None = None
+        self._rate: float | None = None
+        self._rate_ts: float | None = None
+        self._last_ts: float | None = None
+
+    @property
+    def value(self) -> float | None:
+        """Return today's integral, or None before the first sample."""
+        return self.total * self.scale if self.day is not None else None
+
+    @property
+    def last_ts(self) -> float | None:
+        """Return the instant the integral has been accrued up to."""
+        return self._last_ts
+
+    def _start_day(self, ts: float) -> float:
+        local_day = datetime.fromtimestamp(ts, self.tz).date()
+        self.day = local_day.isoformat()
+        self.total = 0.0
+        self.day_start_ts = datetime.combine(local_day, time.min, tzinfo=self.tz).timestamp()
+        self._day_end_ts = datetime.combine(local_day + timedelta(days=1), time.min, tzinfo=self.tz).timestamp()
+        return self.day_start_ts
+
+    def advance(self, ts: float) -> None:
+        """Accrue the held rate up to ``ts``, resetting the total at local midnight."""
+        if self._last_ts is not None and ts <= self._last_ts:
+            return
+        start = self._last_ts if self._last_ts is not None else ts
+        if self._day_end_ts is None or ts >= self._day_end_ts:
+            if self._day_end_ts is not None and self.day is not None:
+                self._accrue(start, self._day_end_ts)
+                self.closed = (self.day, self.total * self.scale)
+            start = max(start, self._start_day(ts))
+        self._accrue(start, ts)
+        self._last_ts = ts
+
+    def _accrue(self, start: float, end: float) -> None:
+        if self._rate is None or self._rate_ts is None:
+            return
+        held_until = min(end, self._rate_ts + self.max_gap_s)
+        if held_until > start:
+            self.total += self._rate * (held_until - start)
+
+    def add(self, rate: float | None, ts: float) -> None:
+        """Feed a new rate sample at ``ts``; ``None`` stops accrual until the next one."""
+        self.advance(ts)
+        if self._last_ts is not None and ts < self._last_ts:
+            return
+        self._rate = max(0.0, rate) if rate is not None else None
+        self._rate_ts = ts
+
+
+def vpd_series(
+    temperature: Iterable[TimedValue],
+    humidity: Iterable[TimedValue],
+    *,
+    max_skew_s: float | None = DERIVED_MAX_GAP_S,
+) -> list[TimedValue]:
+    """Merge sorted (ts, value) series in one pass into the VPD at every aligned sample."""
+    series: list[TimedValue] = []
+    last: dict[str, TimedValue] = {}
+    for ts, metric, value in merge_series({METRIC_TYPE_TEMPERATURE: temperature, METRIC_TYPE_HUMIDITY: humidity}):
+        last[metric] = (ts, value)
+        temperature_sample, humidity_sample = last.get(METRIC_TYPE_TEMPERATURE), last.get(METRIC_TYPE_HUMIDITY)
+        if temperature_sample is None or humidity_sample is None:
+            continue
+        if max_skew_s is not None and ts - min(temperature_sample[0], humidity_sample[0]) > max_skew_s:
+            continue
+        vpd = vapor_pressure_deficit_kpa(temperature_sample[1], humidity_sample[1])
+        if vpd is not None:
+            series.append((ts, vpd))
+    return series
+
+
+def daily_light_integrals(
+    ppfd: Iterable[TimedValue],
+    tz: tzinfo,
+    *,
+    end_ts: float | None = None,
+    max_gap_s: float = DERIVED_MAX_GAP_S,
+) -> dict[str, float]:
+    """Return {local day: DLI in mol/m²/d} for a sorted PPFD series, held up to ``end_ts``."""
+    integral = DayIntegral(tz, max_gap_s=max_gap_s)
+    days: dict[str, float] = {}
+
+    def _collect_closed() -> None:
+        if integral.closed is not None:
+            days[integral.closed[0]] = integral.closed[1]
+            integral.closed = None
+
+    for ts, value in ppfd:
+        integral.add(value, ts)
+        _collect_closed()
+    if integral.day is None:
+        return days
+    if end_ts is not None:
+        integral.advance(end_ts)
+        _collect_closed()
+        if integral.day_start_ts == end_ts:
+            # The window ends exactly at midnight; the new day has no duration.
+            return days
+    days[integral.day] = integral.total * integral.scale
+    return days
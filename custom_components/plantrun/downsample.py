@@ -0,0 +1,297 @@
+"""Server-side downsampling of run-window metric series for chart payloads."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Hashable
+
+from .const import METRIC_TYPE_ENERGY
+from .models import RunData
+from .resample import DEFAULT_RESAMPLE_INTERVAL_S, RESAMPLE_METHOD_LAST, RESAMPLE_METHOD_MEAN, resample_aligned
+from .run_window import RunWindow, run_window_for
+from .summary import _point_timestamp, _to_float
+
+DOWNSAMPLE_METHOD_LTTB = "lttb"
+DOWNSAMPLE_METHOD_MINMAX = "minmax"
+DOWNSAMPLE_METHODS = [DOWNSAMPLE_METHOD_LTTB, DOWNSAMPLE_METHOD_MINMAX]
+
+DEFAULT_SERIES_POINTS = 120
+MAX_SERIES_POINTS = 2000
+DEFAULT_SERIES_CACHE_SIZE = 256
+
+# One (x, y) sample: x is epoch seconds (or list index for legacy untimestamped points).
+SeriesPoint = tuple[float, float]
+
+
+def windowed_series(
+    points: list[dict[str, Any]],
+    *,
+    start: datetime | None,
+    end: datetime | None,
+) -> tuple[list[SeriesPoint], bool]:
+    """Return sorted numeric (x, y) samples inside the window and whether x is time-based.
+
+    Mirrors summary windowing: untimestamped points are only used when no point in
+    the series carries a timestamp, in which case x is the list index.
+    """
+    timestamped: list[SeriesPoint] = []
+    legacy: list[SeriesPoint] = []
+    has_any_timestamp = False
+    for index, point in enumerate(points):
+        ts = _point_timestamp(point)
+        has_any_timestamp = has_any_timestamp or ts is not None
+        value = _to_float(point.get("value"))
+        if value is None:
+            continue
+        if ts is None:
+            legacy.append((float(index), value))
+            continue
+        if start is not None and ts < start:
+            continue
+        if end is not None and ts > end:
+            continue
+        timestamped.append((ts.timestamp(), value))
+
+    if not has_any_timestamp:
+        return legacy, False
+    timestamped.sort(key=lambda item: item[0])
+    return timestamped, True
+
+
+def lttb(series: list[SeriesPoint], threshold: int) -> list[SeriesPoint]:
+    """Largest-Triangle-Three-Buckets downsampling (Steinarsson, 2013).
+
+    Keeps the first and last sample and, per bucket, the sample forming the largest
+    triangle with the previously kept sample and the next bucket's average.
+    """
+    length = len(series)
+    if threshold >= length:
+        return list(series)
+    if threshold <= 2:
+        return [series[0], series[-1]][-threshold:] if threshold > 0 else []
+
+    sampled: list[SeriesPoint] = [series[0]]
+    bucket_size = (length - 2) / (threshold - 2)
+    anchor = 0
+
+    for bucket in range(threshold - 2):
+        avg_start = int((bucket + 1) * bucket_size) + 1
+        avg_end = min(int((bucket + 2) * bucket_size) + 1, length)
+        avg_span = series[avg_start:avg_end] or [series[-1]]
+        avg_x = sum(point[0] for point in avg_span) / len(avg_span)
+        avg_y = sum(point[1] for point in avg_span) / len(avg_span)
+
+        range_start = int(bucket * bucket_size) + 1
+        range_end = int((bucket + 1) * bucket_size) + 1
+        anchor_x, anchor_y = series[anchor]
+
+        best_area = -1.0
+        best_index = range_start
+        for index in range(range_start, range_end):
+            x, y = series[index]
+            area = abs((anchor_x - avg_x) * (y - anchor_y) - (anchor_x - x) * (avg_y - anchor_y))
+            if area > best_area:
+                best_area = area
+                best_index = index
+
+        sampled.append(series[best_index])
+        anchor = best_index
+
+    sampled.append(series[-1])
+    return sampled
+
+
+def minmax_buckets(series: list[SeriesPoint], threshold: int) -> list[SeriesPoint]:
+    """Keep the min and max sample of each bucket, in time order.
+
+    Produces at most ``threshold`` points and preserves spikes that LTTB may smooth.
+    """
+    length = len(series)
+    if threshold >= length:
+        return list(series)
+    if threshold < 2:
+        return [series[-1]] if threshold == 1 else []
+
+    bucket_count = max(1, threshold // 2)
+    bucket_size = length / bucket_count
+    sampled: list[SeriesPoint] = []
+    for bucket in range(bucket_count):
+        chunk = series[int(bucket * bucket_size) : int((bucket + 1) * bucket_size)]
+        if not chunk:
+            continue
+        low = min(chunk, key=lambda item: item[1])
+        high = max(chunk, key=lambda item: item[1])
+        if low is high:
+            sampled.append(low)
+        else:
+            sampled.extend(sorted((low, high), key=lambda item: item[0]))
+    return sampled
+
+
+def downsample(series: list[SeriesPoint], threshold: int, *, method: str = DOWNSAMPLE_METHOD_LTTB) -> list[SeriesPoint]:
+    """Downsample one sorted series to at most ``threshold`` points."""
+    if method not in DOWNSAMPLE_METHODS:
+        raise ValueError(f"Unsupported downsample method '{method}'. Expected one of: {', '.join(DOWNSAMPLE_METHODS)}")
+    if not series:
+        return []
+    if method == DOWNSAMPLE_METHOD_MINMAX:
+        return minmax_buckets(series, threshold)
+    return lttb(series, threshold)
+
+
+def build_binding_series(
+    run: RunData,
+    metric_type: str,
+    *,
+    max_points: int = DEFAULT_SERIES_POINTS,
+    method: str = DOWNSAMPLE_METHOD_LTTB,
+    now: datetime | None = None,
+) -> dict[str, Any]:
+    """Return a chart-ready downsampled series for one run metric over its run window."""
+    window = run_window_for(run, now=now)
+    series = _binding_series_points(run, metric_type, window, max_points=max_points, method=method)
+    return {**series, "run_window": window.to_contract()}
+
+
+def _binding_series_points(
+    run: RunData,
+    metric_type: str,
+    window: RunWindow,
+    *,
+    max_points: int,
+    method: str,
+) -> dict[str, Any]:
+    """Return the downsampled part of a binding series, without the run window contract."""
+    start = window.start
+    end = window.effective_end
+    if start is not None and end < start:
+        start = end = None
+
+    series, time_based = windowed_series(
+        (run.sensor_history or {}).get(metric_type, []),
+        start=start,
+        end=end,
+    )
+    sampled = downsample(series, max_points, method=method)
+    if time_based:
+        points = [
+            {"timestamp": datetime.fromtimestamp(x, tz=timezone.utc).isoformat(), "value": y}
+            for x, y in sampled
+        ]
+    else:
+        points = [{"value": y} for _x, y in sampled]
+
+    return {
+        "run_id": run.id,
+        "metric_type": metric_type,
+        "method": method,
+        "requested_points": max_points,
+        "source_points": len(series),
+        "points": points,
+    }
+
+
+def build_aligned_series(
+    run: RunData,
+    metric_types: list[str],
+    *,
+    interval_s: float = DEFAULT_RESAMPLE_INTERVAL_S,
+    method: str = RESAMPLE_METHOD_MEAN,
+    fill_forward: bool = False,
+    now: datetime | None = None,
+) -> dict[str, Any]:
+    """Return several run metrics resampled onto one shared time grid for correlation charts.
+
+    Picks the run's metric series and grid bounds; ``resample_aligned`` clips,
+    buckets and caps the grid. Cumulative energy always takes the bucket's last
+    reading. Legacy untimestamped points cannot be aligned and are skipped.
+    """
+    window = run_window_for(run, now=now)
+    history = run.sensor_history or {}
+    series = {}
+    for metric_type in metric_types:
+        samples, time_based = windowed_series(history.get(metric_type, []), start=None, end=None)
+        series[metric_type] = samples if time_based else []
+
+    first = [samples[0][0] for samples in series.values() if samples]
+    start = window.start.timestamp() if window.start is not None else min(first, default=None)
+    end = window.effective_end.timestamp()
+    if start is None or end < start:
+        start = end
+
+    methods = {metric_type: method for metric_type in metric_types}
+    if METRIC_TYPE_ENERGY in methods:
+        methods[METRIC_TYPE_ENERGY] = RESAMPLE_METHOD_LAST
+    interval_s, columns = resample_aligned(
+        series, interval_s, start=start, end=end, method=methods, fill_forward=fill_forward
+    )
+    return {
+        "run_id": run.id,
+        "metric_types": list(metric_types),
+        "interval_s": interval_s,
+        "method": method,
+        "timestamps": [datetime.fromtimestamp(ts, tz=timezone.utc).isoformat() for ts in columns.pop("timestamps")],
+        "values": columns,
+        "run_window": window.to_contract(),
+    }
+
+
+def _has_points_after(points: list[dict[str, Any]], end: datetime) -> bool:
+    """Return whether any timestamped point lies after ``end``."""
+    for point in reversed(points):
+        ts = _point_timestamp(point)
+        if ts is not None and ts > end:
+            return True
+    return False
+
+
+class DownsampledSeriesCache:
+    """Small LRU cache for downsampled series keyed by run revision.
+
+    Entries are only reused while the run revision (and request shape) matches, so a
+    storage write on the run naturally invalidates every cached series for it. The
+    run window is rebuilt on every call because an open run's effective end is
+    "now"; open runs are only cached when clipping at that end dropped nothing, so
+    a later end would select the same samples.
+    """
+
+    def __init__(self, *, max_entries: int = DEFAULT_SERIES_CACHE_SIZE) -> None:
+        self._max_entries = max_entries
+        self._entries: OrderedDict[Hashable, dict[str, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(
+        self,
+        run: RunData,
+        metric_type: str,
+        *,
+        revision: int,
+        max_points: int = DEFAULT_SERIES_POINTS,
+        method: str = DOWNSAMPLE_METHOD_LTTB,
+        now: datetime | None = None,
+    ) -> dict[str, Any]:
+        """Return a cached series for this revision, building it on miss."""
+        window = run_window_for(run, now=now)
+        key = (run.id, metric_type, max_points, method, revision)
+        cached = self._entries.get(key)
+        if cached is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return {**cached, "run_window": window.to_contract()}
+
+        self.misses += 1
+        series = _binding_series_points(run, metric_type, window, max_points=max_points, method=method)
+        if not window.is_open or not _has_points_after(
+            (run.sensor_history or {}).get(metric_type, []), window.effective_end
+        ):
+            self._entries[key] = series
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return {**series, "run_window": window.to_contract()}
+
+    def invalidate_run(self, run_id: str) -> None:
+        """Drop all cached series for one run."""
+        for key in [key for key in self._entries if key[0] == run_id]:
+            self._entries.pop(key, None)
@@ -48,3 +48,38 @@ def build_binding_history_context(
         "error": "source_entity_missing" if orphaned else None,
         "legacy_history_available": binding.metric_type in (run.sensor_history or {}),
     }
+
+
+def binding_history_context_key(run: RunData, binding: Binding, *, source_exists: bool) -> tuple[Any, ...]:
+    """Return the inputs a persisted history context depends on (window, binding, source)."""
+    return (
+        run.id,
+        run.planted_date,
+        run.start_time,
+        run.end_time,
+        run.status,
+        binding.id,
+        binding.sensor_id,
+        binding.metric_type,
+        source_exists,
+        binding.metric_type in (run.sensor_history or {}),
+    )
+
+
+def build_persisted_binding_history_context(
+    run: RunData,
+    binding: Binding,
+    *,
+    source_exists: bool,
+) -> dict[str, Any]:
+    """Build history context for entity attributes without time-dependent fields.
+
+    Open runs' ``effective_end`` moves with the clock, so it is left out (and
+    ``run_end`` is None) to keep recorded attributes stable between writes.
+    """
+    context = build_binding_history_context(run, binding, source_exists=source_exists)
+    window = context["run_window"]
+    if window["is_open"]:
+        context["run_end"] = None
+        context["run_window"] = {key: value for key, value in window.items() if key != "effective_end"}
+    return context
@@ -0,0 +1,351 @@
+"""Record bound source entity samples into run sensor history."""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from typing import Any, Callable
+
+from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import (
+    CONF_SAMPLE_RESOLUTION_S,
+    INGEST_FLUSH_INTERVAL_S,
+    INGEST_MAX_POINTS_PER_METRIC,
+    INGEST_RESOLUTION_S,
+    INGEST_SAVE_DELAY_S,
+    METRIC_METADATA,
+    METRIC_TYPE_ENERGY,
+)
+from .maintenance import compact_metric_history
+from .models import RunData
+from .run_window import parse_iso_datetime
+from .source_dispatcher import SourceStateDispatcher
+from .store import PlantRunStorage
+from .summary import _point_timestamp, rebase_energy_state
+
+_LOGGER = logging.getLogger(__name__)
+
+SourceKey = tuple[str, str]
+
+
+def sample_resolution_s(run: RunData, default: float = INGEST_RESOLUTION_S) -> float:
+    """Return the run's sample resolution, overridable via base_config["sample_resolution_s"]."""
+    try:
+        value = float((run.base_config or {}).get(CONF_SAMPLE_RESOLUTION_S, default))
+    except (TypeError, ValueError):
+        return default
+    return value if value >= 0 else default
+
+
+class SampleBuffer:
+    """Columnar pending samples of one run metric, thinned to one per resolution bucket.
+
+    A new sample replaces the previous pending one when both fall into the same
+    bucket and come from the same entity. Cumulative series keep meter drops so
+    reset detection still sees them.
+    """
+
+    __slots__ = ("resolution_s", "cumulative", "timestamps", "values", "entity_ids")
+
+    def __init__(self, resolution_s: float, *, cumulative: bool = False) -> None:
+        self.resolution_s = resolution_s
+        self.cumulative = cumulative
+        self.timestamps: list[float] = []
+        self.values: list[float] = []
+        self.entity_ids: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def add(self, ts: float, value: float, entity_id: str) -> None:
+        if self.timestamps and self.resolution_s > 0 and self.entity_ids[-1] == entity_id:
+            same_bucket = ts // self.resolution_s == self.timestamps[-1] // self.resolution_s
+            meter_drop = self.cumulative and value < self.values[-1]
+            if same_bucket and not meter_drop:
+                self.timestamps[-1] = ts
+                self.values[-1] = value
+                return
+        self.timestamps.append(ts)
+        self.values.append(value)
+        self.entity_ids.append(entity_id)
+
+    def drain(self, *, until: float | None = None) -> list[dict[str, Any]]:
+        """Return the pending samples up to ``until`` as history points and clear the buffer."""
+        points = [
+            {
+                "timestamp": datetime.fromtimestamp(ts, tz=timezone.utc).isoformat(),
+                "value": value,
+                "entity_id": entity_id,
+            }
+            for ts, value, entity_id in zip(self.timestamps, self.values, self.entity_ids)
+            if until is None or ts <= until
+        ]
+        self.timestamps.clear()
+        self.values.clear()
+        self.entity_ids.clear()
+        return points
+
+
+def retain_metric_history(
+    points: list[dict[str, Any]],
+    *,
+    max_points: int,
+    cumulative: bool = False,
+) -> list[dict[str, Any]] | None:
+    """Bound an open run's series once it exceeds ``max_points``.
+
+    The series is compacted down to a low-water mark of ``max_points // 2``
+    points, so a growing series is only re-downsampled every ``max_points // 2``
+    new samples. The newest ``max_points // 4`` samples stay at full resolution;
+    the older ones are LTTB-downsampled. Returns None when nothing had to change.
+    """
+    if len(points) <= max_points:
+        return None
+    low_water = max_points // 2
+    recent = low_water // 2
+    head, tail = (points[:-recent], points[-recent:]) if recent else (points, [])
+    compacted = compact_metric_history(
+        head,
+        start=None,
+        end=None,
+        max_points=max(low_water - recent, 1),
+        cumulative=cumulative,
+    )
+    if compacted is None:
+        return None
+    return compacted + tail
+
+
+def _retain_job(
+    points: list[dict[str, Any]],
+    *,
+    max_points: int,
+    cumulative: bool,
+) -> tuple[list[dict[str, Any]] | None, float | None]:
+    """Run ``retain_metric_history`` and also return the newest dropped timestamp."""
+    retained = retain_metric_history(points, max_points=max_points, cumulative=cumulative)
+    if retained is None:
+        return None, None
+    kept = {id(point) for point in retained}
+    dropped = [_point_timestamp(point) for point in points if id(point) not in kept]
+    return retained, max((ts.timestamp() for ts in dropped if ts is not None), default=None)
+
+
+class SampleIngestor:
+    """Feed state changes of bound entities into the history of their open runs.
+
+    One dispatcher listener exists per (source entity, metric type); its shared
+    source group normalizes each state once for every run bound to it. Samples
+    collect in per-run columnar buffers and move into run history in one batch
+    per flush interval. Over-long series are bounded with ``retain_metric_history``
+    in the executor, and the store write is delayed so several flushes share it.
+
+    Stored samples are not deduplicated: every run bound to a shared source
+    keeps its own copy in ``sensor_history``, because each run thins, clips and
+    compacts its series independently and all summary readers expect a
+    self-contained per-run history.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        storage: PlantRunStorage,
+        dispatcher: SourceStateDispatcher,
+        *,
+        max_points: int = INGEST_MAX_POINTS_PER_METRIC,
+        flush_interval_s: float = INGEST_FLUSH_INTERVAL_S,
+        save_delay_s: float = INGEST_SAVE_DELAY_S,
+    ) -> None:
+        self.hass = hass
+        self.storage = storage
+        self.dispatcher = dispatcher
+        self.max_points = max_points
+        self.flush_interval_s = flush_interval_s
+        self.save_delay_s = save_delay_s
+        # (source entity, metric type) -> ids of open runs bound to it.
+        self._routes: dict[SourceKey, set[str]] = {}
+        self._unsubscribers: dict[SourceKey, Callable[[], None]] = {}
+        self._buffers: dict[tuple[str, str], SampleBuffer] = {}
+        self._remove_storage_listener: Callable[[], None] | None = None
+        self._cancel_flush: Callable[[], None] | None = None
+        self._remove_final_write_listener: Callable[[], None] | None = None
+
+    @property
+    def pending_samples(self) -> int:
+        return sum(len(buffer) for buffer in self._buffers.values())
+
+    @callback
+    def async_start(self) -> None:
+        """Subscribe to the sources of open runs and start the flush timer.
+
+        Home Assistant does not unload config entries when it stops, so pending
+        samples are also flushed on its final write.
+        """
+        self._remove_storage_listener = self.storage.async_add_change_listener(self._async_handle_storage_change)
+        self._cancel_flush = async_track_time_interval(
+            self.hass, self._async_flush_interval, timedelta(seconds=self.flush_interval_s)
+        )
+        self._remove_final_write_listener = self.hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_FINAL_WRITE, self._async_handle_final_write
+        )
+        self.async_sync_routes()
+
+    async def _async_handle_final_write(self, _event: Event) -> None:
+        self._remove_final_write_listener = None
+        await self.async_flush()
+
+    @callback
+    def _async_handle_storage_change(self, _run_ids: set[str]) -> None:
+        self.async_sync_routes()
+
+    @callback
+    def async_sync_routes(self) -> None:
+        """Match subscriptions to the bindings of runs that are currently open."""
+        routes: dict[SourceKey, set[str]] = {}
+        for run in self.storage.runs:
+            if run.status == "ended":
+                continue
+            for binding in run.bindings:
+                if binding.metric_type not in METRIC_METADATA:
+                    continue
+                routes.setdefault((binding.sensor_id, binding.metric_type), set()).add(run.id)
+        for key in [key for key in self._unsubscribers if key not in routes]:
+            self._unsubscribers.pop(key)()
+        for key in routes:
+            if key not in self._unsubscribers:
+                self._unsubscribers[key] = self.dispatcher.async_add_listener(
+                    key[0], partial(self._async_handle_state, key)
+                )
+        self._routes = routes
+
+    @callback
+    def _async_handle_state(self, key: SourceKey, event: Event) -> None:
+        new_state = event.data.get("new_state")
+        run_ids = self._routes.get(key)
+        if new_state is None or not run_ids:
+            return
+        value = self.dispatcher.source_group(*key).normalize(new_state)
+        if not isinstance(value, (int, float)):
+            return
+        changed_at = getattr(new_state, "last_updated", None)
+        if not isinstance(changed_at, datetime):
+            changed_at = datetime.now(timezone.utc)
+        ts = changed_at.timestamp()
+        entity_id, metric_type = key
+        for run_id in run_ids:
+            buffer = self._buffers.get((run_id, metric_type))
+            if buffer is None:
+                run = self.storage.get_run(run_id)
+                if run is None:
+                    continue
+                start = parse_iso_datetime(run.start_time)
+                if start is not None and ts < start.timestamp():
+                    continue
+                buffer = self._buffers[(run_id, metric_type)] = SampleBuffer(
+                    sample_resolution_s(run), cumulative=metric_type == METRIC_TYPE_ENERGY
+                )
+            buffer.add(ts, float(value), entity_id)
+
+    async def _async_flush_interval(self, _now: datetime | None = None) -> None:
+        await self.async_flush(delay_save=True)
+
+    def _append(self, run: RunData, metric_type: str, buffer: SampleBuffer) -> int:
+        """Move a buffer into the run's history, dropping samples after its end."""
+        end = parse_iso_datetime(run.end_time) if run.end_time else None
+        points = buffer.drain(until=end.timestamp() if end is not None else None)
+        if points:
+            run.sensor_history.setdefault(metric_type, []).extend(points)
+        return len(points)
+
+    async def _async_retain(self, run: RunData, metric_type: str) -> None:
+        """Bound an over-long series, compacting a snapshot of it in the executor.
+
+        Samples appended while the job runs are kept; the result is discarded if
+        the series was replaced or edited in the meantime.
+        """
+        history = run.sensor_history.get(metric_type)
+        if history is None or len(history) <= self.max_points:
+            return
+        points = list(history)
+        cumulative = metric_type == METRIC_TYPE_ENERGY
+        retained, dropped_until = await self.hass.async_add_executor_job(
+            partial(_retain_job, points, max_points=self.max_points, cumulative=cumulative)
+        )
+        if retained is None or run.sensor_history.get(metric_type) is not history:
+            return
+        if len(history) < len(points) or history[len(points) - 1] is not points[-1]:
+            return
+        run.sensor_history[metric_type] = retained + history[len(points) :]
+        if cumulative and run.energy_state:
+            # Keeps the integrator's totals if it had counted every dropped sample,
+            # otherwise resets it for a rebuild over the compacted series.
+            run.energy_state = rebase_energy_state(
+                run.energy_state,
+                run.sensor_history[metric_type],
+                dropped=len(points) - len(retained),
+                dropped_until=dropped_until,
+            )
+
+    @callback
+    def async_flush_run(self, run_id: str) -> int:
+        """Move one run's pending samples into its history without saving.
+
+        Called before a run's final summary is frozen; the caller persists the run.
+        The ended run's series is left to maintenance instead of being bounded here.
+        """
+        run = self.storage.get_run(run_id)
+        written = 0
+        for key in [key for key in self._buffers if key[0] == run_id]:
+            buffer = self._buffers.pop(key)
+            if run is not None:
+                written += self._append(run, key[1], buffer)
+        return written
+
+    async def async_flush(self, *, delay_save: bool = False) -> int:
+        """Append pending samples to run history and persist them with one write.
+
+        With ``delay_save`` (the periodic flush) the write is coalesced through
+        ``async_schedule_commit_runs``; unload and the final write save immediately.
+        """
+        buffers, self._buffers = self._buffers, {}
+        written = 0
+        appended: list[tuple[RunData, str]] = []
+        for (run_id, metric_type), buffer in buffers.items():
+            run = self.storage.get_run(run_id)
+            if run is None or not len(buffer):
+                continue
+            count = self._append(run, metric_type, buffer)
+            if count:
+                written += count
+                appended.append((run, metric_type))
+        for run, metric_type in appended:
+            await self._async_retain(run, metric_type)
+        committed = {run.id for run, _metric_type in appended}
+        if committed:
+            if delay_save:
+                self.storage.async_schedule_commit_runs(committed, delay_s=self.save_delay_s)
+            else:
+                await self.storage.async_commit_runs(committed)
+            _LOGGER.debug("Recorded %s sample(s) for %s run(s)", written, len(committed))
+        return written
+
+    async def async_shutdown(self) -> None:
+        """Unsubscribe and persist what is still buffered (config entry unload)."""
+        if self._remove_storage_listener is not None:
+            self._remove_storage_listener()
+            self._remove_storage_listener = None
+        if self._cancel_flush is not None:
+            self._cancel_flush()
+            self._cancel_flush = None
+        if self._remove_final_write_listener is not None:
+            self._remove_final_write_listener()
+            self._remove_final_write_listener = None
+        for unsubscribe in self._unsubscribers.values():
+            unsubscribe()
+        self._unsubscribers.clear()
+        self._routes = {}
+        await self.async_flush()
@@ -0,0 +1,190 @@
+"""Background storage maintenance: orphaned rollups and ended-run history retention."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone, tzinfo
+from functools import partial
+from typing import Any, Awaitable, Callable, Sequence
+
+from .const import ENDED_HISTORY_GRACE_DAYS, ENDED_HISTORY_MAX_POINTS, METRIC_TYPE_ENERGY
+from .downsample import lttb
+from .models import RunData
+from .run_window import parse_iso_datetime, run_window_for
+from .store import PlantRunStorage
+from .streaming_stats import EnergyAccumulator
+from .summary import _point_timestamp, _to_float, freeze_final_summary, frozen_final_summary
+from .tariff import TariffSchedule
+
+
+# Runs a blocking callable off the event loop (``hass.async_add_executor_job``).
+Executor = Callable[[Callable[[], Any]], Awaitable[Any]]
+
+ESTIMATE_SAMPLE_ITEMS = 3
+
+
+def payload_bytes(value: Any) -> int:
+    """Return the compact JSON size of a stored value."""
+    return len(json.dumps(value, separators=(",", ":"), default=str).encode("utf-8"))
+
+
+def estimated_bytes(items: Sequence[Any], count: int | None = None) -> int:
+    """Estimate the JSON size of ``count`` (default: all) of ``items`` from a few samples.
+
+    Serializes at most ``ESTIMATE_SAMPLE_ITEMS`` items spread over the sequence
+    instead of the whole payload.
+    """
+    if not items:
+        return 0
+    step = max(1, len(items) // ESTIMATE_SAMPLE_ITEMS)
+    sample = items[::step][:ESTIMATE_SAMPLE_ITEMS]
+    average = sum(payload_bytes(item) for item in sample) / len(sample)
+    # One separator per item on top of the items themselves.
+    return int((average + 1) * (len(items) if count is None else count))
+
+
+def _energy_breakpoints(samples: list[tuple[float, float, dict[str, Any]]]) -> set[int]:
+    """Return sample indexes around resets, swaps and drops of a cumulative meter.
+
+    Keeping both neighbours of every segment change lets the integrator reproduce
+    the run total from the downsampled series.
+    """
+    keep: set[int] = set()
+    acc = EnergyAccumulator()
+    previous_value: float | None = None
+    for index, (ts, value, point) in enumerate(samples):
+        segments = acc.segments
+        source = point.get("entity_id")
+        acc.add(value, ts, source=source if isinstance(source, str) else None)
+        if index and (acc.segments != segments or (previous_value is not None and value < previous_value)):
+            keep.update((index - 1, index))
+        previous_value = value
+    return keep
+
+
+def compact_metric_history(
+    points: list[dict[str, Any]],
+    *,
+    start: datetime | None,
+    end: datetime | None,
+    max_points: int,
+    cumulative: bool = False,
+) -> list[dict[str, Any]] | None:
+    """Return ``points`` clipped to [start, end] and LTTB-downsampled, or None if unchanged.
+
+    Legacy series without timestamps are left alone. Points outside the window or
+    without a numeric value never count towards summaries and are dropped.
+    ``cumulative`` series also keep the samples around every meter reset or swap.
+    """
+    samples: list[tuple[float, float, dict[str, Any]]] = []
+    for point in points:
+        ts = _point_timestamp(point)
+        value = _to_float(point.get("value"))
+        if ts is None or value is None:
+            continue
+        if (start is not None and ts < start) or (end is not None and ts > end):
+            continue
+        samples.append((ts.timestamp(), value, point))
+    if not samples and not any(_point_timestamp(point) is not None for point in points):
+        return None
+    samples.sort(key=lambda sample: sample[0])
+
+    series = [(ts, value) for ts, value, _point in samples]
+    positions = {id(sample): index for index, sample in enumerate(series)}
+    keep = {positions[id(sample)] for sample in lttb(series, max_points)}
+    if cumulative:
+        keep |= _energy_breakpoints(samples)
+    if len(keep) >= len(points):
+        return None
+    return [samples[index][2] for index in sorted(keep)]
+
+
+def _history_due(run: RunData, *, now: datetime, grace_days: int) -> bool:
+    if run.status != "ended":
+        return False
+    ended = parse_iso_datetime(run.end_time)
+    return ended is not None and ended + timedelta(days=grace_days) <= now
+
+
+async def async_run_maintenance(
+    storage: PlantRunStorage,
+    *,
+    now: datetime | None = None,
+    grace_days: int = ENDED_HISTORY_GRACE_DAYS,
+    max_points: int = ENDED_HISTORY_MAX_POINTS,
+    energy_price_per_kwh: float | None = None,
+    energy_currency: str | None = None,
+    energy_tariff: TariffSchedule | None = None,
+    time_zone: tzinfo | None = None,
+    executor: Executor | None = None,
+) -> dict[str, int]:
+    """Prune orphaned rollups and compact ended runs' histories, then save once.
+
+    Rollups of runs no longer in storage (deleted or skipped as malformed on load)
+    are removed. Runs ended more than ``grace_days`` ago get their final summary
+    frozen first, then each metric series is compacted with
+    ``compact_metric_history``, in ``executor`` when given so a large series never
+    blocks the event loop. Work yields to the event loop between runs and
+    metrics. Returns counters including ``reclaimed_bytes``, which is estimated
+    from sampled item sizes rather than serializing the payload.
+    """
+    now = now or datetime.now(timezone.utc)
+    report = {
+        "orphaned_runs": 0,
+        "compacted_runs": 0,
+        "dropped_points": 0,
+        "reclaimed_bytes": 0,
+    }
+    known = {run.id for run in storage.runs}
+    orphans: set[str] = set()
+    for mapping in (storage.daily_rollups, storage.rollup_aggregates):
+        for run_id in [run_id for run_id in mapping if run_id not in known]:
+            report["reclaimed_bytes"] += estimated_bytes(list((mapping.pop(run_id) or {}).values()))
+            storage.rollup_index.drop_run(run_id)
+            orphans.add(run_id)
+            await asyncio.sleep(0)
+    report["orphaned_runs"] = len(orphans)
+
+    compacted: list[str] = []
+    for run in list(storage.runs):
+        if not run.sensor_history or not _history_due(run, now=now, grace_days=grace_days):
+            continue
+        prefs = {
+            "energy_price_per_kwh": energy_price_per_kwh,
+            "energy_currency": energy_currency,
+            "energy_tariff": energy_tariff,
+            "time_zone": time_zone,
+        }
+        if frozen_final_summary(run, **prefs) is None:
+            freeze_final_summary(run, **prefs)
+        window = run_window_for(run, now=now)
+        changed = False
+        for metric, points in list(run.sensor_history.items()):
+            await asyncio.sleep(0)
+            if not isinstance(points, list) or not points:
+                continue
+            job = partial(
+                compact_metric_history,
+                list(points),
+                start=window.start,
+                end=window.end,
+                max_points=max_points,
+                cumulative=metric == METRIC_TYPE_ENERGY,
+            )
+            kept = await executor(job) if executor is not None else job()
+            if kept is None:
+                continue
+            report["dropped_points"] += len(points) - len(kept)
+            report["reclaimed_bytes"] += estimated_bytes(points, len(points) - len(kept))
+            run.sensor_history[metric] = kept
+            changed = True
+        if changed:
+            # The integrator cursor refers to the old series; the frozen summary keeps the total.
+            run.energy_state = {}
+            compacted.append(run.id)
+    report["compacted_runs"] = len(compacted)
+
+    if orphans or compacted:
+        await storage.async_commit_runs(compacted)
+    return report
@@ -0,0 +1,100 @@
+"""Rate limiting and significant-change filtering for proxy sensor mirroring."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Mapping
+
+MIRROR_FORWARD = "forward"
+MIRROR_DROP = "drop"
+# Significant change inside the minimum interval: forward once the interval elapsed.
+MIRROR_DEFER = "defer"
+
+
+@dataclass(frozen=True)
+class MirrorThrottle:
+    """Per-metric mirroring limits.
+
+    A numeric update is forwarded when at least ``min_interval_s`` passed since
+    the last forwarded one and it moved beyond the deadband (the larger of
+    ``deadband_abs`` and ``deadband_rel`` times the last value), or when
+    ``max_age_s`` passed regardless of the deadband.
+    """
+
+    min_interval_s: float = 0.0
+    deadband_abs: float = 0.0
+    deadband_rel: float = 0.0
+    max_age_s: float | None = None
+
+    @classmethod
+    def from_metadata(cls, metadata: Mapping[str, Any]) -> "MirrorThrottle":
+        return cls(
+            min_interval_s=float(metadata.get("min_interval_s", 0.0)),
+            deadband_abs=float(metadata.get("deadband_abs", 0.0)),
+            deadband_rel=float(metadata.get("deadband_rel", 0.0)),
+            max_age_s=metadata.get("max_age_s"),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.min_interval_s or self.deadband_abs or self.deadband_rel)
+
+
+class MirrorGate:
+    """Decide per source event whether a proxy mirrors it, with counters.
+
+    Every event lands in exactly one counter: ``forwarded``, ``dropped`` or
+    ``deferred``. A deferred event mirrored later via ``flush`` is not counted again.
+    """
+
+    def __init__(self, throttle: MirrorThrottle) -> None:
+        self.throttle = throttle
+        self.last_value: Any = None
+        self.last_ts: float | None = None
+        self.forwarded = 0
+        self.dropped = 0
+        self.deferred = 0
+
+    def reset(self) -> None:
+        """Forget the last forwarded value (e.g. after the source entity changed)."""
+        self.last_value = None
+        self.last_ts = None
+
+    def decide(self, value: Any, now: float, *, force: bool = False) -> str:
+        """Return MIRROR_FORWARD, MIRROR_DROP or MIRROR_DEFER for ``value`` at ``now``.
+
+        Unavailable and non-numeric values, and the first value, always pass so
+        availability transitions are never delayed. ``force`` bypasses the limits
+        (e.g. when the source unit changed).
+        """
+        throttle = self.throttle
+        previous = self.last_value
+        numeric = isinstance(value, (int, float)) and isinstance(previous, (int, float))
+        if force or not throttle.enabled or self.last_ts is None or not numeric:
+            return self._forward(value, now)
+
+        elapsed = now - self.last_ts
+        if throttle.max_age_s is not None and elapsed >= throttle.max_age_s:
+            return self._forward(value, now)
+        threshold = max(throttle.deadband_abs, throttle.deadband_rel * abs(previous))
+        if threshold > 0 and abs(value - previous) <= threshold:
+            self.dropped += 1
+            return MIRROR_DROP
+        if elapsed < throttle.min_interval_s:
+            self.deferred += 1
+            return MIRROR_DEFER
+        return self._forward(value, now)
+
+    def flush(self, value: Any, now: float) -> None:
+        """Record a deferred ``value`` as mirrored at ``now`` without counting it again."""
+        self.last_value = value
+        self.last_ts = now
+
+    def _forward(self, value: Any, now: float) -> str:
+        self.flush(value, now)
+        self.forwarded += 1
+        return MIRROR_FORWARD
+
+    @property
+    def counters(self) -> dict[str, int]:
+        return {"forwarded": self.forwarded, "dropped": self.dropped, "deferred": self.deferred}
@@ -92,6 +92,10 @@ class RunData:
     base_config: dict[str, Any] = field(default_factory=dict)
     image_url: str | None = None
     image_source: str | None = None
+    # Resumable energy integrator state (see summary.advance_run_energy).
+    energy_state: dict[str, Any] = field(default_factory=dict)
+    # Summary frozen when the run ended (see summary.freeze_final_summary).
+    final_summary: dict[str, Any] | None = None
 
     def has_binding(self, metric_type: str, sensor_id: str) -> bool:
         """Return True if the run already has the exact binding."""
@@ -151,4 +155,6 @@ class RunData:
             base_config=data.get("base_config", {}),
             image_url=data.get("image_url"),
             image_source=data.get("image_source"),
+            energy_state=data.get("energy_state") or {},
+            final_summary=data.get("final_summary"),
         )
@@ -0,0 +1,137 @@
+"""Time alignment and fixed-interval resampling of sorted metric series.
+
+Series are sorted lists of (epoch seconds, value) pairs. Every function walks
+its inputs once, so aligning k series of n samples costs O(n log k) (time-ordered
+merge) or O(n + buckets) (fixed grid).
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+from typing import Iterable, Iterator, Mapping, Sequence
+
+RESAMPLE_METHOD_MEAN = "mean"
+RESAMPLE_METHOD_LAST = "last"
+RESAMPLE_METHODS = [RESAMPLE_METHOD_MEAN, RESAMPLE_METHOD_LAST]
+
+DEFAULT_RESAMPLE_INTERVAL_S = 3600
+MIN_RESAMPLE_INTERVAL_S = 60
+MAX_RESAMPLE_BUCKETS = 2000
+
+# One sample: epoch seconds and value.
+TimedValue = tuple[float, float]
+
+
+def _tagged(key: str, values: Iterable[TimedValue]) -> Iterator[tuple[float, str, float]]:
+    for ts, value in values:
+        yield ts, key, value
+
+
+def merge_series(series: Mapping[str, Iterable[TimedValue]]) -> Iterator[tuple[float, str, float]]:
+    """Yield (ts, key, value) for every sample of the merged series in time order.
+
+    Callers keep the as-of row themselves (each key's last (ts, value)) and
+    apply any staleness tolerance, so merging k series of n samples costs O(n log k).
+    """
+    return heapq.merge(*(_tagged(key, values) for key, values in series.items()), key=lambda event: event[0])
+
+
+def asof_join(
+    left: Sequence[TimedValue],
+    right: Sequence[TimedValue],
+    *,
+    tolerance_s: float | None = None,
+) -> list[tuple[float, float, float | None]]:
+    """Return (ts, left value, right value as of ts) for each left sample (two-pointer pass)."""
+    joined: list[tuple[float, float, float | None]] = []
+    index = 0
+    current: TimedValue | None = None
+    for ts, value in left:
+        while index < len(right) and right[index][0] <= ts:
+            current = right[index]
+            index += 1
+        if current is None or (tolerance_s is not None and ts - current[0] > tolerance_s):
+            joined.append((ts, value, None))
+        else:
+            joined.append((ts, value, current[1]))
+    return joined
+
+
+def bucket_origin(ts: float, interval_s: float) -> float:
+    """Return the start of the epoch-aligned bucket containing ``ts``."""
+    return math.floor(ts / interval_s) * interval_s
+
+
+def resample(
+    series: Iterable[TimedValue],
+    interval_s: float,
+    *,
+    method: str = RESAMPLE_METHOD_MEAN,
+) -> list[TimedValue]:
+    """Return (bucket start, mean or last value) for every non-empty epoch-aligned bucket."""
+    if method not in RESAMPLE_METHODS:
+        raise ValueError(f"Unsupported resample method '{method}'. Expected one of: {', '.join(RESAMPLE_METHODS)}")
+    if interval_s <= 0:
+        raise ValueError("interval_s must be positive")
+    buckets: list[TimedValue] = []
+    bucket: float | None = None
+    total = 0.0
+    count = 0
+    latest = 0.0
+    for ts, value in series:
+        start = bucket_origin(ts, interval_s)
+        if start != bucket:
+            if bucket is not None:
+                buckets.append((bucket, total / count if method == RESAMPLE_METHOD_MEAN else latest))
+            bucket, total, count = start, 0.0, 0
+        total += value
+        count += 1
+        latest = value
+    if bucket is not None:
+        buckets.append((bucket, total / count if method == RESAMPLE_METHOD_MEAN else latest))
+    return buckets
+
+
+def resample_aligned(
+    series: Mapping[str, Iterable[TimedValue]],
+    interval_s: float,
+    *,
+    start: float,
+    end: float,
+    method: str | Mapping[str, str] = RESAMPLE_METHOD_MEAN,
+    fill_forward: bool = False,
+    max_buckets: int = MAX_RESAMPLE_BUCKETS,
+) -> tuple[float, dict[str, list]]:
+    """Resample several series onto one shared grid of buckets covering [start, end].
+
+    Returns the interval used and ``{"timestamps": [bucket starts], key: [value
+    or None, ...]}``. The interval grows when [start, end] would need more than
+    ``max_buckets`` buckets. Samples outside [start, end] are ignored. ``method``
+    may differ per key (e.g. "last" for cumulative meters). With ``fill_forward``
+    an empty bucket repeats the previous bucket's value.
+    """
+    if interval_s <= 0:
+        raise ValueError("interval_s must be positive")
+    span = end - bucket_origin(start, interval_s)
+    if span / interval_s >= max_buckets:
+        interval_s = float(int(span // (max_buckets - 1)) + 1)
+    origin = bucket_origin(start, interval_s)
+    size = max(0, int((end - origin) // interval_s) + 1) if end >= start else 0
+    columns: dict[str, list] = {"timestamps": [origin + index * interval_s for index in range(size)]}
+    for key, values in series.items():
+        key_method = method.get(key, RESAMPLE_METHOD_MEAN) if isinstance(method, Mapping) else method
+        column: list[float | None] = [None] * size
+        for bucket, value in resample(
+            (sample for sample in values if start <= sample[0] <= end), interval_s, method=key_method
+        ):
+            column[int(round((bucket - origin) / interval_s))] = value
+        if fill_forward:
+            previous: float | None = None
+            for index, value in enumerate(column):
+                if value is None:
+                    column[index] = previous
+                else:
+                    previous = value
+        columns[key] = column
+    return interval_s, columns
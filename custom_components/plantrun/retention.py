@@ -2,16 +2,33 @@
 
 from __future__ import annotations
 
-from datetime import datetime, timezone
+import asyncio
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, time, timedelta, timezone, tzinfo
 from typing import Any
 
+from .const import (
+    DEFAULT_ROLLUP_PAGE_SIZE,
+    ROLLUP_BACKFILL_MAX_DAYS,
+    ROLLUP_DAILY_RETENTION_DAYS,
+    ROLLUP_RESOLUTION_DAILY,
+    ROLLUP_WEEKLY_RETENTION_DAYS,
+)
 from .models import RunData
+from .run_window import run_window_for
 from .store import PlantRunStorage
 from .summary import (
+    DERIVED_STAT_METRICS,
+    SUMMARY_STAT_METRICS,
+    build_run_summaries_as_of,
     build_run_summary,
+    build_windows_accumulators,
+    freeze_final_summary,
+    frozen_final_summary,
     normalize_energy_currency,
     normalize_energy_price_per_kwh,
 )
+from .tariff import TariffSchedule
 
 
 def snapshot_day(ts: datetime | None = None) -> str:
@@ -19,6 +36,182 @@ def snapshot_day(ts: datetime | None = None) -> str:
     return (ts or datetime.now(timezone.utc)).date().isoformat()
 
 
+def day_bounds(day: str) -> tuple[datetime, datetime]:
+    """Return the inclusive UTC [start, end] bounds of a rollup day key."""
+    start = datetime.combine(datetime.fromisoformat(day).date(), time.min, tzinfo=timezone.utc)
+    return start, start + timedelta(days=1) - timedelta(microseconds=1)
+
+
+def local_day_bounds(day: str, tz: tzinfo) -> tuple[datetime, datetime]:
+    """Return the inclusive [start, end] bounds of the ``tz`` calendar day with the key's date."""
+    local = datetime.fromisoformat(day).date()
+    start = datetime.combine(local, time.min, tzinfo=tz)
+    return start, datetime.combine(local + timedelta(days=1), time.min, tzinfo=tz) - timedelta(microseconds=1)
+
+
+def build_day_stats(run: RunData, day: str, *, tz: tzinfo | None = None) -> dict[str, Any]:
+    """Return serialized per-day accumulator state for one run, clipped to its window.
+
+    Stats cover the UTC day; ``dli`` is the integral of the ``tz`` calendar day
+    with the same date, so it matches the DLI sensor's local-midnight reset.
+    """
+    return build_days_stats(run, [day], tz=tz)[0]
+
+
+def build_days_stats(run: RunData, days: list[str], *, tz: tzinfo | None = None) -> list[dict[str, Any]]:
+    """Return ``build_day_stats`` for each of ``days`` with one pass over the run's history."""
+    tz = tz or timezone.utc
+    window = run_window_for(run)
+
+    def _clip(start: datetime, end: datetime) -> tuple[datetime, datetime]:
+        return (max(start, window.start) if window.start is not None else start), min(end, window.effective_end)
+
+    windows: list[tuple[datetime, datetime, tuple[datetime, datetime]]] = []
+    inside: list[bool] = []
+    for day in days:
+        start, end = _clip(*day_bounds(day))
+        inside.append(end >= start)
+        if end >= start:
+            windows.append((start, end, _clip(*local_day_bounds(day, tz))))
+    accumulators = iter(build_windows_accumulators(run, windows, tz=tz))
+    return [
+        {metric: accumulator.to_dict() for metric, accumulator in next(accumulators).items() if accumulator.count}
+        if day_inside
+        else {}
+        for day_inside in inside
+    ]
+
+
+def _compact_stats(stats: dict[str, Any]) -> dict[str, Any]:
+    """Keep only the mergeable part of serialized accumulator state."""
+    time_in_range = stats.get("time_in_range")
+    return {
+        "count": int(stats.get("count", 0)),
+        "sum": float(stats.get("sum", 0.0)),
+        "min": stats.get("min"),
+        "max": stats.get("max"),
+        "start": stats.get("start"),
+        "end": stats.get("end"),
+        "time_in_range": (
+            {key: float(time_in_range.get(key, 0.0)) for key in ("below_s", "within_s", "above_s")}
+            if isinstance(time_in_range, dict)
+            else None
+        ),
+    }
+
+
+def _merge_stats(earlier: dict[str, Any] | None, later: dict[str, Any]) -> dict[str, Any]:
+    """Merge two compact stats dicts; ``earlier`` covers the earlier period."""
+    if earlier is None:
+        return dict(later)
+    mins = [value for value in (earlier.get("min"), later.get("min")) if value is not None]
+    maxes = [value for value in (earlier.get("max"), later.get("max")) if value is not None]
+    ranges = [value for value in (earlier.get("time_in_range"), later.get("time_in_range")) if value]
+    return {
+        "count": earlier["count"] + later["count"],
+        "sum": earlier["sum"] + later["sum"],
+        "min": min(mins) if mins else None,
+        "max": max(maxes) if maxes else None,
+        "start": earlier.get("start") if earlier.get("start") is not None else later.get("start"),
+        "end": later.get("end") if later.get("end") is not None else earlier.get("end"),
+        "time_in_range": (
+            {key: sum(item.get(key, 0.0) for item in ranges) for key in ("below_s", "within_s", "above_s")}
+            if ranges
+            else None
+        ),
+    }
+
+
+def rollup_aggregate_from_day(day: str, summary: dict[str, Any]) -> dict[str, Any]:
+    """Turn one daily snapshot into a mergeable aggregate covering that day.
+
+    Energy values are run-to-date totals, so aggregates keep the value at their
+    last covered day. Climate stats come from ``day_stats`` (count/sum/min/max and
+    time-in-range seconds); P² quantile state is not mergeable and is dropped.
+    """
+    day_stats = summary.get("day_stats") if isinstance(summary.get("day_stats"), dict) else {}
+    return {
+        "start_day": day,
+        "end_day": day,
+        "days": 1,
+        "energy_kwh": summary.get("energy_kwh"),
+        "energy_cost": summary.get("energy_cost"),
+        "energy_currency": summary.get("energy_currency"),
+        "stats": {metric: _compact_stats(stats) for metric, stats in day_stats.items() if isinstance(stats, dict)},
+    }
+
+
+def merge_rollup_aggregates(first: dict[str, Any], second: dict[str, Any]) -> dict[str, Any]:
+    """Merge two aggregates regardless of argument order."""
+    earlier, later = (first, second) if first["start_day"] <= second["start_day"] else (second, first)
+    latest = later if later["end_day"] >= earlier["end_day"] else earlier
+    stats = dict(earlier.get("stats") or {})
+    for metric, metric_stats in (later.get("stats") or {}).items():
+        stats[metric] = _merge_stats(stats.get(metric), metric_stats)
+    return {
+        "start_day": earlier["start_day"],
+        "end_day": latest["end_day"],
+        "days": earlier["days"] + later["days"],
+        "energy_kwh": latest.get("energy_kwh"),
+        "energy_cost": latest.get("energy_cost"),
+        "energy_currency": latest.get("energy_currency"),
+        "stats": stats,
+    }
+
+
+def _week_key(day: date) -> str:
+    year, week, _weekday = day.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def _month_key_for_week(week_key: str) -> str:
+    # ISO convention: a week belongs to the month containing its Thursday.
+    year, week = week_key.split("-W")
+    thursday = date.fromisocalendar(int(year), int(week), 4)
+    return f"{thursday.year:04d}-{thursday.month:02d}"
+
+
+def compact_run_rollups(
+    run_rollups: dict[str, Any],
+    run_aggregates: dict[str, Any],
+    *,
+    today: date,
+    daily_days: int = ROLLUP_DAILY_RETENTION_DAYS,
+    weekly_days: int = ROLLUP_WEEKLY_RETENTION_DAYS,
+) -> int:
+    """Fold old daily snapshots into weekly, and old weeks into monthly aggregates.
+
+    Mutates both mappings in place and returns how many entries were folded.
+    ``run_aggregates`` holds ``{"weekly": {"2026-W09": ...}, "monthly": {"2026-03": ...}}``.
+    """
+    weekly = run_aggregates.setdefault("weekly", {})
+    monthly = run_aggregates.setdefault("monthly", {})
+    daily_cutoff = (today - timedelta(days=daily_days)).isoformat()
+    weekly_cutoff = (today - timedelta(days=weekly_days)).isoformat()
+    folded = 0
+
+    for day in [day for day in run_rollups if day < daily_cutoff]:
+        try:
+            parsed = date.fromisoformat(day)
+        except ValueError:
+            continue
+        summary = run_rollups.pop(day)
+        if not isinstance(summary, dict):
+            continue
+        key = _week_key(parsed)
+        contribution = rollup_aggregate_from_day(day, summary)
+        weekly[key] = merge_rollup_aggregates(weekly[key], contribution) if key in weekly else contribution
+        folded += 1
+
+    for key in [key for key, aggregate in weekly.items() if aggregate["end_day"] < weekly_cutoff]:
+        month = _month_key_for_week(key)
+        aggregate = weekly.pop(key)
+        monthly[month] = merge_rollup_aggregates(monthly[month], aggregate) if month in monthly else aggregate
+        folded += 1
+
+    return folded
+
+
 def _summary_has_live_history(summary: dict[str, Any]) -> bool:
     """Return True when summary has at least one usable live data point."""
     if summary.get("energy_kwh") is not None:
@@ -112,34 +305,146 @@ async def async_capture_daily_rollup(
     *,
     energy_price_per_kwh: float | None = None,
     energy_currency: str | None = None,
+    energy_tariff: TariffSchedule | None = None,
+    time_zone: tzinfo | None = None,
 ) -> dict[str, Any]:
-    """Capture and persist one daily rollup summary for a run."""
+    """Capture and persist one daily rollup summary for a run.
+
+    Besides the run-to-date summary, the snapshot carries ``day_stats``: serialized
+    streaming accumulators for that UTC day only, so rollups can be merged later.
+    """
     summary = _with_summary_meta(
         build_run_summary(
             run,
             energy_price_per_kwh=energy_price_per_kwh,
             energy_currency=energy_currency,
+            energy_tariff=energy_tariff,
+            time_zone=time_zone,
         ),
         source="live",
     )
     day = snapshot_day()
+    summary["day_stats"] = build_day_stats(run, day, tz=time_zone)
     await storage.async_set_daily_rollup(run.id, day, summary)
     return summary
 
 
+def missing_rollup_days(
+    run: RunData,
+    run_rollups: dict[str, Any],
+    *,
+    today: date,
+    max_days: int = ROLLUP_BACKFILL_MAX_DAYS,
+) -> list[str]:
+    """Return closed UTC days inside the run window without a complete rollup.
+
+    Only the last ``max_days`` days before ``today`` are considered, so a long
+    outage never turns into an unbounded backfill.
+    """
+    window = run_window_for(run)
+    if window.start is None:
+        return []
+    first = max(window.start.astimezone(timezone.utc).date(), today - timedelta(days=max_days))
+    last = today - timedelta(days=1)
+    if window.end is not None:
+        last = min(last, window.end.astimezone(timezone.utc).date())
+    days: list[str] = []
+    current = first
+    while current <= last:
+        day = current.isoformat()
+        if not (run_rollups.get(day) or {}).get("day_complete"):
+            days.append(day)
+        current += timedelta(days=1)
+    return days
+
+
+async def async_capture_daily_rollups(
+    storage: PlantRunStorage,
+    *,
+    today: date | None = None,
+    energy_price_per_kwh: float | None = None,
+    energy_currency: str | None = None,
+    energy_tariff: TariffSchedule | None = None,
+    time_zone: tzinfo | None = None,
+) -> dict[str, list[str]]:
+    """Capture every missing closed-day rollup for all runs and save once.
+
+    Each day gets the run-to-date summary as of that day's end plus its
+    ``day_stats``, built in one pass over each run's history, and is marked ``day_complete`` so it is never recaptured.
+    A day whose local (``time_zone``) calendar day was still open at the start
+    of ``today`` is captured again on the next run, so its DLI covers the full day.
+    Old snapshots are compacted in the same pass (see ``compact_run_rollups``).
+    Returns the captured days per run id.
+    """
+    today = today or datetime.now(timezone.utc).date()
+    tz = time_zone or timezone.utc
+    today_start = datetime.combine(today, time.min, tzinfo=timezone.utc)
+    batch: list[tuple[str, str, dict[str, Any]]] = []
+    captured: dict[str, list[str]] = {}
+    all_rollups = storage.daily_rollups
+    aggregates = storage.rollup_aggregates
+    compacted = 0
+    for run_id, run_rollups in all_rollups.items():
+        folded = compact_run_rollups(run_rollups, aggregates.setdefault(run_id, {}), today=today)
+        if folded:
+            storage.rollup_index.drop_run(run_id)
+            compacted += folded
+    for index, run in enumerate(storage.runs):
+        if index:
+            # Backfills can span many runs and days; let the loop breathe between runs.
+            await asyncio.sleep(0)
+        days = missing_rollup_days(run, all_rollups.get(run.id, {}), today=today)
+        if not days:
+            continue
+        summaries = build_run_summaries_as_of(
+            run,
+            [day_bounds(day)[1] for day in days],
+            energy_price_per_kwh=energy_price_per_kwh,
+            energy_currency=energy_currency,
+            energy_tariff=energy_tariff,
+            time_zone=tz,
+        )
+        for day, run_summary, day_stats in zip(days, summaries, build_days_stats(run, days, tz=tz)):
+            summary = _with_summary_meta(run_summary, source="live")
+            summary["day_stats"] = day_stats
+            summary["day_complete"] = local_day_bounds(day, tz)[1] < today_start
+            batch.append((run.id, day, summary))
+            captured.setdefault(run.id, []).append(day)
+    await storage.async_set_daily_rollups(batch, dirty=bool(compacted))
+    return captured
+
+
 def get_summary_with_rollup_fallback(
     storage: PlantRunStorage,
     run: RunData,
     *,
     energy_price_per_kwh: float | None = None,
     energy_currency: str | None = None,
+    energy_tariff: TariffSchedule | None = None,
+    time_zone: tzinfo | None = None,
 ) -> dict[str, Any]:
-    """Get summary with fallback to latest stored rollup when live history is sparse."""
-    live = build_run_summary(
-        run,
-        energy_price_per_kwh=energy_price_per_kwh,
-        energy_currency=energy_currency,
-    )
+    """Get summary with fallback to latest stored rollup when live history is sparse.
+
+    Ended runs serve their frozen final summary; runs that ended before summaries
+    were frozen get one computed (and kept in memory until the next save) here.
+    """
+    pricing = {
+        "energy_price_per_kwh": energy_price_per_kwh,
+        "energy_currency": energy_currency,
+        "energy_tariff": energy_tariff,
+        "time_zone": time_zone,
+    }
+    final = frozen_final_summary(run, **pricing)
+    if final is not None and _summary_has_live_history(final):
+        return _with_summary_meta(final, source="final")
+    if final is not None:
+        live = final
+    elif run.status == "ended" and run.end_time:
+        live = freeze_final_summary(run, **pricing)
+        if _summary_has_live_history(live):
+            return _with_summary_meta(live, source="final")
+    else:
+        live = build_run_summary(run, **pricing)
     run_rollups = storage.daily_rollups.get(run.id, {})
     if _summary_has_live_history(live):
         return _with_summary_meta(live, source="live")
@@ -147,10 +452,116 @@ def get_summary_with_rollup_fallback(
     if not run_rollups:
         return _with_summary_meta(live, source="live", fallback_reason="no_history_no_rollup")
 
-    latest_day = sorted(run_rollups.keys())[-1]
+    latest_day = storage.rollup_index.latest(run.id, run_rollups)
+    rollup = {key: value for key, value in run_rollups[latest_day].items() if key not in ("day_stats", "day_complete")}
     latest_summary = _normalize_rollup_summary_energy(
-        run_rollups[latest_day],
+        rollup,
         energy_price_per_kwh=energy_price_per_kwh,
         energy_currency=energy_currency,
     )
     return _with_summary_meta(latest_summary, source="rollup", fallback_reason="no_live_history", day=latest_day)
+
+
+# Column name prefixes for climate metrics in columnar rollup payloads.
+ROLLUP_COLUMN_PREFIXES = {
+    "temperature": "temp",
+    "humidity": "humidity",
+    "soil_moisture": "soil_moisture",
+    "water": "water",
+    "vpd": "vpd",
+    "dli": "dli",
+}
+ROLLUP_STAT_METRICS = SUMMARY_STAT_METRICS + DERIVED_STAT_METRICS
+
+
+def _stats_columns(stats: dict[str, Any] | None) -> tuple[float | None, float | None, float | None]:
+    if not isinstance(stats, dict) or not stats.get("count"):
+        return None, None, None
+    return float(stats.get("sum", 0.0)) / int(stats["count"]), stats.get("min"), stats.get("max")
+
+
+def build_rollup_columns(
+    storage: PlantRunStorage,
+    run_id: str,
+    *,
+    resolution: str = ROLLUP_RESOLUTION_DAILY,
+    start_day: str | None = None,
+    end_day: str | None = None,
+    limit: int = DEFAULT_ROLLUP_PAGE_SIZE,
+    cursor: str | None = None,
+) -> dict[str, Any]:
+    """Return one page of rollups as parallel columns for charting.
+
+    ``days`` holds day keys (daily) or period keys (``2026-W09`` / ``2026-03``).
+    ``energy_kwh`` is the run-to-date total at each period end and
+    ``energy_kwh_delta`` the consumption within the period. Climate columns
+    (``temp_avg``, ``temp_min``, ``temp_max``, …, ``vpd_avg``, ``dli_avg``) are
+    per-period; ``dli_avg`` is the mean daily light integral. ``cursor`` is
+    the last key of the previous page; ``next_cursor`` is None on the last page.
+    """
+    if resolution == ROLLUP_RESOLUTION_DAILY:
+        run_rollups = storage.daily_rollups.get(run_id, {})
+        keys = storage.rollup_index.day_range(run_id, run_rollups, start_day=start_day, end_day=end_day)
+
+        def _entry(key: str) -> dict[str, Any]:
+            return rollup_aggregate_from_day(key, run_rollups[key])
+
+        def _previous(key: str) -> str | None:
+            return storage.rollup_index.previous(run_id, run_rollups, key)
+
+    else:
+        periods = (storage.rollup_aggregates.get(run_id) or {}).get(resolution) or {}
+        # Period keys ("2026-W09", "2026-03") sort chronologically as strings;
+        # aggregates are few (bounded by compaction), so sorting them is cheap.
+        all_keys = sorted(periods)
+        keys = [
+            key
+            for key in all_keys
+            if (start_day is None or periods[key]["end_day"] >= start_day)
+            and (end_day is None or periods[key]["start_day"] <= end_day)
+        ]
+
+        def _entry(key: str) -> dict[str, Any]:
+            return periods[key]
+
+        def _previous(key: str) -> str | None:
+            index = bisect_left(all_keys, key)
+            return all_keys[index - 1] if index > 0 else None
+
+    position = bisect_right(keys, cursor) if cursor is not None else 0
+    previous_key = keys[position - 1] if position > 0 else (_previous(keys[0]) if keys else None)
+    previous_kwh = _entry(previous_key).get("energy_kwh") if previous_key is not None else None
+    page = [(key, _entry(key)) for key in keys[position : position + limit]]
+
+    columns: dict[str, list[Any]] = {"days": [], "energy_kwh": [], "energy_kwh_delta": [], "energy_cost": []}
+    for metric in ROLLUP_STAT_METRICS:
+        prefix = ROLLUP_COLUMN_PREFIXES[metric]
+        for suffix in ("avg", "min", "max"):
+            columns[f"{prefix}_{suffix}"] = []
+
+    for key, entry in page:
+        energy = entry.get("energy_kwh")
+        columns["days"].append(key)
+        columns["energy_kwh"].append(energy)
+        columns["energy_kwh_delta"].append(
+            max(0.0, energy - previous_kwh) if energy is not None and previous_kwh is not None else None
+        )
+        columns["energy_cost"].append(entry.get("energy_cost"))
+        if energy is not None:
+            previous_kwh = energy
+        stats = entry.get("stats") or {}
+        for metric in ROLLUP_STAT_METRICS:
+            prefix = ROLLUP_COLUMN_PREFIXES[metric]
+            avg, low, high = _stats_columns(stats.get(metric))
+            columns[f"{prefix}_avg"].append(avg)
+            columns[f"{prefix}_min"].append(low)
+            columns[f"{prefix}_max"].append(high)
+
+    has_more = position + limit < len(keys)
+    return {
+        "run_id": run_id,
+        "resolution": resolution,
+        "count": len(page),
+        "next_cursor": page[-1][0] if has_more and page else None,
+        **columns,
+    }
@@ -0,0 +1,70 @@
+"""Sorted per-run index over daily rollup day keys."""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Mapping
+
+
+class RollupDayIndex:
+    """Keep each run's rollup days sorted so latest-day and range reads never sort.
+
+    Writes through the store update the index incrementally. A per-run list whose
+    length no longer matches the rollup mapping (e.g. after compaction popped days
+    in place) is rebuilt lazily on the next read.
+    """
+
+    def __init__(self) -> None:
+        self._days: dict[str, list[str]] = {}
+
+    def _ensure(self, run_id: str, run_rollups: Mapping[str, Any]) -> list[str]:
+        days = self._days.get(run_id)
+        if days is None or len(days) != len(run_rollups):
+            days = sorted(run_rollups)
+            self._days[run_id] = days
+        return days
+
+    def add(self, run_id: str, day: str) -> None:
+        """Record one (possibly existing) day for a run."""
+        days = self._days.get(run_id)
+        if days is None:
+            return
+        index = bisect_left(days, day)
+        if index == len(days) or days[index] != day:
+            insort(days, day)
+
+    def discard(self, run_id: str, day: str) -> None:
+        days = self._days.get(run_id)
+        if days is None:
+            return
+        index = bisect_left(days, day)
+        if index < len(days) and days[index] == day:
+            del days[index]
+
+    def drop_run(self, run_id: str) -> None:
+        self._days.pop(run_id, None)
+
+    def latest(self, run_id: str, run_rollups: Mapping[str, Any]) -> str | None:
+        """Return the most recent rollup day for a run, or None."""
+        days = self._ensure(run_id, run_rollups)
+        return days[-1] if days else None
+
+    def previous(self, run_id: str, run_rollups: Mapping[str, Any], day: str) -> str | None:
+        """Return the latest indexed day strictly before ``day``, or None."""
+        days = self._ensure(run_id, run_rollups)
+        index = bisect_left(days, day)
+        return days[index - 1] if index > 0 else None
+
+    def day_range(
+        self,
+        run_id: str,
+        run_rollups: Mapping[str, Any],
+        *,
+        start_day: str | None = None,
+        end_day: str | None = None,
+    ) -> list[str]:
+        """Return sorted days within the inclusive [start_day, end_day] range."""
+        days = self._ensure(run_id, run_rollups)
+        low = bisect_left(days, start_day) if start_day is not None else 0
+        high = bisect_right(days, end_day) if end_day is not None else len(days)
+        return days[low:high]
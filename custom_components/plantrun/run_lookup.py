@@ -0,0 +1,54 @@
+"""Id-indexed view over the coordinator's run list for O(1) entity lookups."""
+
+from __future__ import annotations
+
+from typing import Callable, Mapping
+
+from .models import Binding, RunData
+
+
+class RunLookup:
+    """Resolve runs and bindings by id without scanning the run list.
+
+    The run index is rebuilt at most once per coordinator update (see
+    ``invalidate``) and lazily when the list object or its length changes in
+    between. Per-run binding maps are built on first use and rebuilt when
+    ``run.bindings`` is replaced or resized.
+    """
+
+    def __init__(self, get_runs: Callable[[], list[RunData] | None]) -> None:
+        self._get_runs = get_runs
+        self._source: list[RunData] | None = None
+        self._size = -1
+        self._runs: dict[str, RunData] = {}
+        self._bindings: dict[str, tuple[list[Binding], int, dict[str, Binding]]] = {}
+
+    def invalidate(self) -> None:
+        """Force a rebuild on the next lookup (runs may have been replaced in place)."""
+        self._source = None
+
+    def _current(self) -> dict[str, RunData]:
+        runs = self._get_runs() or []
+        if runs is not self._source or len(runs) != self._size:
+            self._source = runs
+            self._size = len(runs)
+            self._runs = {run.id: run for run in runs}
+            self._bindings = {}
+        return self._runs
+
+    @property
+    def runs_by_id(self) -> Mapping[str, RunData]:
+        return self._current()
+
+    def run(self, run_id: str) -> RunData | None:
+        return self._current().get(run_id)
+
+    def binding(self, run_id: str, binding_id: str) -> Binding | None:
+        run = self.run(run_id)
+        if run is None:
+            return None
+        cached = self._bindings.get(run_id)
+        if cached is None or cached[0] is not run.bindings or cached[1] != len(run.bindings):
+            cached = (run.bindings, len(run.bindings), {binding.id: binding for binding in run.bindings})
+            self._bindings[run_id] = cached
+        return cached[2].get(binding_id)
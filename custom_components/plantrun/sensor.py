@@ -1,41 +1,60 @@
 """Sensor platform for PlantRun."""
 import logging
-from typing import Any
+from datetime import datetime, timezone
+from functools import partial
+from time import monotonic, time
+from typing import Any, Callable
 
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from homeassistant.helpers.event import async_track_state_change_event
-from homeassistant.core import Event
+from homeassistant.helpers.event import async_call_later
+from homeassistant.core import Event, callback
 
 from .const import (
     CONF_CURRENCY,
     CONF_ELECTRICITY_PRICE_PER_KWH,
     DEFAULT_CURRENCY,
     DEFAULT_ELECTRICITY_PRICE_PER_KWH,
+    DERIVED_METRIC_VPD,
     DOMAIN,
+    EVENT_ALERT,
+    METRIC_METADATA,
+    METRIC_TYPE_HUMIDITY,
+    METRIC_TYPE_LIGHT,
+    METRIC_TYPE_TEMPERATURE,
 )
+from .alerts import AlertTransition, ThresholdMonitor, alert_rule_for
 from .coordinator import PlantRunCoordinator
-from .history_context import build_binding_history_context
+from .derived_metrics import DayIntegral, VpdTracker, ppfd_factor
+from .history_context import binding_history_context_key, build_persisted_binding_history_context
+from .mirror_throttle import MIRROR_DEFER, MIRROR_DROP, MirrorGate, MirrorThrottle
 from .models import Binding, RunData
-from .summary import build_run_summary, normalize_energy_currency, normalize_energy_price_per_kwh
+from .run_window import parse_iso_datetime, run_window_for
+from .source_dispatcher import SourceGroup, SourceStateDispatcher
+from .summary import (
+    build_derived_accumulators,
+    light_ppfd_factor,
+    normalize_energy_currency,
+    normalize_energy_price_per_kwh,
+    run_energy_kwh,
+    run_energy_totals,
+    summary_energy_preferences_from_options,
+    timed_values,
+)
+from .tariff import TariffSchedule, bind_price_entity, time_zone_from_name
 
 _LOGGER = logging.getLogger(__name__)
 
-METRIC_METADATA: dict[str, dict[str, str]] = {
-    "temperature": {"device_class": "temperature", "state_class": "measurement", "unit": "°C"},
-    "humidity": {"device_class": "humidity", "state_class": "measurement", "unit": "%"},
-    "soil_moisture": {"device_class": "moisture", "state_class": "measurement", "unit": "%"},
-    "light": {"state_class": "measurement"},
-    "energy": {"device_class": "energy", "state_class": "total_increasing", "unit": "kWh"},
-    "water": {"state_class": "measurement"},
-}
+# Proxies of ended runs stop listening to their source ("dormant"). They either
+# keep the last mirrored value or report unavailable.
+DORMANT_POLICY_FREEZE = "freeze"
+DORMANT_POLICY_UNAVAILABLE = "unavailable"
+DEFAULT_DORMANT_POLICY = DORMANT_POLICY_FREEZE
 
-# Accept common illuminance aliases and normalize to canonical "lx".
-LIGHT_ILLUMINANCE_UNIT_ALIASES = {"lx", "lux"}
-UNAVAILABLE_SENSOR_STATES = {"unknown", "unavailable", "none", ""}
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -45,9 +64,13 @@ async def async_setup_entry(
     """Set up the sensor platform."""
     data = hass.data[DOMAIN][entry.entry_id]
     coordinator: PlantRunCoordinator = data["coordinator"]
+    source_dispatcher = data.get("source_dispatcher")
+    if source_dispatcher is None:
+        source_dispatcher = SourceStateDispatcher(hass, METRIC_METADATA)
+        entry.async_on_unload(source_dispatcher.async_shutdown)
 
-    known_run_ids: set[str] = set()
-    known_binding_ids: set[tuple[str, str]] = set()
+    run_entities: dict[str, list[SensorEntity]] = {}
+    binding_entities: dict[tuple[str, str], PlantRunProxySensor] = {}
 
     options = getattr(entry, "options", {}) or {}
     price_per_kwh = normalize_energy_price_per_kwh(
@@ -55,44 +78,70 @@ async def async_setup_entry(
         default=DEFAULT_ELECTRICITY_PRICE_PER_KWH,
     )
     currency = normalize_energy_currency(options.get(CONF_CURRENCY, DEFAULT_CURRENCY))
+    tariff = summary_energy_preferences_from_options(
+        options,
+        time_zone=time_zone_from_name(getattr(getattr(hass, "config", None), "time_zone", None)),
+    )["energy_tariff"]
 
     def _collect_new_entities() -> list[SensorEntity]:
         entities: list[SensorEntity] = []
         for run in coordinator.data:
-            if run.id not in known_run_ids:
-                known_run_ids.add(run.id)
-                entities.append(PlantRunActivePhaseSensor(coordinator, run.id))
-                entities.append(PlantRunStatusSensor(coordinator, run.id))
-                entities.append(PlantRunCultivarSensor(coordinator, run.id))
-                entities.append(PlantRunEnergySensor(coordinator, run.id))
-                entities.append(
+            if run.id not in run_entities:
+                run_entities[run.id] = [
+                    PlantRunActivePhaseSensor(coordinator, run.id),
+                    PlantRunStatusSensor(coordinator, run.id),
+                    PlantRunCultivarSensor(coordinator, run.id),
+                    PlantRunEnergySensor(
+                        coordinator,
+                        run.id,
+                        energy_price_per_kwh=price_per_kwh,
+                        energy_currency=currency,
+                        energy_tariff=tariff,
+                    ),
                     PlantRunEnergyCostSensor(
                         coordinator,
                         run.id,
                         energy_price_per_kwh=price_per_kwh,
                         energy_currency=currency,
-                    )
-                )
+                        energy_tariff=tariff,
+                    ),
+                    PlantRunVpdSensor(coordinator, run.id, source_dispatcher=source_dispatcher),
+                    PlantRunDliSensor(coordinator, run.id, source_dispatcher=source_dispatcher),
+                ]
+                entities.extend(run_entities[run.id])
 
             for binding in run.bindings:
                 key = (run.id, binding.id)
-                if key in known_binding_ids:
+                if key in binding_entities:
                     continue
-                known_binding_ids.add(key)
-                entities.append(
-                    PlantRunProxySensor(
-                        coordinator=coordinator,
-                        run_id=run.id,
-                        run_name=run.friendly_name,
-                        binding=binding,
-                    )
+                binding_entities[key] = PlantRunProxySensor(
+                    coordinator=coordinator,
+                    run_id=run.id,
+                    run_name=run.friendly_name,
+                    binding=binding,
+                    source_dispatcher=source_dispatcher,
                 )
+                entities.append(binding_entities[key])
         return entities
 
+    def _remove_stale_entities() -> None:
+        """Drop entities (and their registry entries) of deleted bindings and runs."""
+        lookup = coordinator.run_lookup
+        stale: list[SensorEntity] = [
+            binding_entities.pop(key)
+            for key in [key for key in binding_entities if lookup.binding(*key) is None]
+        ]
+        for run_id in [run_id for run_id in run_entities if lookup.run(run_id) is None]:
+            stale.extend(run_entities.pop(run_id))
+        if stale:
+            _async_remove_entities(hass, stale)
+
     initial_entities = [PlantRunTotalRunsSensor(coordinator), *_collect_new_entities()]
     async_add_entities(initial_entities)
+    _async_remove_orphaned_registry_entries(hass, entry, {entity.unique_id for entity in initial_entities})
 
     def _handle_coordinator_update() -> None:
+        _remove_stale_entities()
         new_entities = _collect_new_entities()
         if new_entities:
             async_add_entities(new_entities)
@@ -100,7 +149,33 @@ async def async_setup_entry(
     entry.async_on_unload(coordinator.async_add_listener(_handle_coordinator_update))
 
 
-class PlantRunTotalRunsSensor(CoordinatorEntity[PlantRunCoordinator], SensorEntity):
+class PlantRunWriteOnChangeMixin:
+    """Skip state writes whose value, availability and attributes did not change."""
+
+    _last_written_state: tuple[Any, ...] | None = None
+
+    def _state_fingerprint(self) -> tuple[Any, ...]:
+        return (self.available, self.native_value, self.extra_state_attributes)
+
+    def _state_changed(self) -> bool:
+        """Return True (and remember the new state) when it differs from the last write."""
+        fingerprint = self._state_fingerprint()
+        if fingerprint == self._last_written_state:
+            return False
+        self._last_written_state = fingerprint
+        return True
+
+    def _async_write_state_if_changed(self) -> None:
+        if self._state_changed():
+            self.async_write_ha_state()
+
+    def _schedule_write_state_if_changed(self) -> None:
+        """Like ``_async_write_state_if_changed``, through the thread-safe scheduler."""
+        if self._state_changed():
+            self.schedule_update_ha_state()
+
+
+class PlantRunTotalRunsSensor(PlantRunWriteOnChangeMixin, CoordinatorEntity[PlantRunCoordinator], SensorEntity):
     """Sensor that shows total number of runs."""
 
     _attr_icon = "mdi:sprout"
@@ -117,9 +192,15 @@ class PlantRunTotalRunsSensor(CoordinatorEntity[PlantRunCoordinator], SensorEnti
         """Return the native value of the sensor."""
         return len(self.coordinator.data)
 
+    def _handle_coordinator_update(self) -> None:
+        self._async_write_state_if_changed()
+
 
-class PlantRunBaseRunSensor(CoordinatorEntity[PlantRunCoordinator], SensorEntity):
-    """Base class for run specific sensors."""
+class PlantRunBaseRunSensor(PlantRunWriteOnChangeMixin, CoordinatorEntity[PlantRunCoordinator], SensorEntity):
+    """Base class for run specific sensors.
+
+    Coordinator updates only reach entities of runs whose revision changed.
+    """
 
     _attr_has_entity_name = True
 
@@ -130,10 +211,11 @@ class PlantRunBaseRunSensor(CoordinatorEntity[PlantRunCoordinator], SensorEntity
 
     @property
     def run_data(self) -> RunData | None:
-        for r in self.coordinator.data:
-            if r.id == self.run_id:
-                return r
-        return None
+        return self.coordinator.run_lookup.run(self.run_id)
+
+    def _handle_coordinator_update(self) -> None:
+        if self.coordinator.run_changed(self.run_id):
+            self._async_write_state_if_changed()
 
     @property
     def device_info(self) -> dict:
@@ -201,7 +283,69 @@ class PlantRunCultivarSensor(PlantRunBaseRunSensor):
         return run.cultivar.name
 
 
-class PlantRunEnergySensor(PlantRunBaseRunSensor):
+class PlantRunSummarySensor(PlantRunBaseRunSensor):
+    """Base for sensors derived from the run's energy totals.
+
+    Values come straight from the incremental integrator, never from a summary build.
+    Open runs' values depend on time and prices, so these re-evaluate on every
+    update and on the coordinator's value tick, and only write when the value changed.
+    Ended runs are dormant: their summary is frozen, so they drop the tick listener
+    and only re-evaluate when their own run changed.
+    """
+
+    def __init__(
+        self,
+        coordinator: PlantRunCoordinator,
+        run_id: str,
+        *,
+        energy_price_per_kwh: float | None = None,
+        energy_currency: str | None = None,
+        energy_tariff: TariffSchedule | None = None,
+    ) -> None:
+        super().__init__(coordinator, run_id)
+        self._energy_price_per_kwh = energy_price_per_kwh
+        self._energy_currency = energy_currency
+        self._energy_tariff = energy_tariff
+        self._remove_tick_listener = None
+
+    def _bound_tariff(self) -> TariffSchedule | None:
+        tariff = self._energy_tariff
+        if tariff is not None and tariff.price_entity_id and self.hass is not None:
+            tariff = bind_price_entity(tariff, self.hass.states.get(tariff.price_entity_id))
+        return tariff
+
+    def _is_dormant(self) -> bool:
+        run = self.run_data
+        return run is not None and run.status == "ended"
+
+    def _handle_coordinator_update(self) -> None:
+        self._sync_tick_listener()
+        if not self._is_dormant() or self.coordinator.run_changed(self.run_id):
+            self._async_write_state_if_changed()
+
+    def _handle_value_tick(self) -> None:
+        if not self._is_dormant():
+            self._async_write_state_if_changed()
+
+    def _sync_tick_listener(self) -> None:
+        """Listen to the value tick only while the run is open."""
+        if self._is_dormant():
+            self._stop_tick_listener()
+        elif self._remove_tick_listener is None:
+            self._remove_tick_listener = self.coordinator.async_add_tick_listener(self._handle_value_tick)
+
+    def _stop_tick_listener(self) -> None:
+        if self._remove_tick_listener is not None:
+            self._remove_tick_listener()
+            self._remove_tick_listener = None
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(self._stop_tick_listener)
+        self._sync_tick_listener()
+
+
+class PlantRunEnergySensor(PlantRunSummarySensor):
     """Sensor exposing energy delta for the run window only."""
 
     _attr_icon = "mdi:lightning-bolt"
@@ -209,21 +353,18 @@ class PlantRunEnergySensor(PlantRunBaseRunSensor):
     _attr_state_class = "total"
     _attr_native_unit_of_measurement = "kWh"
 
-    def __init__(self, coordinator: PlantRunCoordinator, run_id: str) -> None:
-        super().__init__(coordinator, run_id)
+    def __init__(self, coordinator: PlantRunCoordinator, run_id: str, **pricing: Any) -> None:
+        super().__init__(coordinator, run_id, **pricing)
         self._attr_unique_id = f"plantrun_run_energy_{run_id}"
         self._attr_name = "Run Energy"
 
     @property
     def native_value(self) -> float | None:
         run = self.run_data
-        if not run:
-            return None
-        summary = build_run_summary(run)
-        return summary.get("energy_kwh")
+        return run_energy_kwh(run) if run else None
 
 
-class PlantRunEnergyCostSensor(PlantRunBaseRunSensor):
+class PlantRunEnergyCostSensor(PlantRunSummarySensor):
     """Sensor exposing run-level energy cost for dashboard consumption."""
 
     _attr_icon = "mdi:currency-eur"
@@ -237,10 +378,15 @@ class PlantRunEnergyCostSensor(PlantRunBaseRunSensor):
         *,
         energy_price_per_kwh: float | None,
         energy_currency: str,
+        energy_tariff: TariffSchedule | None = None,
     ) -> None:
-        super().__init__(coordinator, run_id)
-        self._energy_price_per_kwh = energy_price_per_kwh
-        self._energy_currency = energy_currency
+        super().__init__(
+            coordinator,
+            run_id,
+            energy_price_per_kwh=energy_price_per_kwh,
+            energy_currency=energy_currency,
+            energy_tariff=energy_tariff,
+        )
         self._attr_unique_id = f"plantrun_run_energy_cost_{run_id}"
         self._attr_name = "Run Energy Cost"
         self._attr_native_unit_of_measurement = energy_currency
@@ -250,27 +396,283 @@ class PlantRunEnergyCostSensor(PlantRunBaseRunSensor):
         run = self.run_data
         if not run:
             return None
-        summary = build_run_summary(
+        return run_energy_totals(
             run,
             energy_price_per_kwh=self._energy_price_per_kwh,
             energy_currency=self._energy_currency,
-        )
-        return summary.get("energy_cost")
+            energy_tariff=self._bound_tariff(),
+        )[1]
 
     @property
     def extra_state_attributes(self) -> dict[str, float | str | None]:
         return {
             "energy_price_per_kwh": self._energy_price_per_kwh,
             "energy_currency": self._energy_currency,
+            "energy_pricing": "time_of_use" if self._energy_tariff is not None else "flat",
             "scope": "run_window",
         }
 
 
-class PlantRunProxySensor(CoordinatorEntity[PlantRunCoordinator], SensorEntity):
+class PlantRunDerivedSensor(PlantRunBaseRunSensor):
+    """Base for per-run sensors computed from bound sources in O(1) per source event.
+
+    Listens through the shared dispatcher to the run's first binding of each
+    ``source_metrics`` type and re-subscribes when those bindings change. Ended
+    runs are dormant: the listeners are dropped and the last value is kept.
+    """
+
+    _attr_should_poll = False
+    source_metrics: tuple[str, ...] = ()
+
+    def __init__(
+        self,
+        coordinator: PlantRunCoordinator,
+        run_id: str,
+        *,
+        source_dispatcher: SourceStateDispatcher | None = None,
+    ) -> None:
+        super().__init__(coordinator, run_id)
+        self._source_dispatcher = source_dispatcher
+        # metric type -> (source entity id, dispatcher remover)
+        self._sources: dict[str, tuple[str, Callable[[], None]]] = {}
+
+    def _is_dormant(self) -> bool:
+        run = self.run_data
+        return run is not None and run.status == "ended"
+
+    @property
+    def available(self) -> bool:
+        return self.run_data is not None and self.native_value is not None
+
+    def _bound_sources(self) -> dict[str, str]:
+        run = self.run_data
+        sources: dict[str, str] = {}
+        for binding in run.bindings if run else []:
+            if binding.metric_type in self.source_metrics:
+                sources.setdefault(binding.metric_type, binding.sensor_id)
+        return sources
+
+    def _sync_sources(self) -> None:
+        """Match source listeners to the run's current bindings (none while dormant)."""
+        if self._is_dormant():
+            self._untrack_sources()
+            return
+        sources = self._bound_sources()
+        for metric, (entity_id, _remove) in list(self._sources.items()):
+            if sources.get(metric) != entity_id:
+                self._untrack_source(metric)
+                self._on_source_value(metric, None, time())
+        for metric, entity_id in sources.items():
+            if metric not in self._sources:
+                self._track_source(metric, entity_id)
+
+    def _track_source(self, metric: str, entity_id: str) -> None:
+        if self._source_dispatcher is None:
+            self._source_dispatcher = SourceStateDispatcher(self.hass, METRIC_METADATA)
+        remove = self._source_dispatcher.async_add_listener(entity_id, partial(self._handle_source_event, metric))
+        self._sources[metric] = (entity_id, remove)
+        state = self.hass.states.get(entity_id)
+        self._on_source_value(metric, self._source_value(metric, state), _state_timestamp(state))
+
+    def _untrack_source(self, metric: str) -> None:
+        _entity_id, remove = self._sources.pop(metric)
+        remove()
+
+    def _untrack_sources(self) -> None:
+        for metric in list(self._sources):
+            self._untrack_source(metric)
+
+    def _source_value(self, metric: str, state: Any) -> float | None:
+        """Return the source state's numeric value in the metric's canonical unit."""
+        if state is None or metric not in self._sources:
+            return None
+        group = self._source_dispatcher.source_group(self._sources[metric][0], metric)
+        value = group.normalize(state)
+        # Derived formulas need the canonical unit; an unconverted source is unusable.
+        if group.converter.unit_drift or not isinstance(value, (int, float)):
+            return None
+        return float(value)
+
+    def _on_source_value(self, metric: str, value: float | None, ts: float) -> None:
+        """Fold one source value (None when unavailable) into the running state."""
+
+    def _load_recorded_value(self) -> None:
+        """Seed the running state of a dormant run from its recorded history."""
+
+    @callback
+    def _handle_source_event(self, metric: str, event: Event) -> None:
+        new_state = event.data.get("new_state")
+        self._on_source_value(metric, self._source_value(metric, new_state), _state_timestamp(new_state))
+        self._async_write_state_if_changed()
+
+    def _handle_coordinator_update(self) -> None:
+        if not self.coordinator.run_changed(self.run_id):
+            return
+        if getattr(self, "hass", None) is not None:
+            self._sync_sources()
+        self._async_write_state_if_changed()
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(self._untrack_sources)
+        if self._is_dormant():
+            self._load_recorded_value()
+        else:
+            self._sync_sources()
+        self._async_write_state_if_changed()
+
+
+class PlantRunVpdSensor(PlantRunDerivedSensor):
+    """Vapour pressure deficit of the run's last aligned temperature/humidity pair."""
+
+    _attr_icon = "mdi:water-thermometer"
+    _attr_device_class = "pressure"
+    _attr_state_class = "measurement"
+    _attr_native_unit_of_measurement = "kPa"
+    source_metrics = (METRIC_TYPE_TEMPERATURE, METRIC_TYPE_HUMIDITY)
+
+    def __init__(self, coordinator: PlantRunCoordinator, run_id: str, **kwargs: Any) -> None:
+        super().__init__(coordinator, run_id, **kwargs)
+        self._attr_unique_id = f"plantrun_vpd_{run_id}"
+        self._attr_name = "VPD"
+        # Live sources report on change only; a held value stays valid until replaced.
+        self._tracker = VpdTracker()
+
+    @property
+    def native_value(self) -> float | None:
+        value = self._tracker.value
+        return round(value, 3) if value is not None else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        return {"temperature": self._tracker.temperature, "humidity": self._tracker.humidity}
+
+    def _on_source_value(self, metric: str, value: float | None, ts: float) -> None:
+        self._tracker.update(metric, value, ts)
+
+    def _load_recorded_value(self) -> None:
+        run = self.run_data
+        if run is None:
+            return
+        stats = build_derived_accumulators(run, **_recorded_window(run))[DERIVED_METRIC_VPD]
+        self._tracker.value = stats.end
+
+
+class PlantRunDliSensor(PlantRunDerivedSensor):
+    """Daily light integral of the run's light source, reset at local midnight.
+
+    Light is read as lux (factor ``base_config["light_ppfd_factor"]``) unless the
+    source reports PPFD. The held reading keeps accruing on the value tick.
+    """
+
+    _attr_icon = "mdi:white-balance-sunny"
+    _attr_state_class = "total_increasing"
+    _attr_native_unit_of_measurement = "mol/(m²·d)"
+    source_metrics = (METRIC_TYPE_LIGHT,)
+
+    def __init__(self, coordinator: PlantRunCoordinator, run_id: str, **kwargs: Any) -> None:
+        super().__init__(coordinator, run_id, **kwargs)
+        self._attr_unique_id = f"plantrun_dli_{run_id}"
+        self._attr_name = "DLI"
+        self._integral: DayIntegral | None = None
+        self._remove_tick_listener = None
+
+    @property
+    def native_value(self) -> float | None:
+        if self._integral is None or self._integral.value is None:
+            return None
+        return round(self._integral.value, 2)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        return {"day": self._integral.day if self._integral is not None else None}
+
+    @property
+    def available(self) -> bool:
+        return super().available and (self._is_dormant() or bool(self._sources))
+
+    def _day_integral(self) -> DayIntegral:
+        """Return the running integral, seeded from today's recorded light on first use."""
+        if self._integral is None:
+            tz = time_zone_from_name(getattr(getattr(self.hass, "config", None), "time_zone", None))
+            self._integral = DayIntegral(tz or timezone.utc)
+            self._seed_from_history(time())
+        return self._integral
+
+    def _seed_from_history(self, as_of: float) -> None:
+        run = self.run_data
+        if run is None or self._integral is None:
+            return
+        integral = self._integral
+        day_start = datetime.combine(
+            datetime.fromtimestamp(as_of, integral.tz).date(), datetime.min.time(), tzinfo=integral.tz
+        )
+        window_start = parse_iso_datetime(run.start_time)
+        start = max(day_start, window_start) if window_start is not None else day_start
+        factor = light_ppfd_factor(run)
+        for ts, value in timed_values(
+            (run.sensor_history or {}).get(METRIC_TYPE_LIGHT, []),
+            start=start,
+            end=datetime.fromtimestamp(as_of, timezone.utc),
+            carry_in=True,
+        ):
+            integral.add(value * factor, ts)
+        integral.advance(as_of)
+        integral.closed = None
+
+    def _source_value(self, metric: str, state: Any) -> float | None:
+        value = super()._source_value(metric, state)
+        run = self.run_data
+        if value is None or run is None:
+            return None
+        unit = self._source_dispatcher.source_group(self._sources[metric][0], metric).converter.unit
+        return value * ppfd_factor(unit, light_ppfd_factor(run))
+
+    def _on_source_value(self, metric: str, value: float | None, ts: float) -> None:
+        integral = self._day_integral()
+        # A state older than the history seed still holds from the seed onwards.
+        if integral.last_ts is not None:
+            ts = max(ts, integral.last_ts)
+        integral.add(value, ts)
+
+    def _handle_value_tick(self) -> None:
+        if self._integral is None or self._is_dormant():
+            return
+        self._integral.advance(time())
+        self._async_write_state_if_changed()
+
+    def _sync_sources(self) -> None:
+        super()._sync_sources()
+        if self._is_dormant() or not self._sources:
+            self._stop_tick_listener()
+        elif self._remove_tick_listener is None:
+            self._remove_tick_listener = self.coordinator.async_add_tick_listener(self._handle_value_tick)
+
+    def _stop_tick_listener(self) -> None:
+        if self._remove_tick_listener is not None:
+            self._remove_tick_listener()
+            self._remove_tick_listener = None
+
+    def _load_recorded_value(self) -> None:
+        run = self.run_data
+        end = parse_iso_datetime(run.end_time) if run is not None else None
+        if end is None:
+            return
+        tz = time_zone_from_name(getattr(getattr(self.hass, "config", None), "time_zone", None))
+        self._integral = DayIntegral(tz or timezone.utc)
+        self._seed_from_history(end.timestamp())
+
+    async def async_added_to_hass(self) -> None:
+        self.async_on_remove(self._stop_tick_listener)
+        await super().async_added_to_hass()
+
+
+class PlantRunProxySensor(PlantRunWriteOnChangeMixin, CoordinatorEntity[PlantRunCoordinator], SensorEntity):
     """Sensor that mirrors an existing HA entity but attaches to the PlantRun device."""
 
     _attr_has_entity_name = True
     _attr_should_poll = False
+    _attr_native_unit_of_measurement: str | None = None
 
     def __init__(
         self,
@@ -278,16 +680,32 @@ class PlantRunProxySensor(CoordinatorEntity[PlantRunCoordinator], SensorEntity):
         run_id: str,
         run_name: str,
         binding: Binding,
+        source_dispatcher: SourceStateDispatcher | None = None,
+        dormant_policy: str = DEFAULT_DORMANT_POLICY,
     ) -> None:
-        """Initialize the proxy sensor."""
+        """Initialize the proxy sensor.
+
+        Proxies created by the platform share its ``source_dispatcher``; a
+        standalone proxy gets its own when added to Home Assistant.
+        ``dormant_policy`` decides what the proxy shows once its run ended.
+        """
         super().__init__(coordinator)
+        self._source_dispatcher = source_dispatcher
+        self._dormant_policy = dormant_policy
         self.run_id = run_id
         self.run_name = run_name
         self.metric_type = binding.metric_type
         self.source_entity_id = binding.sensor_id
         self.binding_id = binding.id
         self._remove_source_listener = None
-        
+        self._history_context_cache: tuple[tuple[Any, ...], dict[str, Any]] | None = None
+        self._mirror_gate = _mirror_gate_for(self.metric_type)
+        self._pending_source_state = None
+        self._cancel_mirror_flush = None
+        self._alert_monitor: ThresholdMonitor | None = None
+        self._cancel_alert_check = None
+        self._reset_converter()
+
         self._attr_unique_id = _binding_unique_id(run_id, binding)
         self._attr_name = self.metric_type.replace("_", " ").title()
         
@@ -300,10 +718,12 @@ class PlantRunProxySensor(CoordinatorEntity[PlantRunCoordinator], SensorEntity):
 
     @property
     def run_data(self) -> RunData | None:
-        for run in self.coordinator.data:
-            if run.id == self.run_id:
-                return run
-        return None
+        return self.coordinator.run_lookup.run(self.run_id)
+
+    def _is_dormant(self) -> bool:
+        """Return True once the run ended; dormant proxies do not track their source."""
+        run = self.run_data
+        return run is not None and run.status == "ended"
 
     def _binding_still_exists(self) -> bool:
         """Return True while this binding still exists on the run."""
@@ -316,11 +736,7 @@ class PlantRunProxySensor(CoordinatorEntity[PlantRunCoordinator], SensorEntity):
 
     def _current_binding(self) -> Binding | None:
         """Return the current storage binding for this proxy's stable binding id."""
-        for run in self.coordinator.data:
-            if run.id != self.run_id:
-                continue
-            return next((binding for binding in run.bindings if binding.id == self.binding_id), None)
-        return None
+        return self.coordinator.run_lookup.binding(self.run_id, self.binding_id)
 
     def _sync_binding_from_run(self) -> bool:
         """Sync metric/source fields when a binding is edited without reloading HA."""
@@ -338,42 +754,39 @@ class PlantRunProxySensor(CoordinatorEntity[PlantRunCoordinator], SensorEntity):
         self._attr_unique_id = _binding_unique_id(self.run_id, binding)
         self._attr_name = self.metric_type.replace("_", " ").title()
         self._attr_native_value = None
+        self._cancel_pending_mirror()
+        self._mirror_gate = _mirror_gate_for(self.metric_type)
+        self._reset_converter()
+        self._sync_alert_rule(force=True)
 
-        if hasattr(self, "hass"):
+        if hasattr(self, "hass") and not self._is_dormant():
             if source_changed:
                 self._track_source_entity()
             self._load_current_source_state(write_state=False)
         return True
 
     def _apply_source_metadata(self, attrs: dict) -> None:
-        """Apply metadata with safe metric-specific fallback for recorder/statistics."""
-        expected = METRIC_METADATA.get(self.metric_type, {})
-        source_unit = attrs.get("unit_of_measurement")
-        source_device_class = attrs.get("device_class")
-        source_state_class = attrs.get("state_class")
-
-        if self.metric_type == "light":
-            normalized_light_unit = _normalize_light_unit(source_unit)
-            self._attr_native_unit_of_measurement = normalized_light_unit
-            self._attr_device_class = source_device_class or _light_device_class_for_unit(normalized_light_unit)
-            self._attr_state_class = source_state_class or expected.get("state_class")
-            return
-
-        expected_unit = expected.get("unit")
-        if expected_unit and source_unit and source_unit != expected_unit:
-            _LOGGER.warning(
-                "Unit drift for %s (%s): source='%s', expected='%s'. Keeping source unit.",
-                self.source_entity_id,
-                self.metric_type,
-                source_unit,
-                expected_unit,
-            )
+        """Apply metadata with safe metric-specific fallback for recorder/statistics.
 
+        The converter is compiled by the binding's source group and only when the
+        source's unit, device class or state class changed.
+        """
+        converter = self._source_group.apply_metadata(attrs)
+        if converter is self._converter:
+            return
+        self._converter = converter
         # Never relabel units without converting values first.
-        # Keep source unit to avoid corrupt recorder/statistics semantics.
-        self._attr_native_unit_of_measurement = source_unit or expected_unit
-        self._attr_device_class = source_device_class or expected.get("device_class")
-        self._attr_state_class = source_state_class or expected.get("state_class")
+        self._attr_native_unit_of_measurement = converter.unit
+        self._attr_device_class = converter.device_class
+        self._attr_state_class = converter.state_class
+
+    def _reset_converter(self) -> None:
+        """Pick the source group for the current binding; private until the proxy is tracking."""
+        if self._source_dispatcher is not None and self._remove_source_listener is not None:
+            self._source_group = self._source_dispatcher.source_group(self.source_entity_id, self.metric_type)
+        else:
+            self._source_group = SourceGroup(self.source_entity_id, self.metric_type, METRIC_METADATA)
+        self._converter = None
 
     def _source_state_available(self) -> bool:
         """Return true when the source entity exists and is usable."""
@@ -386,40 +799,21 @@ class PlantRunProxySensor(CoordinatorEntity[PlantRunCoordinator], SensorEntity):
         return self._normalize_source_native_value(state.state) is not None
 
     def _normalize_source_native_value(self, raw_value: object) -> float | int | str | None:
-        """Return a HA-safe native value for the bound source sensor."""
-        if raw_value is None:
-            return None
-
-        if isinstance(raw_value, str):
-            normalized = raw_value.strip()
-            if normalized.casefold() in UNAVAILABLE_SENSOR_STATES:
-                return None
-        else:
-            normalized = raw_value
-
-        if self.metric_type not in METRIC_METADATA:
-            return normalized
-
-        if isinstance(normalized, (int, float)):
-            return normalized
-
-        try:
-            numeric_value = float(str(normalized).replace(",", "."))
-        except (TypeError, ValueError):
-            _LOGGER.debug(
-                "Ignoring non-numeric state '%s' for %s (%s)",
-                raw_value,
-                self.source_entity_id,
-                self.metric_type,
-            )
-            return None
-
-        return int(numeric_value) if numeric_value.is_integer() else numeric_value
+        """Return a HA-safe native value in the binding's canonical unit."""
+        return self._source_group.converter.convert(raw_value)
 
     @property
     def available(self) -> bool:
-        """Mark proxy unavailable when binding was removed at runtime."""
-        return self._binding_still_exists() and self._source_state_available()
+        """Mark proxy unavailable when binding was removed at runtime.
+
+        Dormant proxies no longer look at their source: they stay available with
+        the frozen value, or are unavailable under the "unavailable" policy.
+        """
+        if not self._binding_still_exists():
+            return False
+        if self._is_dormant():
+            return self._dormant_policy == DORMANT_POLICY_FREEZE and self._attr_native_value is not None
+        return self._source_state_available()
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
@@ -431,47 +825,210 @@ class PlantRunProxySensor(CoordinatorEntity[PlantRunCoordinator], SensorEntity):
             sensor_id=self.source_entity_id,
             id=self.binding_id,
         )
-        context = build_binding_history_context(
-            self.run_data,
-            binding,
-            source_exists=source_exists,
-        ) if self.run_data else None
+        run = self.run_data
+        context = self._history_context(run, binding, source_exists=source_exists) if run else None
         return {
             "run_id": self.run_id,
             "binding_id": self.binding_id,
             "source_entity_id": self.source_entity_id,
             "binding_active": self._binding_still_exists(),
             "source_available": self._source_state_available(),
+            "dormant": self._is_dormant(),
             "history_context": context,
         }
 
+    def _history_context(self, run: RunData, binding: Binding, *, source_exists: bool) -> dict[str, Any]:
+        """Return the cached history context, rebuilt only when its inputs change."""
+        key = binding_history_context_key(run, binding, source_exists=source_exists)
+        if self._history_context_cache is None or self._history_context_cache[0] != key:
+            context = build_persisted_binding_history_context(run, binding, source_exists=source_exists)
+            self._history_context_cache = (key, context)
+        return self._history_context_cache[1]
+
+    def _state_fingerprint(self) -> tuple[Any, ...]:
+        return (*super()._state_fingerprint(), self._attr_native_unit_of_measurement)
+
     def _handle_coordinator_update(self) -> None:
-        """Update availability as runtime bindings are added/removed."""
+        """Update availability as runtime bindings of this run are added/removed."""
+        if not self.coordinator.run_changed(self.run_id):
+            return
+        if getattr(self, "hass", None) is not None:
+            self._sync_alert_rule()
+            self._sync_dormancy()
         if not self._sync_binding_from_run() or not self.available:
             self._attr_native_value = None
-        self.async_write_ha_state()
+        self._async_write_state_if_changed()
+
+    def _sync_dormancy(self) -> None:
+        """Stop mirroring when the run ended and resume when it was reopened."""
+        if self._is_dormant():
+            if self._remove_source_listener is None:
+                return
+            # Keep a deferred significant change as the frozen value.
+            if self._pending_source_state is not None:
+                self._attr_native_value = self._normalize_source_native_value(self._pending_source_state.state)
+            self._cancel_pending_mirror()
+            self._untrack_source_entity()
+            if self._dormant_policy != DORMANT_POLICY_FREEZE:
+                self._attr_native_value = None
+        elif self._remove_source_listener is None:
+            self._mirror_gate.reset()
+            self._track_source_entity()
+            self._load_current_source_state(write_state=False)
 
+    @property
+    def mirror_counters(self) -> dict[str, int]:
+        """Return forwarded/dropped/deferred source event counts for this binding."""
+        return self._mirror_gate.counters
+
+    @callback
     def _handle_source_state_change(self, event: Event) -> None:
-        """Mirror source state changes while preserving unavailable/orphan semantics."""
+        """Mirror source state changes while preserving unavailable/orphan semantics.
+
+        Numeric updates pass through the metric's MirrorThrottle; a significant
+        change inside the minimum interval is mirrored once the interval elapsed.
+        """
         new_state = event.data.get("new_state")
         if new_state is None:
+            self._mirror_gate.reset()
+            self._pending_source_state = None
             self._attr_native_value = None
-            self.schedule_update_ha_state()
+            self._schedule_write_state_if_changed()
             return
+        converter = self._converter
+        value = self._source_group.normalize(new_state)
         self._apply_source_metadata(new_state.attributes)
-        self._attr_native_value = self._normalize_source_native_value(new_state.state)
-        self.schedule_update_ha_state()
+        # Alerts see every source event, including ones the mirror throttle drops.
+        self._evaluate_alert(value, _state_timestamp(new_state))
+        decision = self._mirror_gate.decide(value, monotonic(), force=self._converter is not converter)
+        if decision == MIRROR_DROP:
+            self._pending_source_state = None
+            return
+        if decision == MIRROR_DEFER:
+            self._pending_source_state = new_state
+            self._async_schedule_mirror_flush()
+            return
+        self._pending_source_state = None
+        self._attr_native_value = value
+        self._schedule_write_state_if_changed()
+
+    def _sync_alert_rule(self, *, force: bool = False) -> None:
+        """Rebuild the threshold monitor when the run's rule for this metric changed."""
+        rule = None if self._is_dormant() else alert_rule_for(self.run_data, self.metric_type)
+        current = self._alert_monitor.rule if self._alert_monitor is not None else None
+        if rule == current and not force:
+            return
+        self._cancel_pending_alert_check()
+        self._alert_monitor = ThresholdMonitor(rule) if rule is not None else None
+
+    def _evaluate_alert(self, value: Any, ts: float) -> None:
+        """Feed one source value into the threshold monitor (O(1)) and fire transitions."""
+        monitor = self._alert_monitor
+        if monitor is None:
+            return
+        numeric = float(value) if isinstance(value, (int, float)) else None
+        for transition in monitor.update(numeric, ts):
+            self._fire_alert(transition)
+        if monitor.pending_deadline is not None and self._cancel_alert_check is None:
+            self._async_schedule_alert_check()
+
+    @callback
+    def _async_schedule_alert_check(self) -> None:
+        """Re-check a pending excursion at its deadline in case the source stays quiet."""
+        monitor = self._alert_monitor
+        if self._cancel_alert_check is not None or monitor is None or monitor.pending_deadline is None:
+            return
+        delay = max(0.0, monitor.pending_deadline - time())
+        self._cancel_alert_check = async_call_later(self.hass, delay, self._async_check_alert)
+
+    @callback
+    def _async_check_alert(self, _now: Any = None) -> None:
+        self._cancel_alert_check = None
+        monitor = self._alert_monitor
+        if monitor is None:
+            return
+        transition = monitor.check(time())
+        if transition is not None:
+            self._fire_alert(transition)
+        elif monitor.pending_deadline is not None:
+            self._async_schedule_alert_check()
+
+    def _cancel_pending_alert_check(self) -> None:
+        if self._cancel_alert_check is not None:
+            self._cancel_alert_check()
+            self._cancel_alert_check = None
+
+    def _fire_alert(self, transition: AlertTransition) -> None:
+        self.hass.bus.async_fire(
+            EVENT_ALERT,
+            {
+                "run_id": self.run_id,
+                "run_name": self.run_name,
+                "binding_id": self.binding_id,
+                "metric_type": self.metric_type,
+                "source_entity_id": self.source_entity_id,
+                "entity_id": getattr(self, "entity_id", None),
+                **transition.as_event_data(),
+            },
+        )
+
+    @callback
+    def _async_schedule_mirror_flush(self) -> None:
+        if self._cancel_mirror_flush is not None or self._mirror_gate.last_ts is None:
+            return
+        delay = self._mirror_gate.last_ts + self._mirror_gate.throttle.min_interval_s - monotonic()
+        self._cancel_mirror_flush = async_call_later(self.hass, max(0.0, delay), self._async_flush_mirror)
+
+    @callback
+    def _async_flush_mirror(self, _now: Any = None) -> None:
+        """Mirror the latest deferred source state once the minimum interval elapsed."""
+        self._cancel_mirror_flush = None
+        state, self._pending_source_state = self._pending_source_state, None
+        if state is None:
+            return
+        value = self._normalize_source_native_value(state.state)
+        self._mirror_gate.flush(value, monotonic())
+        self._attr_native_value = value
+        self._async_write_state_if_changed()
+
+    def _cancel_pending_mirror(self) -> None:
+        self._pending_source_state = None
+        if self._cancel_mirror_flush is not None:
+            self._cancel_mirror_flush()
+            self._cancel_mirror_flush = None
 
     def _track_source_entity(self) -> None:
         """Track the current source entity, replacing stale listeners after binding edits."""
+        self._untrack_source_entity()
+        if self._source_dispatcher is None:
+            self._source_dispatcher = SourceStateDispatcher(self.hass, METRIC_METADATA)
+        self._remove_source_listener = self._source_dispatcher.async_add_listener(
+            self.source_entity_id, self._handle_source_state_change
+        )
+        self._reset_converter()
+
+    def _untrack_source_entity(self) -> None:
         if self._remove_source_listener is not None:
             self._remove_source_listener()
             self._remove_source_listener = None
-        remove = async_track_state_change_event(
-            self.hass, [self.source_entity_id], self._handle_source_state_change
-        )
-        self._remove_source_listener = remove
-        self.async_on_remove(remove)
+
+    def _load_recorded_value(self) -> None:
+        """Seed a dormant proxy from the last in-window value stored on the run."""
+        run = self.run_data
+        self._attr_native_value = None
+        if run is None or self._dormant_policy != DORMANT_POLICY_FREEZE:
+            return
+        end = parse_iso_datetime(run.end_time)
+        for point in reversed((run.sensor_history or {}).get(self.metric_type, [])):
+            if not isinstance(point, dict) or point.get("entity_id", self.source_entity_id) != self.source_entity_id:
+                continue
+            timestamp = parse_iso_datetime(point.get("timestamp"))
+            if end is not None and timestamp is not None and timestamp > end:
+                continue
+            value = self._normalize_source_native_value(point.get("value"))
+            if value is not None:
+                self._attr_native_value = value
+                return
 
     def _load_current_source_state(self, *, write_state: bool) -> None:
         """Initialize proxy value from the current source state if it exists."""
@@ -479,18 +1036,68 @@ class PlantRunProxySensor(CoordinatorEntity[PlantRunCoordinator], SensorEntity):
         if state:
             self._apply_source_metadata(state.attributes)
             self._attr_native_value = self._normalize_source_native_value(state.state)
+            self._evaluate_alert(self._attr_native_value, _state_timestamp(state))
         else:
             self._attr_native_value = None
         if write_state:
-            self.async_write_ha_state()
+            self._async_write_state_if_changed()
 
     async def async_added_to_hass(self) -> None:
         """Handle entity which will be added."""
         await super().async_added_to_hass()
+        self.async_on_remove(self._cancel_pending_mirror)
+        self.async_on_remove(self._cancel_pending_alert_check)
+        self.async_on_remove(self._untrack_source_entity)
+        self._sync_alert_rule()
+        if self._is_dormant():
+            self._load_recorded_value()
+            self._async_write_state_if_changed()
+            return
         self._track_source_entity()
         self._load_current_source_state(write_state=True)
 
 
+def _async_remove_entities(hass: HomeAssistant, entities: list[SensorEntity]) -> None:
+    """Remove entities via their registry entry, which also unloads them and their listeners."""
+    registry = er.async_get(hass)
+    for entity in entities:
+        entity_id = registry.async_get_entity_id("sensor", DOMAIN, entity.unique_id)
+        if entity_id is not None:
+            registry.async_remove(entity_id)
+        elif getattr(entity, "hass", None) is not None:
+            hass.async_create_task(entity.async_remove(force_remove=True))
+
+
+def _async_remove_orphaned_registry_entries(hass: HomeAssistant, entry: ConfigEntry, expected: set[str]) -> int:
+    """Remove this entry's sensor registry entries whose run or binding no longer exists."""
+    registry = er.async_get(hass)
+    removed = 0
+    for entity_entry in er.async_entries_for_config_entry(registry, entry.entry_id):
+        if entity_entry.domain != "sensor" or entity_entry.unique_id in expected:
+            continue
+        registry.async_remove(entity_entry.entity_id)
+        removed += 1
+    if removed:
+        _LOGGER.info("Removed %s orphaned PlantRun sensor registry entr%s.", removed, "y" if removed == 1 else "ies")
+    return removed
+
+
+def _state_timestamp(state: Any) -> float:
+    changed_at = getattr(state, "last_updated", None)
+    return changed_at.timestamp() if isinstance(changed_at, datetime) else time()
+
+
+def _recorded_window(run: RunData) -> dict[str, datetime | None]:
+    window = run_window_for(run)
+    if window.start is None or window.effective_end < window.start:
+        return {"start": None, "end": None}
+    return {"start": window.start, "end": window.effective_end}
+
+
+def _mirror_gate_for(metric_type: str) -> MirrorGate:
+    return MirrorGate(MirrorThrottle.from_metadata(METRIC_METADATA.get(metric_type, {})))
+
+
 def _binding_unique_id(run_id: str, binding: Binding) -> str:
     """Return stable unique_id with legacy compatibility for v1 bindings.
 
@@ -503,27 +1110,3 @@ def _binding_unique_id(run_id: str, binding: Binding) -> str:
     if binding.id.startswith("legacy_"):
         return f"plantrun_{binding.metric_type}_{run_id}_{binding.id}"
     return f"plantrun_binding_{run_id}_{binding.id}"
-
-
-def _normalize_light_unit(unit: str | None) -> str | None:
-    """Normalize recognized light-unit aliases to their canonical representation."""
-    if unit is None:
-        return None
-
-    normalized = unit.strip().casefold()
-    if normalized in LIGHT_ILLUMINANCE_UNIT_ALIASES:
-        return "lx"
-
-    return unit
-
-
-def _light_device_class_for_unit(unit: str | None) -> str | None:
-    """Return a safe light device class fallback for known illuminance units."""
-    if unit is None:
-        return None
-
-    normalized = unit.strip().casefold()
-    if normalized in LIGHT_ILLUMINANCE_UNIT_ALIASES:
-        return "illuminance"
-
-    return None
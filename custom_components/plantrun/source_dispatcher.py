@@ -0,0 +1,127 @@
+"""Shared source-state subscriptions for PlantRun proxy sensors."""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Callable, Mapping
+
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_state_change_event
+
+from .value_converter import ValueConverter, compile_converter, metadata_key
+
+_LOGGER = logging.getLogger(__name__)
+
+SourceStateListener = Callable[[Event], None]
+
+
+class SourceGroup:
+    """One source entity read as one metric type, shared by every run bound to it.
+
+    The converter is compiled once per change of the source's unit metadata and
+    each state object is normalized once, however many proxies mirror it.
+    """
+
+    def __init__(self, entity_id: str, metric_type: str, metadata: Mapping[str, Mapping[str, Any]]) -> None:
+        self.entity_id = entity_id
+        self.metric_type = metric_type
+        self._metadata = metadata
+        self._converter_key: tuple[Any, ...] | None = None
+        self.converter: ValueConverter = compile_converter(metric_type, {}, metadata)
+        self._last_state: Any = None
+        self._last_value: float | int | str | None = None
+
+    def apply_metadata(self, attrs: Mapping[str, Any]) -> ValueConverter:
+        """Return the converter for ``attrs``, recompiling only when they changed."""
+        key = metadata_key(attrs)
+        if key == self._converter_key:
+            return self.converter
+        self._converter_key = key
+        self.converter = compile_converter(self.metric_type, attrs, self._metadata)
+        if self.converter.unit_drift:
+            _LOGGER.warning(
+                "Unit drift for %s (%s): source='%s', expected='%s'. Keeping source unit.",
+                self.entity_id,
+                self.metric_type,
+                self.converter.source_unit,
+                self._metadata[self.metric_type].get("unit"),
+            )
+        return self.converter
+
+    def normalize(self, state: Any) -> float | int | str | None:
+        """Return the canonical value of a state object, computed once per state."""
+        if state is not self._last_state:
+            self.apply_metadata(state.attributes)
+            self._last_value = self.converter.convert(state.state)
+            self._last_state = state
+        return self._last_value
+
+
+class SourceStateDispatcher:
+    """Fan source entity state changes out to the proxies bound to them.
+
+    Keeps exactly one Home Assistant subscription per distinct source entity,
+    however many runs bind it, and adds or drops that subscription
+    incrementally as the first proxy attaches or the last one detaches.
+    Normalization is shared through one ``SourceGroup`` per source and metric.
+    """
+
+    def __init__(self, hass: HomeAssistant, metadata: Mapping[str, Mapping[str, Any]] | None = None) -> None:
+        self.hass = hass
+        self._metadata = metadata or {}
+        self._listeners: dict[str, list[SourceStateListener]] = {}
+        self._unsubscribers: dict[str, Callable[[], None]] = {}
+        self._groups: dict[tuple[str, str], SourceGroup] = {}
+
+    def source_group(self, entity_id: str, metric_type: str) -> SourceGroup:
+        """Return the shared group for ``entity_id`` read as ``metric_type``."""
+        key = (entity_id, metric_type)
+        group = self._groups.get(key)
+        if group is None:
+            group = self._groups[key] = SourceGroup(entity_id, metric_type, self._metadata)
+        return group
+
+    @property
+    def entity_ids(self) -> set[str]:
+        """Return the source entities currently subscribed."""
+        return set(self._unsubscribers)
+
+    def async_add_listener(self, entity_id: str, action: SourceStateListener) -> Callable[[], None]:
+        """Route state changes of ``entity_id`` to ``action``; returns a remover."""
+        self._listeners.setdefault(entity_id, []).append(action)
+        if entity_id not in self._unsubscribers:
+            self._unsubscribers[entity_id] = async_track_state_change_event(
+                self.hass, [entity_id], self._async_dispatch
+            )
+
+        def _remove() -> None:
+            self._remove_listener(entity_id, action)
+
+        return _remove
+
+    def _remove_listener(self, entity_id: str, action: SourceStateListener) -> None:
+        listeners = self._listeners.get(entity_id)
+        if not listeners or action not in listeners:
+            return
+        listeners.remove(action)
+        if listeners:
+            return
+        del self._listeners[entity_id]
+        for key in [key for key in self._groups if key[0] == entity_id]:
+            del self._groups[key]
+        unsubscribe = self._unsubscribers.pop(entity_id, None)
+        if unsubscribe is not None:
+            unsubscribe()
+
+    @callback
+    def _async_dispatch(self, event: Event) -> None:
+        for action in tuple(self._listeners.get(event.data.get("entity_id"), ())):
+            action(event)
+
+    def async_shutdown(self) -> None:
+        """Drop every subscription (config entry unload)."""
+        for unsubscribe in self._unsubscribers.values():
+            unsubscribe()
+        self._unsubscribers.clear()
+        self._listeners.clear()
+        self._groups.clear()
@@ -2,8 +2,8 @@
 
 import copy
 import logging
-from contextlib import nullcontext
-from typing import Any
+from contextlib import asynccontextmanager, nullcontext
+from typing import Any, AsyncIterator, Callable, Iterable
 
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.storage import Store
@@ -11,6 +11,7 @@ from homeassistant.helpers.storage import Store
 from .const import DOMAIN, INITIAL_PHASE_NAME, STORE_KEY, STORE_SCHEMA_VERSION, STORE_VERSION
 from .instrumentation import PlantRunInstrumentation
 from .models import RunData
+from .rollup_index import RollupDayIndex
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -24,6 +25,12 @@ class PlantRunStorage:
         self._store: Store[dict[str, Any]] = Store(hass, STORE_VERSION, STORE_KEY)
         self._instrumentation = instrumentation
         self.runs: list[RunData] = []
+        self._run_revisions: dict[str, int] = {}
+        self._change_listeners: list[Callable[[set[str]], None]] = []
+        self._delayed_save_pending = False
+        self._batch_depth = 0
+        self._batch_save_pending = False
+        self.rollup_index = RollupDayIndex()
         self._data: dict[str, Any] = {
             "schema_version": STORE_SCHEMA_VERSION,
             "runs": [],
@@ -106,6 +113,7 @@ class PlantRunStorage:
         normalized, changed = self._normalize_payload(data)
 
         self._data = normalized
+        self.rollup_index = RollupDayIndex()
         raw_runs = normalized.get("runs", [])
         loaded_runs: list[RunData] = []
         for raw_run in raw_runs:
@@ -145,17 +153,38 @@ class PlantRunStorage:
         return False
 
     async def async_save(self) -> None:
-        """Save data to the store."""
+        """Save data to the store (once at the end of an ``async_batched_saves`` block)."""
+        if self._batch_depth:
+            self._batch_save_pending = True
+            return
         if self._instrumentation is not None:
             self._instrumentation.incr("store.save.calls")
 
         with self._instrumentation.timer("store.save.ms") if self._instrumentation is not None else nullcontext():
-            self._data["schema_version"] = STORE_SCHEMA_VERSION
-            self._data["runs"] = [run.to_dict() for run in self.runs]
-            self._data.setdefault("active_run_id", None)
+            payload = self._payload()
             if self._instrumentation is not None:
                 self._instrumentation.incr("store.save.runs_serialized", len(self.runs))
-            await self._store.async_save(self._data)
+            await self._store.async_save(payload)
+
+    @asynccontextmanager
+    async def async_batched_saves(self) -> AsyncIterator[None]:
+        """Coalesce every save requested inside the block into one write when it exits."""
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth and self._batch_save_pending:
+                self._batch_save_pending = False
+                await self.async_save()
+
+    def _payload(self) -> dict[str, Any]:
+        # Any write (immediate or delayed) persists what a pending delayed save would.
+        self._delayed_save_pending = False
+        self._data["schema_version"] = STORE_SCHEMA_VERSION
+        self._data["runs"] = [run.to_dict() for run in self.runs]
+        self._data.setdefault("active_run_id", None)
+        return self._data
 
     @property
     def active_run_id(self) -> str | None:
@@ -168,6 +197,34 @@ class PlantRunStorage:
         self._data["active_run_id"] = run_id
         await self.async_save()
 
+    def run_revision(self, run_id: str) -> int:
+        """Return the in-memory revision counter for one run.
+
+        Revisions increase on every committed run mutation and are used to key
+        derived caches (downsampled series, summaries) without deep comparisons.
+        """
+        return self._run_revisions.get(run_id, 0)
+
+    def _bump_run_revision(self, run_id: str) -> None:
+        self._run_revisions[run_id] = self._run_revisions.get(run_id, 0) + 1
+
+    def async_add_change_listener(self, listener: Callable[[set[str]], None]) -> Callable[[], None]:
+        """Call ``listener`` with the affected run ids after every committed run change."""
+        self._change_listeners.append(listener)
+
+        def _remove() -> None:
+            if listener in self._change_listeners:
+                self._change_listeners.remove(listener)
+
+        return _remove
+
+    def _notify_runs_changed(self, run_ids: Iterable[str]) -> None:
+        changed = set(run_ids)
+        if not changed:
+            return
+        for listener in list(self._change_listeners):
+            listener(changed)
+
     def get_run(self, run_id: str) -> RunData | None:
         """Get a run by ID."""
         for run in self.runs:
@@ -188,18 +245,77 @@ class PlantRunStorage:
         all_rollups = self.daily_rollups
         run_rollups = all_rollups.setdefault(run_id, {})
         run_rollups[day] = summary
+        self.rollup_index.add(run_id, day)
         self._data["daily_rollups"] = all_rollups
         await self.async_save()
 
+    @property
+    def rollup_aggregates(self) -> dict[str, dict[str, Any]]:
+        """Return compacted weekly/monthly rollup aggregates per run."""
+        aggregates = self._data.get("rollup_aggregates")
+        if not isinstance(aggregates, dict):
+            aggregates = {}
+            self._data["rollup_aggregates"] = aggregates
+        return aggregates
+
+    async def async_set_daily_rollups(
+        self,
+        rollups: Iterable[tuple[str, str, dict[str, Any]]],
+        *,
+        dirty: bool = False,
+    ) -> int:
+        """Persist many (run_id, day, summary) snapshots with a single store write.
+
+        ``dirty`` forces the write when rollups were changed in place (compaction).
+        """
+        all_rollups = self.daily_rollups
+        written = 0
+        for run_id, day, summary in rollups:
+            all_rollups.setdefault(run_id, {})[day] = summary
+            self.rollup_index.add(run_id, day)
+            written += 1
+        if written or dirty:
+            self._data["daily_rollups"] = all_rollups
+            await self.async_save()
+        return written
+
+    async def async_commit_runs(self, run_ids: Iterable[str]) -> None:
+        """Persist in-place edits of several runs (and rollup pruning) with one write."""
+        run_ids = list(run_ids)
+        for run_id in run_ids:
+            self._bump_run_revision(run_id)
+        await self.async_save()
+        self._notify_runs_changed(run_ids)
+
+    def async_schedule_commit_runs(self, run_ids: Iterable[str], *, delay_s: float) -> None:
+        """Publish in-place edits of several runs now and persist them within ``delay_s``.
+
+        Uses ``Store.async_delay_save``, so frequent commits coalesce into one
+        write; an immediate save (or Home Assistant's final write) persists early.
+        The delay is not restarted by later commits, which would postpone the
+        write indefinitely while commits keep arriving.
+        """
+        run_ids = list(run_ids)
+        for run_id in run_ids:
+            self._bump_run_revision(run_id)
+        if not self._delayed_save_pending:
+            self._delayed_save_pending = True
+            self._store.async_delay_save(self._payload, delay_s)
+        self._notify_runs_changed(run_ids)
+
     async def async_add_run(self, run: RunData) -> None:
         """Add a new run."""
         self.runs.append(run)
+        self._bump_run_revision(run.id)
         await self.async_save()
+        self._notify_runs_changed([run.id])
 
     async def async_update_run(self, updated_run: RunData) -> None:
         """Update an existing run."""
         for i, run in enumerate(self.runs):
             if run.id == updated_run.id:
                 self.runs[i] = updated_run
+                self._bump_run_revision(updated_run.id)
                 await self.async_save()
+                self._notify_runs_changed([updated_run.id])
                 return
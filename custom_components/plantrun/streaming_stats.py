@@ -0,0 +1,342 @@
+"""Incremental, serializable statistics for run summaries and daily rollups.
+
+Everything here is O(1) in memory and O(1) per sample so summaries never need to
+sort or hold full histories, and accumulator state can be persisted and resumed.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+SUMMARY_QUANTILES: dict[str, float] = {"p5": 0.05, "p50": 0.5, "p95": 0.95}
+_P2_MARKERS = 5
+
+
+class P2Quantile:
+    """Streaming quantile estimate using the P² algorithm (Jain & Chlamtac, 1985).
+
+    Keeps five markers instead of the sample set. Until five samples were seen the
+    raw observations are kept and the quantile is exact.
+    """
+
+    def __init__(self, p: float) -> None:
+        if not 0.0 < p < 1.0:
+            raise ValueError(f"Quantile must be between 0 and 1, got {p}")
+        self.p = p
+        self.count = 0
+        self._heights: list[float] = []
+        self._positions: list[float] = []
+        self._desired: list[float] = []
+        self._increments = [0.0, p / 2, p, (1 + p) / 2, 1.0]
+
+    def add(self, value: float) -> None:
+        """Feed one observation."""
+        self.count += 1
+        if self.count <= _P2_MARKERS:
+            self._heights.append(value)
+            if self.count == _P2_MARKERS:
+                self._heights.sort()
+                self._positions = [0.0, 1.0, 2.0, 3.0, 4.0]
+                self._desired = [0.0, 2 * self.p, 4 * self.p, 2 + 2 * self.p, 4.0]
+            return
+
+        q = self._heights
+        n = self._positions
+        if value < q[0]:
+            q[0] = value
+            cell = 0
+        elif value >= q[4]:
+            q[4] = value
+            cell = 3
+        else:
+            cell = next(i for i in range(4) if q[i] <= value < q[i + 1])
+
+        for i in range(cell + 1, _P2_MARKERS):
+            n[i] += 1
+        for i in range(_P2_MARKERS):
+            self._desired[i] += self._increments[i]
+
+        for i in (1, 2, 3):
+            delta = self._desired[i] - n[i]
+            if (delta >= 1 and n[i + 1] - n[i] > 1) or (delta <= -1 and n[i - 1] - n[i] < -1):
+                step = 1 if delta > 0 else -1
+                candidate = self._parabolic(i, step)
+                if q[i - 1] < candidate < q[i + 1]:
+                    q[i] = candidate
+                else:
+                    q[i] = q[i] + step * (q[i + step] - q[i]) / (n[i + step] - n[i])
+                n[i] += step
+
+    def _parabolic(self, i: int, step: int) -> float:
+        q = self._heights
+        n = self._positions
+        return q[i] + step / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + step) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - step) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def value(self) -> float | None:
+        """Return the current quantile estimate, or None before any sample."""
+        if self.count == 0:
+            return None
+        if self.count >= _P2_MARKERS:
+            return self._heights[2]
+        ordered = sorted(self._heights)
+        rank = self.p * (len(ordered) - 1)
+        lower = int(rank)
+        upper = min(lower + 1, len(ordered) - 1)
+        return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "p": self.p,
+            "count": self.count,
+            "heights": list(self._heights),
+            "positions": list(self._positions),
+            "desired": list(self._desired),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "P2Quantile":
+        estimator = cls(float(data["p"]))
+        estimator.count = int(data.get("count", 0))
+        estimator._heights = [float(v) for v in data.get("heights", [])]
+        estimator._positions = [float(v) for v in data.get("positions", [])]
+        estimator._desired = [float(v) for v in data.get("desired", [])]
+        return estimator
+
+
+class TimeInRange:
+    """Time-weighted seconds spent below, within and above a value band.
+
+    Uses sample-and-hold semantics: the time between two samples is attributed to
+    the earlier sample's value. Out-of-order samples are ignored.
+    """
+
+    def __init__(self, low: float | None, high: float | None) -> None:
+        self.low = low
+        self.high = high
+        self.below_s = 0.0
+        self.within_s = 0.0
+        self.above_s = 0.0
+        self.last_ts: float | None = None
+        self.last_value: float | None = None
+
+    def add(self, ts: float, value: float) -> None:
+        """Feed one sample at epoch-seconds ``ts``."""
+        if self.last_ts is not None:
+            if ts < self.last_ts:
+                return
+            self._attribute(ts - self.last_ts, self.last_value)
+        self.last_ts = ts
+        self.last_value = value
+
+    def _attribute(self, seconds: float, value: float | None) -> None:
+        if value is None or seconds <= 0:
+            return
+        if self.low is not None and value < self.low:
+            self.below_s += seconds
+        elif self.high is not None and value > self.high:
+            self.above_s += seconds
+        else:
+            self.within_s += seconds
+
+    def summary(self) -> dict[str, float | None]:
+        return {
+            "low": self.low,
+            "high": self.high,
+            "below_hours": self.below_s / 3600.0,
+            "within_hours": self.within_s / 3600.0,
+            "above_hours": self.above_s / 3600.0,
+        }
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "low": self.low,
+            "high": self.high,
+            "below_s": self.below_s,
+            "within_s": self.within_s,
+            "above_s": self.above_s,
+            "last_ts": self.last_ts,
+            "last_value": self.last_value,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "TimeInRange":
+        acc = cls(data.get("low"), data.get("high"))
+        acc.below_s = float(data.get("below_s", 0.0))
+        acc.within_s = float(data.get("within_s", 0.0))
+        acc.above_s = float(data.get("above_s", 0.0))
+        acc.last_ts = data.get("last_ts")
+        acc.last_value = data.get("last_value")
+        return acc
+
+
+class MetricAccumulator:
+    """Streaming min/max/avg/start/end, P² quantiles and optional time-in-range."""
+
+    def __init__(self, *, value_range: tuple[float | None, float | None] | None = None) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.min: float | None = None
+        self.max: float | None = None
+        self.start: float | None = None
+        self.end: float | None = None
+        self.quantiles = {name: P2Quantile(p) for name, p in SUMMARY_QUANTILES.items()}
+        self.time_in_range = TimeInRange(*value_range) if value_range is not None else None
+
+    def add(self, value: float, ts: float | None = None) -> None:
+        """Feed one numeric sample; ``ts`` (epoch seconds) drives time-in-range."""
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        if self.start is None:
+            self.start = value
+        self.end = value
+        for estimator in self.quantiles.values():
+            estimator.add(value)
+        if self.time_in_range is not None and ts is not None:
+            self.time_in_range.add(ts, value)
+
+    def summary(self) -> dict[str, Any]:
+        """Return the summary-shaped stats dict."""
+        stats: dict[str, Any] = {
+            "min": self.min,
+            "max": self.max,
+            "avg": self.total / self.count if self.count else None,
+            "start": self.start,
+            "end": self.end,
+        }
+        for name, estimator in self.quantiles.items():
+            stats[name] = estimator.value()
+        stats["time_in_range"] = (
+            self.time_in_range.summary()
+            if self.time_in_range is not None and self.time_in_range.last_ts is not None
+            else None
+        )
+        return stats
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "min": self.min,
+            "max": self.max,
+            "start": self.start,
+            "end": self.end,
+            "quantiles": {name: estimator.to_dict() for name, estimator in self.quantiles.items()},
+            "time_in_range": self.time_in_range.to_dict() if self.time_in_range is not None else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "MetricAccumulator":
+        acc = cls()
+        acc.count = int(data.get("count", 0))
+        acc.total = float(data.get("sum", 0.0))
+        acc.min = data.get("min")
+        acc.max = data.get("max")
+        acc.start = data.get("start")
+        acc.end = data.get("end")
+        for name, raw in (data.get("quantiles") or {}).items():
+            acc.quantiles[name] = P2Quantile.from_dict(raw)
+        raw_range = data.get("time_in_range")
+        acc.time_in_range = TimeInRange.from_dict(raw_range) if isinstance(raw_range, dict) else None
+        return acc
+
+
+class EnergyAccumulator:
+    """O(1)-per-sample integrator for cumulative (``total_increasing``) energy meters.
+
+    Sums monotonic segments so counter resets and meter swaps do not corrupt the
+    run total. A drop of more than 10 % (Home Assistant's own reset rule) starts a
+    new segment: if the new reading is plausible as consumption since a restart
+    from zero it is counted, otherwise it is treated as a swapped meter and only
+    becomes the new baseline. Upward jumps beyond ``max_kw`` are treated the same
+    way. Smaller drops are ignored as meter jitter.
+    """
+
+    RESET_DROP_RATIO = 0.9
+    SLACK_KWH = 0.05
+
+    def __init__(self, *, max_kw: float = 25.0) -> None:
+        self.max_kw = max_kw
+        self.total_kwh = 0.0
+        self.count = 0
+        self.last_value: float | None = None
+        self.last_ts: float | None = None
+        self.source: str | None = None
+        self.segments = 0
+        self.resets = 0
+        self.swaps = 0
+
+    def _max_plausible_kwh(self, ts: float | None) -> float | None:
+        if ts is None or self.last_ts is None or ts < self.last_ts:
+            return None
+        return self.max_kw * (ts - self.last_ts) / 3600.0 + self.SLACK_KWH
+
+    def add(self, value: float, ts: float | None = None, *, source: str | None = None) -> float:
+        """Feed one meter reading and return the energy (kWh) it contributed."""
+        self.count += 1
+        previous = self.last_value
+        delta = 0.0
+
+        if previous is None or (source is not None and self.source is not None and source != self.source):
+            self.segments += 1
+            if previous is not None:
+                self.swaps += 1
+        elif value >= previous:
+            limit = self._max_plausible_kwh(ts)
+            if limit is not None and value - previous > limit:
+                self.segments += 1
+                self.swaps += 1
+            else:
+                delta = value - previous
+        elif value < previous * self.RESET_DROP_RATIO:
+            self.segments += 1
+            limit = self._max_plausible_kwh(ts)
+            plausible_restart = value <= limit if limit is not None else value < previous * (1 - self.RESET_DROP_RATIO)
+            if plausible_restart:
+                self.resets += 1
+                delta = max(0.0, value)
+            else:
+                self.swaps += 1
+        else:
+            # Jitter below the last reading: keep the higher baseline to avoid double counting.
+            if ts is not None:
+                self.last_ts = ts
+            return 0.0
+
+        self.total_kwh += delta
+        self.last_value = value
+        if ts is not None:
+            self.last_ts = ts
+        if source is not None:
+            self.source = source
+        return delta
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "max_kw": self.max_kw,
+            "total_kwh": self.total_kwh,
+            "count": self.count,
+            "last_value": self.last_value,
+            "last_ts": self.last_ts,
+            "source": self.source,
+            "segments": self.segments,
+            "resets": self.resets,
+            "swaps": self.swaps,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "EnergyAccumulator":
+        acc = cls(max_kw=float(data.get("max_kw", 25.0)))
+        acc.total_kwh = float(data.get("total_kwh", 0.0))
+        acc.count = int(data.get("count", 0))
+        acc.last_value = data.get("last_value")
+        acc.last_ts = data.get("last_ts")
+        acc.source = data.get("source")
+        acc.segments = int(data.get("segments", 0))
+        acc.resets = int(data.get("resets", 0))
+        acc.swaps = int(data.get("swaps", 0))
+        return acc
@@ -2,20 +2,48 @@
 
 from __future__ import annotations
 
+from bisect import bisect_left, bisect_right
 from contextlib import nullcontext
-from datetime import datetime
-from statistics import mean
-from typing import Any, Mapping
+from copy import copy
+from datetime import datetime, timezone, tzinfo
+from typing import Any, Mapping, Sequence
 
 from .const import (
     CONF_CURRENCY,
     CONF_ELECTRICITY_PRICE_PER_KWH,
+    CONF_LIGHT_PPFD_FACTOR,
+    CONF_METRIC_RANGES,
+    CONF_TARIFF_BANDS,
+    CONF_TARIFF_PRICE_ENTITY,
     DEFAULT_CURRENCY,
     DEFAULT_ELECTRICITY_PRICE_PER_KWH,
+    DEFAULT_LUX_TO_PPFD,
+    DEFAULT_METRIC_RANGES,
+    DERIVED_MAX_GAP_S,
+    DERIVED_METRIC_DLI,
+    DERIVED_METRIC_VPD,
+    METRIC_TYPE_HUMIDITY,
+    METRIC_TYPE_LIGHT,
+    METRIC_TYPE_TEMPERATURE,
 )
+from .derived_metrics import DayIntegral, daily_light_integrals, vpd_series
 from .instrumentation import PlantRunInstrumentation
 from .models import RunData
+from .resample import TimedValue
 from .run_window import parse_iso_datetime, run_window_for
+from .streaming_stats import EnergyAccumulator, MetricAccumulator
+from .tariff import (
+    TariffSchedule,
+    discard_unpriced_hours,
+    hourly_energy_cost,
+    spread_hourly_kwh,
+    tariff_schedule_from_options,
+)
+
+# Climate/water metrics that get full distribution stats in summaries and rollups.
+SUMMARY_STAT_METRICS = ("temperature", "humidity", "soil_moisture", "water")
+# Metrics derived from those series (VPD per aligned sample, DLI per day).
+DERIVED_STAT_METRICS = (DERIVED_METRIC_VPD, DERIVED_METRIC_DLI)
 
 
 def _to_float(value: Any) -> float | None:
@@ -84,50 +112,417 @@ def normalize_energy_price_per_kwh(
     return parsed
 
 
-def summary_energy_preferences_from_options(options: Mapping[str, Any] | None) -> dict[str, Any]:
-    """Extract summary pricing preferences from config entry options."""
+def summary_energy_preferences_from_options(
+    options: Mapping[str, Any] | None,
+    *,
+    time_zone: tzinfo | None = None,
+) -> dict[str, Any]:
+    """Extract summary pricing preferences from config entry options.
+
+    ``energy_tariff`` is None for flat pricing; with a price entity configured the
+    caller still has to bind its current state (see ``tariff.bind_price_entity``).
+    ``time_zone`` is passed through for local-day metrics such as DLI.
+    """
     options = options or {}
+    price = normalize_energy_price_per_kwh(
+        options.get(CONF_ELECTRICITY_PRICE_PER_KWH),
+        default=DEFAULT_ELECTRICITY_PRICE_PER_KWH,
+    )
     return {
-        "energy_price_per_kwh": normalize_energy_price_per_kwh(
-            options.get(CONF_ELECTRICITY_PRICE_PER_KWH),
-            default=DEFAULT_ELECTRICITY_PRICE_PER_KWH,
-        ),
+        "energy_price_per_kwh": price,
         "energy_currency": normalize_energy_currency(options.get(CONF_CURRENCY)),
+        "energy_tariff": tariff_schedule_from_options(
+            options,
+            bands_key=CONF_TARIFF_BANDS,
+            price_entity_key=CONF_TARIFF_PRICE_ENTITY,
+            default_price=price if price is not None else DEFAULT_ELECTRICITY_PRICE_PER_KWH,
+            tz=time_zone,
+        ),
+        "time_zone": time_zone,
     }
 
 
+def metric_value_range(run: RunData, metric_type: str) -> tuple[float | None, float | None] | None:
+    """Return the (low, high) time-in-range band for a metric, run override first."""
+    overrides = (run.base_config or {}).get(CONF_METRIC_RANGES)
+    if isinstance(overrides, Mapping) and isinstance(overrides.get(metric_type), Mapping):
+        override = overrides[metric_type]
+        low = _to_float(override.get("low"))
+        high = _to_float(override.get("high"))
+        if low is not None or high is not None:
+            return (low, high)
+    return DEFAULT_METRIC_RANGES.get(metric_type)
+
+
+def build_metric_accumulator(
+    points: list[dict[str, Any]],
+    *,
+    value_range: tuple[float | None, float | None] | None = None,
+    accumulator: MetricAccumulator | None = None,
+) -> MetricAccumulator:
+    """Feed history points into a (new or resumed) streaming accumulator."""
+    acc = accumulator if accumulator is not None else MetricAccumulator(value_range=value_range)
+    for point in points:
+        value = _to_float(point.get("value"))
+        if value is None:
+            continue
+        ts = _point_timestamp(point)
+        acc.add(value, ts.timestamp() if ts is not None else None)
+    return acc
+
+
+def timed_values(
+    points: list[dict[str, Any]],
+    *,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    carry_in: bool = False,
+) -> list[TimedValue]:
+    """Return sorted (epoch seconds, value) pairs of timestamped numeric points in [start, end].
+
+    ``carry_in`` holds the last sample before ``start`` (within the derived max
+    gap) as a sample at ``start``, for sample-and-hold integrals.
+    """
+    start_ts = start.timestamp() if start is not None else None
+    end_ts = end.timestamp() if end is not None else None
+    values: list[TimedValue] = []
+    carried: TimedValue | None = None
+    for point in points:
+        value = _to_float(point.get("value"))
+        ts = _point_timestamp(point)
+        if value is None or ts is None:
+            continue
+        epoch = ts.timestamp()
+        if end_ts is not None and epoch > end_ts:
+            continue
+        if start_ts is not None and epoch < start_ts:
+            if carry_in and epoch >= start_ts - DERIVED_MAX_GAP_S and (carried is None or epoch >= carried[0]):
+                carried = (epoch, value)
+            continue
+        values.append((epoch, value))
+    values.sort()
+    if carried is not None and start_ts is not None and (not values or values[0][0] > start_ts):
+        values.insert(0, (start_ts, carried[1]))
+    return values
+
+
+def light_ppfd_factor(run: RunData) -> float:
+    """Return the run's lux -> PPFD factor (``base_config["light_ppfd_factor"]``)."""
+    factor = _to_float((run.base_config or {}).get(CONF_LIGHT_PPFD_FACTOR))
+    return factor if factor is not None and factor > 0 else DEFAULT_LUX_TO_PPFD
+
+
+def build_derived_accumulators(
+    run: RunData,
+    *,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    tz: tzinfo = timezone.utc,
+) -> dict[str, MetricAccumulator]:
+    """Return accumulators of the run's VPD samples and per-day DLI values in [start, end].
+
+    VPD pairs the recorded temperature and humidity in one merge pass. Recorded
+    light is read as lux (see ``light_ppfd_factor``) and integrated per ``tz`` day.
+    """
+    return {
+        DERIVED_METRIC_VPD: _vpd_accumulator(run, start=start, end=end),
+        DERIVED_METRIC_DLI: _dli_accumulator(run, start=start, end=end, tz=tz),
+    }
+
+
+def _vpd_accumulator(run: RunData, *, start: datetime | None, end: datetime | None) -> MetricAccumulator:
+    history = run.sensor_history or {}
+    vpd = MetricAccumulator(value_range=metric_value_range(run, DERIVED_METRIC_VPD))
+    for ts, value in vpd_series(
+        timed_values(history.get(METRIC_TYPE_TEMPERATURE, []), start=start, end=end),
+        timed_values(history.get(METRIC_TYPE_HUMIDITY, []), start=start, end=end),
+    ):
+        vpd.add(value, ts)
+    return vpd
+
+
+def _dli_accumulator(
+    run: RunData,
+    *,
+    start: datetime | None,
+    end: datetime | None,
+    tz: tzinfo,
+) -> MetricAccumulator:
+    dli = MetricAccumulator()
+    factor = light_ppfd_factor(run)
+    light = timed_values((run.sensor_history or {}).get(METRIC_TYPE_LIGHT, []), start=start, end=end, carry_in=True)
+    integrals = daily_light_integrals(
+        [(ts, value * factor) for ts, value in light],
+        tz,
+        end_ts=end.timestamp() if end is not None else None,
+    )
+    for day in sorted(integrals):
+        dli.add(integrals[day])
+    return dli
+
+
 def _series_stats(
     points: list[dict[str, Any]],
     *,
+    value_range: tuple[float | None, float | None] | None = None,
     instrumentation: PlantRunInstrumentation | None = None,
-) -> dict[str, float | None]:
+) -> dict[str, Any]:
     if instrumentation is not None:
         instrumentation.incr("summary.series_stats.calls")
         instrumentation.incr("summary.series_stats.points", len(points))
 
-    vals = [_to_float(point.get("value")) for point in points]
-    cleaned = [v for v in vals if v is not None]
-    if not cleaned:
-        return {"min": None, "max": None, "avg": None, "start": None, "end": None}
-    return {
-        "min": min(cleaned),
-        "max": max(cleaned),
-        "avg": mean(cleaned),
-        "start": cleaned[0],
-        "end": cleaned[-1],
+    return build_metric_accumulator(points, value_range=value_range).summary()
+
+
+def _energy_point_key(point: Mapping[str, Any]) -> list[Any]:
+    ts = _point_timestamp(point)
+    return [ts.isoformat() if ts is not None else None, _to_float(point.get("value"))]
+
+
+def _advance_energy_state(
+    points: list[dict[str, Any]],
+    state: Mapping[str, Any],
+    *,
+    start: datetime | None,
+    end: datetime | None,
+) -> tuple[EnergyAccumulator, dict[str, Any]]:
+    """Resume integrator ``state`` over ``points`` clipped to [start, end]."""
+    window_key = start.isoformat() if start is not None else None
+    processed = int(state.get("processed", 0))
+    counted_until = state.get("counted_until")
+    valid = (
+        state.get("window_start") == window_key
+        and 0 < processed <= len(points)
+        and state.get("last_point") == _energy_point_key(points[processed - 1])
+        and not (end is not None and counted_until is not None and counted_until > end.timestamp())
+    )
+    if valid:
+        mode = state.get("mode")
+        acc = EnergyAccumulator.from_dict(state.get("accumulator") or {})
+        hourly_kwh = dict(state.get("hourly_kwh") or {})
+        untimed_kwh = float(state.get("untimed_kwh", 0.0))
+        tariff_cache = state.get("tariff_cache")
+    else:
+        processed = 0
+        counted_until = None
+        mode = "timestamped" if any(_point_timestamp(point) is not None for point in points) else "legacy"
+        acc = EnergyAccumulator()
+        hourly_kwh = {}
+        untimed_kwh = 0.0
+        tariff_cache = None
+
+    for point in points[processed:]:
+        ts = _point_timestamp(point)
+        if ts is None:
+            if mode == "timestamped":
+                continue
+        elif mode == "legacy":
+            # First timestamped sample after legacy history: window it properly from scratch.
+            return _advance_energy_state(points, {}, start=start, end=end)
+        elif (start is not None and ts < start) or (end is not None and ts > end):
+            continue
+        value = _to_float(point.get("value"))
+        if value is None:
+            continue
+        source = point.get("entity_id")
+        previous_ts = acc.last_ts
+        epoch = ts.timestamp() if ts is not None else None
+        delta = acc.add(value, epoch, source=source if isinstance(source, str) else None)
+        if epoch is None:
+            untimed_kwh += delta
+            continue
+        counted_until = max(counted_until or epoch, epoch)
+        if delta:
+            spread_hourly_kwh(hourly_kwh, previous_ts, epoch, delta)
+
+    return acc, {
+        "window_start": window_key,
+        "mode": mode,
+        "processed": len(points),
+        "last_point": _energy_point_key(points[-1]) if points else None,
+        "counted_until": counted_until,
+        "accumulator": acc.to_dict(),
+        "hourly_kwh": hourly_kwh,
+        "untimed_kwh": untimed_kwh,
+        "tariff_cache": tariff_cache,
     }
 
 
+def rebase_energy_state(
+    state: Mapping[str, Any],
+    points: list[dict[str, Any]],
+    *,
+    dropped: int,
+    dropped_until: float | None,
+) -> dict[str, Any]:
+    """Re-point integrator ``state`` at ``points`` after ``dropped`` earlier points were removed.
+
+    ``dropped_until`` is the newest timestamp among the removed points. Returns an
+    empty state (one-off rebuild) when the integrator had not counted up to it,
+    i.e. when not-yet-counted samples were dropped too, or when the last consumed
+    point is not where the shift puts it.
+    """
+    counted_until = state.get("counted_until")
+    if dropped_until is not None and (counted_until is None or counted_until < dropped_until):
+        return {}
+    processed = int(state.get("processed", 0)) - dropped
+    if 0 < processed <= len(points) and state.get("last_point") == _energy_point_key(points[processed - 1]):
+        return {**state, "processed": processed}
+    return {}
+
+
+def _energy_window(run: RunData, *, now: datetime | None = None) -> tuple[datetime | None, datetime | None]:
+    window = run_window_for(run, now=now)
+    if window.start is not None and window.end is not None and window.end < window.start:
+        return None, None
+    return window.start, window.end
+
+
+def advance_run_energy(run: RunData, *, now: datetime | None = None) -> EnergyAccumulator:
+    """Feed only new energy samples into the run's persisted integrator.
+
+    State lives on ``run.energy_state`` and records how many history points were
+    consumed plus the last consumed point, so appended samples cost O(1) each. A
+    changed window start, an edited history or a window end moved before already
+    counted samples triggers a one-off rebuild. Hourly kWh waiting for a tariff is
+    bounded; ``run_energy_cost`` rebuilds it if a tariff shows up later.
+    """
+    start, end = _energy_window(run, now=now)
+    acc, state = _advance_energy_state(
+        (run.sensor_history or {}).get("energy", []),
+        run.energy_state or {},
+        start=start,
+        end=end,
+    )
+    state["tariff_cache"] = discard_unpriced_hours(state["hourly_kwh"], state["tariff_cache"], last_ts=acc.last_ts)
+    run.energy_state = state
+    return acc
+
+
+def _energy_as_of_cuts(
+    run: RunData,
+    cuts: Sequence[datetime],
+    *,
+    energy_price_per_kwh: float | None,
+    energy_tariff: TariffSchedule | None,
+) -> list[tuple[float | None, float | None]]:
+    """Return (kWh, cost) up to each ascending cut from one throwaway integrator (backfills).
+
+    Time-sorted history is integrated once, resuming the integrator state and its
+    closed-hour tariff cache from cut to cut. Other history is rebuilt per cut.
+    """
+    points = (run.sensor_history or {}).get("energy", [])
+    epochs: list[float] = []
+    for point in points:
+        ts = _point_timestamp(point)
+        if ts is None or (epochs and ts.timestamp() < epochs[-1]):
+            epochs = []
+            break
+        epochs.append(ts.timestamp())
+    resumable = len(epochs) == len(points)
+
+    results: list[tuple[float | None, float | None]] = []
+    state: dict[str, Any] = {}
+    for cut in cuts:
+        start, end = _energy_window(run, now=cut)
+        end = cut if end is None else min(end, cut)
+        if resumable:
+            acc, state = _advance_energy_state(
+                points[: bisect_right(epochs, end.timestamp())], state, start=start, end=end
+            )
+        else:
+            acc, state = _advance_energy_state(points, {}, start=start, end=end)
+        if not acc.count:
+            results.append((None, None))
+        elif energy_tariff is not None:
+            cost, state["tariff_cache"] = hourly_energy_cost(
+                state["hourly_kwh"], energy_tariff, last_ts=acc.last_ts, cache=state["tariff_cache"]
+            )
+            results.append((acc.total_kwh, cost + state["untimed_kwh"] * energy_tariff.default_price))
+        elif energy_price_per_kwh is None:
+            results.append((acc.total_kwh, None))
+        else:
+            results.append((acc.total_kwh, acc.total_kwh * energy_price_per_kwh))
+    return results
+
+
+def run_energy_kwh(run: RunData, *, now: datetime | None = None) -> float | None:
+    """Return reset-aware run energy in kWh, or None without samples."""
+    frozen = _valid_final_summary(run)
+    if frozen is not None:
+        return frozen["summary"].get("energy_kwh")
+    acc = advance_run_energy(run, now=now)
+    return acc.total_kwh if acc.count else None
+
+
+def run_energy_cost(run: RunData, tariff: TariffSchedule, *, now: datetime | None = None) -> float | None:
+    """Return time-of-use run energy cost, pricing only the open hour on each call.
+
+    An ended run frozen under the same tariff reports its frozen cost, like
+    ``run_energy_kwh``, so a compacted history never reprices it.
+    """
+    frozen = _valid_final_summary(run)
+    if frozen is not None and (frozen.get("pricing") or [None] * 3)[2] == tariff.key:
+        return frozen["summary"].get("energy_cost")
+    acc = advance_run_energy(run, now=now)
+    if not acc.count:
+        return None
+    state = run.energy_state
+    cost, state["tariff_cache"] = hourly_energy_cost(
+        state["hourly_kwh"], tariff, last_ts=acc.last_ts, cache=state["tariff_cache"]
+    )
+    if cost is None:
+        # Closed hours were folded under another tariff (or dropped unpriced): re-spread once.
+        start, end = _energy_window(run, now=now)
+        acc, state = _advance_energy_state((run.sensor_history or {}).get("energy", []), {}, start=start, end=end)
+        cost, state["tariff_cache"] = hourly_energy_cost(
+            state["hourly_kwh"], tariff, last_ts=acc.last_ts, cache=None
+        )
+        run.energy_state = state
+    return cost + float(state.get("untimed_kwh", 0.0)) * tariff.default_price
+
+
+def run_energy_totals(
+    run: RunData,
+    *,
+    energy_price_per_kwh: float | None = None,
+    energy_currency: str | None = None,
+    energy_tariff: TariffSchedule | None = None,
+) -> tuple[float | None, float | None]:
+    """Return the run's (kWh, cost) from the incremental integrator, without a summary build.
+
+    An ended run frozen with the same pricing reports its frozen totals.
+    """
+    frozen = _valid_final_summary(run)
+    if frozen is not None and frozen.get("pricing") == _pricing_key(
+        energy_price_per_kwh, energy_currency, energy_tariff
+    ):
+        return frozen["summary"].get("energy_kwh"), frozen["summary"].get("energy_cost")
+    energy_kwh = run_energy_kwh(run)
+    if energy_tariff is not None:
+        return energy_kwh, run_energy_cost(run, energy_tariff)
+    if energy_kwh is not None and energy_price_per_kwh is not None:
+        return energy_kwh, energy_kwh * energy_price_per_kwh
+    return energy_kwh, None
+
+
 def build_run_summary(
     run: RunData,
     *,
     energy_price_per_kwh: float | None = None,
     energy_currency: str | None = None,
+    energy_tariff: TariffSchedule | None = None,
+    as_of: datetime | None = None,
+    time_zone: tzinfo | None = None,
     instrumentation: PlantRunInstrumentation | None = None,
 ) -> dict[str, Any]:
     """Build period-aware KPI summary from run sensor history.
 
     Works with partial/missing data by returning null metrics for empty series.
+    With ``energy_tariff`` the cost follows the time-of-use schedule instead of
+    the flat ``energy_price_per_kwh``. ``as_of`` builds the run-to-date summary
+    at a past instant (rollup backfills) without touching persisted energy state.
+    DLI days follow ``time_zone`` (Home Assistant's zone), like the DLI sensor.
     """
     if instrumentation is not None:
         instrumentation.incr("summary.build.calls")
@@ -135,37 +530,375 @@ def build_run_summary(
     timer_cm = instrumentation.timer("summary.build.ms") if instrumentation is not None else nullcontext()
 
     with timer_cm:
+        if as_of is not None:
+            return build_run_summaries_as_of(
+                run,
+                [as_of],
+                energy_price_per_kwh=energy_price_per_kwh,
+                energy_currency=energy_currency,
+                energy_tariff=energy_tariff,
+                time_zone=time_zone,
+            )[0]
+
         history = run.sensor_history or {}
         window = run_window_for(run)
+        window_end = window.effective_end
 
         def _maybe_window(metric_points: list[dict[str, Any]]) -> list[dict[str, Any]]:
-            if (
-                window.start is None
-                or window.effective_end is None
-                or window.effective_end < window.start
-            ):
+            if window.start is None or window_end is None or window_end < window.start:
                 return metric_points
-            return _windowed_points(metric_points, start=window.start, end=window.effective_end)
-
-        energy_stats = _series_stats(_maybe_window(history.get("energy", [])), instrumentation=instrumentation)
-        energy_delta = None
-        energy_cost = None
-        if energy_stats["start"] is not None and energy_stats["end"] is not None:
-            energy_delta = max(0.0, energy_stats["end"] - energy_stats["start"])
-            if energy_price_per_kwh is not None:
-                energy_cost = energy_delta * energy_price_per_kwh
-
-        return {
-            "run_id": run.id,
-            "friendly_name": run.friendly_name,
-            "started_at": run.start_time,
-            "ended_at": run.end_time,
-            "energy_kwh": energy_delta,
-            "energy_cost": energy_cost,
-            "energy_currency": normalize_energy_currency(energy_currency),
-            "energy_price_per_kwh": energy_price_per_kwh,
-            "temperature": _series_stats(_maybe_window(history.get("temperature", [])), instrumentation=instrumentation),
-            "humidity": _series_stats(_maybe_window(history.get("humidity", [])), instrumentation=instrumentation),
-            "soil_moisture": _series_stats(_maybe_window(history.get("soil_moisture", [])), instrumentation=instrumentation),
-            "water": _series_stats(_maybe_window(history.get("water", [])), instrumentation=instrumentation),
-        }
+            return _windowed_points(metric_points, start=window.start, end=window_end)
+
+        energy_delta, energy_cost = run_energy_totals(
+            run,
+            energy_price_per_kwh=energy_price_per_kwh,
+            energy_currency=energy_currency,
+            energy_tariff=energy_tariff,
+        )
+
+        summary = _summary_header(
+            run,
+            energy_kwh=energy_delta,
+            energy_cost=energy_cost,
+            energy_price_per_kwh=energy_price_per_kwh,
+            energy_currency=energy_currency,
+            energy_tariff=energy_tariff,
+        )
+        for metric in SUMMARY_STAT_METRICS:
+            summary[metric] = _series_stats(
+                _maybe_window(history.get(metric, [])),
+                value_range=metric_value_range(run, metric),
+                instrumentation=instrumentation,
+            )
+        derived_window = window.start is not None and window_end is not None and window_end >= window.start
+        for metric, accumulator in build_derived_accumulators(
+            run,
+            start=window.start if derived_window else None,
+            end=window_end if derived_window else None,
+            tz=time_zone or timezone.utc,
+        ).items():
+            summary[metric] = accumulator.summary()
+        return summary
+
+
+def _summary_header(
+    run: RunData,
+    *,
+    energy_kwh: float | None,
+    energy_cost: float | None,
+    energy_price_per_kwh: float | None,
+    energy_currency: str | None,
+    energy_tariff: TariffSchedule | None,
+) -> dict[str, Any]:
+    return {
+        "run_id": run.id,
+        "friendly_name": run.friendly_name,
+        "started_at": run.start_time,
+        "ended_at": run.end_time,
+        "energy_kwh": energy_kwh,
+        "energy_cost": energy_cost,
+        "energy_currency": normalize_energy_currency(energy_currency),
+        "energy_price_per_kwh": energy_price_per_kwh,
+        "energy_pricing": "time_of_use" if energy_tariff is not None else "flat",
+    }
+
+
+def _snapshot_at_cuts(
+    samples: Sequence[TimedValue],
+    ends: Sequence[float],
+    accumulator: MetricAccumulator,
+) -> list[dict[str, Any]]:
+    """Feed sorted samples once and return the accumulator summary at each ascending end."""
+    snapshots: list[dict[str, Any]] = []
+    index = 0
+    for end in ends:
+        while index < len(samples) and samples[index][0] <= end:
+            accumulator.add(samples[index][1], samples[index][0])
+            index += 1
+        snapshots.append(accumulator.summary())
+    return snapshots
+
+
+def _dli_at_cuts(run: RunData, *, start: datetime, ends: Sequence[float], tz: tzinfo) -> list[dict[str, Any]]:
+    """Return the per-day DLI stats of [start, end] for each ascending end, integrating once."""
+    factor = light_ppfd_factor(run)
+    light = timed_values((run.sensor_history or {}).get(METRIC_TYPE_LIGHT, []), start=start, carry_in=True)
+    integral = DayIntegral(tz)
+    closed = MetricAccumulator()
+    snapshots: list[dict[str, Any]] = []
+    index = 0
+
+    def _collect_closed() -> None:
+        if integral.closed is not None:
+            closed.add(integral.closed[1])
+            integral.closed = None
+
+    for end in ends:
+        while index < len(light) and light[index][0] <= end:
+            integral.add(light[index][1] * factor, light[index][0])
+            _collect_closed()
+            index += 1
+        if integral.day is None:
+            snapshots.append(MetricAccumulator().summary())
+            continue
+        # Hold up to the cut on a copy: advancing the walk itself would record
+        # sample-free days that a single pass to a later cut skips over.
+        probe = copy(integral)
+        probe.advance(end)
+        days = MetricAccumulator.from_dict(closed.to_dict())
+        if probe.closed is not None:
+            days.add(probe.closed[1])
+        if probe.day_start_ts != end:
+            days.add(probe.total * probe.scale)
+        snapshots.append(days.summary())
+    return snapshots
+
+
+def build_run_summaries_as_of(
+    run: RunData,
+    cuts: Sequence[datetime],
+    *,
+    energy_price_per_kwh: float | None = None,
+    energy_currency: str | None = None,
+    energy_tariff: TariffSchedule | None = None,
+    time_zone: tzinfo | None = None,
+) -> list[dict[str, Any]]:
+    """Return the run-to-date summary at each ascending cut with one pass per series.
+
+    This is ``build_run_summary(as_of=cut)`` for every cut (rollup backfills);
+    persisted energy state is never touched. Samples are taken in time order.
+    """
+    history = run.sensor_history or {}
+    window = run_window_for(run)
+    start = window.start
+    ends = [min(window.effective_end, cut) for cut in cuts]
+    # Cuts before the window start fall back to the whole, unwindowed history.
+    windowed = [start is not None and end >= start for end in ends]
+    end_ts = [end.timestamp() for end in ends]
+    unwindowed: dict[str, Any] = {}
+
+    def _unwindowed(metric: str) -> dict[str, Any]:
+        if not unwindowed:
+            unwindowed.update(
+                {name: _series_stats(history.get(name, []), value_range=metric_value_range(run, name))
+                 for name in SUMMARY_STAT_METRICS}
+            )
+            unwindowed.update(
+                {name: acc.summary() for name, acc in build_derived_accumulators(run, tz=time_zone or timezone.utc).items()}
+            )
+        return unwindowed[metric]
+
+    def _windowed_ends() -> list[float]:
+        return [ts for ts, inside in zip(end_ts, windowed) if inside]
+
+    # Snapshots per metric, one per cut inside the window.
+    columns: dict[str, list[dict[str, Any]]] = {}
+    legacy: dict[str, dict[str, Any]] = {}
+    for metric in SUMMARY_STAT_METRICS:
+        points = history.get(metric, [])
+        if start is None or not any(_point_timestamp(point) is not None for point in points):
+            # Legacy series without timestamps always count in full.
+            legacy[metric] = _series_stats(points, value_range=metric_value_range(run, metric))
+            continue
+        columns[metric] = _snapshot_at_cuts(
+            timed_values(points, start=start),
+            _windowed_ends(),
+            MetricAccumulator(value_range=metric_value_range(run, metric)),
+        )
+    if start is not None:
+        columns[DERIVED_METRIC_VPD] = _snapshot_at_cuts(
+            vpd_series(
+                timed_values(history.get(METRIC_TYPE_TEMPERATURE, []), start=start),
+                timed_values(history.get(METRIC_TYPE_HUMIDITY, []), start=start),
+            ),
+            _windowed_ends(),
+            MetricAccumulator(value_range=metric_value_range(run, DERIVED_METRIC_VPD)),
+        )
+        columns[DERIVED_METRIC_DLI] = _dli_at_cuts(run, start=start, ends=_windowed_ends(), tz=time_zone or timezone.utc)
+
+    energy = _energy_as_of_cuts(run, cuts, energy_price_per_kwh=energy_price_per_kwh, energy_tariff=energy_tariff)
+    summaries: list[dict[str, Any]] = []
+    position = 0
+    for index, inside in enumerate(windowed):
+        summary = _summary_header(
+            run,
+            energy_kwh=energy[index][0],
+            energy_cost=energy[index][1],
+            energy_price_per_kwh=energy_price_per_kwh,
+            energy_currency=energy_currency,
+            energy_tariff=energy_tariff,
+        )
+        for metric in SUMMARY_STAT_METRICS + DERIVED_STAT_METRICS:
+            if metric in legacy:
+                summary[metric] = legacy[metric]
+            elif inside and metric in columns:
+                summary[metric] = columns[metric][position]
+            else:
+                summary[metric] = _unwindowed(metric)
+        position += inside
+        summaries.append(summary)
+    return summaries
+
+
+def build_window_accumulators(
+    run: RunData,
+    *,
+    start: datetime,
+    end: datetime,
+    tz: tzinfo = timezone.utc,
+    dli_window: tuple[datetime, datetime] | None = None,
+) -> dict[str, MetricAccumulator]:
+    """Return streaming accumulators for each stat and derived metric restricted to [start, end].
+
+    Used for serializable per-day rollup stats; only timestamped samples count.
+    The DLI accumulator holds one value per ``tz`` day in the window, or in
+    ``dli_window`` when given (a local day that does not match [start, end]).
+    """
+    return build_windows_accumulators(run, [(start, end, dli_window or (start, end))], tz=tz)[0]
+
+
+def _window_slice(values: Sequence[TimedValue], epochs: Sequence[float], start: float, end: float) -> Sequence[TimedValue]:
+    return values[bisect_left(epochs, start) : bisect_right(epochs, end)]
+
+
+def build_windows_accumulators(
+    run: RunData,
+    windows: Sequence[tuple[datetime, datetime, tuple[datetime, datetime]]],
+    *,
+    tz: tzinfo = timezone.utc,
+) -> list[dict[str, MetricAccumulator]]:
+    """Return ``build_window_accumulators`` for each (start, end, DLI window) in one sort per series.
+
+    Each window reads only its own bisected slice, so backfilling many days
+    costs one pass over the history instead of one per day.
+    """
+    history = run.sensor_history or {}
+    sorted_series: dict[str, tuple[list[TimedValue], list[float]]] = {}
+
+    def _series(metric: str) -> tuple[list[TimedValue], list[float]]:
+        if metric not in sorted_series:
+            values = timed_values(history.get(metric, []))
+            sorted_series[metric] = (values, [ts for ts, _value in values])
+        return sorted_series[metric]
+
+    factor = light_ppfd_factor(run)
+    results: list[dict[str, MetricAccumulator]] = []
+    for start, end, (dli_start, dli_end) in windows:
+        start_ts, end_ts = start.timestamp(), end.timestamp()
+        accumulators: dict[str, MetricAccumulator] = {}
+        for metric in SUMMARY_STAT_METRICS:
+            accumulator = MetricAccumulator(value_range=metric_value_range(run, metric))
+            for ts, value in _window_slice(*_series(metric), start_ts, end_ts):
+                accumulator.add(value, ts)
+            accumulators[metric] = accumulator
+        vpd = MetricAccumulator(value_range=metric_value_range(run, DERIVED_METRIC_VPD))
+        for ts, value in vpd_series(
+            _window_slice(*_series(METRIC_TYPE_TEMPERATURE), start_ts, end_ts),
+            _window_slice(*_series(METRIC_TYPE_HUMIDITY), start_ts, end_ts),
+        ):
+            vpd.add(value, ts)
+        accumulators[DERIVED_METRIC_VPD] = vpd
+        accumulators[DERIVED_METRIC_DLI] = _dli_window_accumulator(
+            *_series(METRIC_TYPE_LIGHT), start=dli_start.timestamp(), end=dli_end.timestamp(), factor=factor, tz=tz
+        )
+        results.append(accumulators)
+    return results
+
+
+def _dli_window_accumulator(
+    light: Sequence[TimedValue],
+    epochs: Sequence[float],
+    *,
+    start: float,
+    end: float,
+    factor: float,
+    tz: tzinfo,
+) -> MetricAccumulator:
+    """Integrate a sorted light slice like ``_dli_accumulator`` (including its carry-in)."""
+    first = bisect_left(epochs, start)
+    ppfd = [(ts, value * factor) for ts, value in light[first : bisect_right(epochs, end)]]
+    if first and epochs[first - 1] >= start - DERIVED_MAX_GAP_S and (not ppfd or ppfd[0][0] > start):
+        ppfd.insert(0, (start, light[first - 1][1] * factor))
+    dli = MetricAccumulator()
+    integrals = daily_light_integrals(ppfd, tz, end_ts=end)
+    for day in sorted(integrals):
+        dli.add(integrals[day])
+    return dli
+
+
+def _pricing_key(
+    energy_price_per_kwh: float | None,
+    energy_currency: str | None,
+    energy_tariff: TariffSchedule | None,
+) -> list[Any]:
+    return [
+        energy_price_per_kwh,
+        normalize_energy_currency(energy_currency),
+        energy_tariff.key if energy_tariff is not None else None,
+    ]
+
+
+def _valid_final_summary(run: RunData) -> dict[str, Any] | None:
+    frozen = run.final_summary
+    if not isinstance(frozen, dict) or run.status != "ended" or not run.end_time:
+        return None
+    if frozen.get("end_time") != run.end_time or not isinstance(frozen.get("summary"), dict):
+        return None
+    return frozen
+
+
+def freeze_final_summary(
+    run: RunData,
+    *,
+    energy_price_per_kwh: float | None = None,
+    energy_currency: str | None = None,
+    energy_tariff: TariffSchedule | None = None,
+    time_zone: tzinfo | None = None,
+) -> dict[str, Any]:
+    """Compute the summary of an ended run once and keep it on ``run.final_summary``.
+
+    The run window is closed, so the summary only changes if history or run
+    settings are edited, in which case callers use ``clear_final_summary``.
+    """
+    summary = build_run_summary(
+        run,
+        energy_price_per_kwh=energy_price_per_kwh,
+        energy_currency=energy_currency,
+        energy_tariff=energy_tariff,
+        time_zone=time_zone,
+    )
+    run.final_summary = {
+        "end_time": run.end_time,
+        "pricing": _pricing_key(energy_price_per_kwh, energy_currency, energy_tariff),
+        "time_zone": str(time_zone or timezone.utc),
+        "summary": summary,
+    }
+    return dict(summary)
+
+
+def frozen_final_summary(
+    run: RunData,
+    *,
+    energy_price_per_kwh: float | None = None,
+    energy_currency: str | None = None,
+    energy_tariff: TariffSchedule | None = None,
+    time_zone: tzinfo | None = None,
+) -> dict[str, Any] | None:
+    """Return the frozen summary of an ended run, or None if missing or stale.
+
+    A frozen summary is stale once the run was reopened, its end moved, or the
+    pricing preferences or time zone differ from the ones it was built with.
+    """
+    frozen = _valid_final_summary(run)
+    if frozen is None:
+        return None
+    if frozen.get("pricing") != _pricing_key(energy_price_per_kwh, energy_currency, energy_tariff):
+        return None
+    if frozen.get("time_zone", str(timezone.utc)) != str(time_zone or timezone.utc):
+        return None
+    return dict(frozen["summary"])
+
+
+def clear_final_summary(run: RunData) -> None:
+    """Drop a frozen summary after its history or settings were edited."""
+    run.final_summary = None
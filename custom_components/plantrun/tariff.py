@@ -0,0 +1,347 @@
+"""Time-of-use electricity tariffs and incremental hourly energy costing.
+
+Energy deltas are spread over the interval between two meter samples and bucketed
+into hourly kWh. An hour is costed once it is closed (no later sample can add to
+it) by merging the hour with the tariff's price intervals, and that cost is folded
+into a cached running total so open-run updates only price the current hour.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone, tzinfo
+from typing import Any, Iterable, Mapping
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+HOUR_S = 3600
+# Closed hours kept unpriced before the oldest are dropped (see discard_unpriced_hours).
+MAX_UNPRICED_HOURS = 48
+WEEKDAY_NAMES = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+ALL_WEEKDAYS = frozenset(range(7))
+
+_BAND_SPEC_RE = re.compile(
+    r"^\s*(?P<start>\d{1,2}:\d{2})\s*-\s*(?P<end>\d{1,2}:\d{2})\s*=\s*(?P<price>[0-9]*\.?[0-9]+)"
+    r"\s*(?:@\s*(?P<days>[a-z,\- ]+))?\s*$",
+    re.IGNORECASE,
+)
+
+
+def _parse_minute(value: Any) -> int:
+    if not isinstance(value, str) or ":" not in value:
+        raise ValueError(f"Invalid tariff time '{value}', expected HH:MM")
+    hours, minutes = value.strip().split(":", 1)
+    minute = int(hours) * 60 + int(minutes)
+    if not 0 <= int(minutes) < 60 or not 0 <= minute <= 24 * 60:
+        raise ValueError(f"Invalid tariff time '{value}', expected HH:MM")
+    return minute
+
+
+def _format_minute(minute: int) -> str:
+    return f"{minute // 60:02d}:{minute % 60:02d}"
+
+
+def _parse_weekdays(value: Any) -> frozenset[int]:
+    """Parse weekday lists like ``[0, 1]``, ``"mon-fri"`` or ``"sat,sun"``."""
+    if value is None or value == "":
+        return ALL_WEEKDAYS
+    if isinstance(value, str):
+        days: set[int] = set()
+        for part in value.lower().replace(" ", "").split(","):
+            if not part:
+                continue
+            if "-" in part:
+                first, last = part.split("-", 1)
+                start, end = WEEKDAY_NAMES.index(first[:3]), WEEKDAY_NAMES.index(last[:3])
+                days.update(range(start, end + 1) if start <= end else [*range(start, 7), *range(0, end + 1)])
+            elif part[:3] in WEEKDAY_NAMES:
+                days.add(WEEKDAY_NAMES.index(part[:3]))
+            else:
+                raise ValueError(f"Invalid weekday '{part}'")
+        return frozenset(days)
+    days = frozenset(int(day) for day in value)
+    if not days <= ALL_WEEKDAYS:
+        raise ValueError("Weekdays must be between 0 (Monday) and 6 (Sunday)")
+    return days
+
+
+@dataclass(frozen=True)
+class TariffBand:
+    """One price band between two local times, optionally limited to weekdays.
+
+    ``end_minute`` before ``start_minute`` wraps past midnight; the weekday filter
+    applies to the local day of each instant.
+    """
+
+    start_minute: int
+    end_minute: int
+    price: float
+    weekdays: frozenset[int] = ALL_WEEKDAYS
+
+    def covers(self, weekday: int, minute: int) -> bool:
+        if weekday not in self.weekdays:
+            return False
+        if self.start_minute == self.end_minute:
+            return True
+        if self.start_minute < self.end_minute:
+            return self.start_minute <= minute < self.end_minute
+        return minute >= self.start_minute or minute < self.end_minute
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "start": _format_minute(self.start_minute),
+            "end": _format_minute(self.end_minute),
+            "price": self.price,
+            "weekdays": sorted(self.weekdays),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "TariffBand":
+        price = float(data["price"])
+        if price < 0:
+            raise ValueError("Tariff price must be non-negative")
+        return cls(
+            start_minute=_parse_minute(data["start"]),
+            end_minute=_parse_minute(data["end"]),
+            price=price,
+            weekdays=_parse_weekdays(data.get("weekdays")),
+        )
+
+
+def parse_tariff_spec(text: str) -> list[dict[str, Any]]:
+    """Parse ``"22:00-06:00=0.18; 06:00-22:00=0.32@mon-fri"`` into band dicts.
+
+    Raises ValueError on malformed bands. Earlier bands win where bands overlap.
+    """
+    bands: list[dict[str, Any]] = []
+    for raw in re.split(r"[;\n]", text or ""):
+        if not raw.strip():
+            continue
+        match = _BAND_SPEC_RE.match(raw)
+        if match is None:
+            raise ValueError(f"Invalid tariff band '{raw.strip()}'")
+        band = TariffBand.from_dict(
+            {
+                "start": match["start"],
+                "end": match["end"],
+                "price": match["price"],
+                "weekdays": match["days"],
+            }
+        )
+        bands.append(band.to_dict())
+    return bands
+
+
+def format_tariff_spec(bands: Iterable[Mapping[str, Any]]) -> str:
+    """Render stored band dicts back into the compact text form."""
+    parts = []
+    for raw in bands:
+        band = TariffBand.from_dict(raw)
+        spec = f"{_format_minute(band.start_minute)}-{_format_minute(band.end_minute)}={band.price:g}"
+        if band.weekdays != ALL_WEEKDAYS:
+            spec += "@" + ",".join(WEEKDAY_NAMES[day] for day in sorted(band.weekdays))
+        parts.append(spec)
+    return "; ".join(parts)
+
+
+class TariffSchedule:
+    """Price lookup over time: first matching band, else ``default_price``.
+
+    With ``price_entity_id`` set, ``default_price`` is the entity's current price;
+    the cache key excludes it so already-closed hours keep the price they closed at.
+    """
+
+    def __init__(
+        self,
+        bands: Iterable[TariffBand] = (),
+        *,
+        default_price: float = 0.0,
+        tz: tzinfo | None = None,
+        price_entity_id: str | None = None,
+    ) -> None:
+        self.bands = tuple(bands)
+        self.default_price = default_price
+        self.tz = tz or timezone.utc
+        self.price_entity_id = price_entity_id
+
+    @property
+    def key(self) -> list[Any]:
+        """JSON-friendly identity used to invalidate cached hourly costs."""
+        return [
+            [band.to_dict() for band in self.bands],
+            self.price_entity_id if self.price_entity_id else self.default_price,
+            str(self.tz),
+        ]
+
+    def with_default_price(self, price: float) -> "TariffSchedule":
+        return TariffSchedule(self.bands, default_price=price, tz=self.tz, price_entity_id=self.price_entity_id)
+
+    def price_at(self, ts: float) -> float:
+        local = datetime.fromtimestamp(ts, tz=self.tz)
+        minute = local.hour * 60 + local.minute
+        weekday = local.weekday()
+        for band in self.bands:
+            if band.covers(weekday, minute):
+                return band.price
+        return self.default_price
+
+    def _next_boundary(self, ts: float) -> float:
+        """Return the next instant after ``ts`` where the price may change."""
+        local = datetime.fromtimestamp(ts, tz=self.tz)
+        midnight = local.replace(hour=0, minute=0, second=0, microsecond=0)
+        candidates = [(midnight + timedelta(days=1)).timestamp()]
+        for band in self.bands:
+            for minute in (band.start_minute, band.end_minute):
+                for day in (0, 1):
+                    boundary = (midnight + timedelta(days=day, minutes=minute)).timestamp()
+                    if boundary > ts:
+                        candidates.append(boundary)
+        return min(candidates)
+
+    def segments(self, start_ts: float, end_ts: float) -> list[tuple[float, float, float]]:
+        """Return merged ``(start, end, price)`` intervals covering [start_ts, end_ts)."""
+        merged: list[tuple[float, float, float]] = []
+        cursor = start_ts
+        while cursor < end_ts:
+            stop = end_ts if not self.bands else min(end_ts, self._next_boundary(cursor))
+            price = self.price_at(cursor)
+            if merged and merged[-1][2] == price and merged[-1][1] == cursor:
+                merged[-1] = (merged[-1][0], stop, price)
+            else:
+                merged.append((cursor, stop, price))
+            cursor = stop
+        return merged
+
+    def interval_cost(self, kwh: float, start_ts: float, end_ts: float) -> float:
+        """Cost of ``kwh`` consumed evenly over [start_ts, end_ts)."""
+        span = end_ts - start_ts
+        if span <= 0:
+            return kwh * self.price_at(start_ts)
+        return sum(kwh * (stop - begin) / span * price for begin, stop, price in self.segments(start_ts, end_ts))
+
+
+def time_zone_from_name(name: Any) -> tzinfo | None:
+    """Return a tzinfo for an IANA zone name (e.g. ``hass.config.time_zone``)."""
+    if not isinstance(name, str) or not name:
+        return None
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return None
+
+
+def bind_price_entity(schedule: TariffSchedule | None, state: Any) -> TariffSchedule | None:
+    """Return ``schedule`` priced with a price entity's current state, if usable."""
+    if schedule is None or not schedule.price_entity_id or state is None:
+        return schedule
+    try:
+        price = float(getattr(state, "state", state))
+    except (TypeError, ValueError):
+        return schedule
+    if price < 0:
+        return schedule
+    return schedule.with_default_price(price)
+
+
+def tariff_schedule_from_options(
+    options: Mapping[str, Any] | None,
+    *,
+    bands_key: str,
+    price_entity_key: str,
+    default_price: float,
+    tz: tzinfo | None = None,
+) -> TariffSchedule | None:
+    """Build a schedule from config entry options, or None for flat pricing."""
+    options = options or {}
+    raw_bands = options.get(bands_key) or []
+    price_entity_id = options.get(price_entity_key) or None
+    bands = []
+    for raw in raw_bands:
+        try:
+            bands.append(TariffBand.from_dict(raw))
+        except (KeyError, TypeError, ValueError):
+            continue
+    if not bands and not price_entity_id:
+        return None
+    return TariffSchedule(bands, default_price=default_price, tz=tz, price_entity_id=price_entity_id)
+
+
+def spread_hourly_kwh(hourly: dict[str, float], start_ts: float | None, end_ts: float, kwh: float) -> None:
+    """Distribute ``kwh`` evenly over [start_ts, end_ts) into hour buckets (keyed by epoch hour)."""
+    if kwh == 0:
+        return
+    if start_ts is None or start_ts >= end_ts:
+        key = str(int(end_ts // HOUR_S * HOUR_S))
+        hourly[key] = hourly.get(key, 0.0) + kwh
+        return
+    span = end_ts - start_ts
+    cursor = start_ts
+    while cursor < end_ts:
+        hour = cursor // HOUR_S * HOUR_S
+        stop = min(end_ts, hour + HOUR_S)
+        key = str(int(hour))
+        hourly[key] = hourly.get(key, 0.0) + kwh * (stop - cursor) / span
+        cursor = stop
+
+
+def hourly_energy_cost(
+    hourly: dict[str, float],
+    schedule: TariffSchedule,
+    *,
+    last_ts: float | None,
+    cache: dict[str, Any] | None,
+) -> tuple[float | None, dict[str, Any]]:
+    """Return total cost over hourly buckets and the updated closed-hour cache.
+
+    Hours before the one holding ``last_ts`` are closed: they are priced once,
+    folded into the cache's running total and removed from ``hourly``, so only
+    open hours stay. Returns a None cost when the cache has already folded hours
+    under another schedule (or discarded them unpriced); the caller must rebuild
+    ``hourly`` from history.
+    """
+    cache = dict(cache or {})
+    if cache.get("key") != schedule.key:
+        if cache.get("closed_through") is not None:
+            return None, cache
+        cache = {"key": schedule.key, "closed_through": None, "closed_cost": 0.0}
+    if last_ts is None:
+        return cache["closed_cost"], cache
+
+    open_hour = int(last_ts // HOUR_S * HOUR_S)
+    closed_through = cache["closed_through"]
+    for key in [key for key in hourly if int(key) < open_hour]:
+        hour = int(key)
+        kwh = hourly.pop(key)
+        # Hours at or before the cutoff were already priced (or arrived too late to be).
+        if closed_through is None or hour > closed_through:
+            cache["closed_cost"] += schedule.interval_cost(kwh, hour, hour + HOUR_S)
+    cache["closed_through"] = max(cache["closed_through"] or 0, open_hour - HOUR_S)
+
+    open_kwh = hourly.get(str(open_hour), 0.0)
+    open_cost = schedule.interval_cost(open_kwh, open_hour, max(last_ts, open_hour + 1)) if open_kwh else 0.0
+    return cache["closed_cost"] + open_cost, cache
+
+
+def discard_unpriced_hours(
+    hourly: dict[str, float],
+    cache: dict[str, Any] | None,
+    *,
+    last_ts: float | None,
+    keep_hours: int = MAX_UNPRICED_HOURS,
+) -> dict[str, Any] | None:
+    """Bound ``hourly`` when no schedule is pricing it, returning the updated cache.
+
+    Closed hours beyond the newest ``keep_hours`` are dropped and the cache is
+    marked as folded without a schedule, so the next ``hourly_energy_cost`` call
+    asks for a rebuild instead of under-pricing the run.
+    """
+    if last_ts is None or len(hourly) <= keep_hours:
+        return cache
+    open_hour = int(last_ts // HOUR_S * HOUR_S)
+    closed = sorted(int(key) for key in hourly if int(key) < open_hour)
+    dropped = closed[: len(hourly) - keep_hours]
+    if not dropped:
+        return cache
+    for hour in dropped:
+        del hourly[str(hour)]
+    return {"key": None, "closed_through": dropped[-1], "closed_cost": 0.0}
@@ -0,0 +1,158 @@
+"""Per-binding source value converters compiled once per source unit metadata."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable, Mapping
+
+UNAVAILABLE_SENSOR_STATES = frozenset({"unknown", "unavailable", "none", ""})
+
+# Accept common illuminance aliases and normalize to canonical "lx".
+LIGHT_ILLUMINANCE_UNIT_ALIASES = {"lx", "lux"}
+
+# (canonical unit, source unit) -> conversion into the canonical unit.
+UNIT_CONVERSIONS: dict[tuple[str, str], Callable[[float], float]] = {
+    ("°C", "°F"): lambda value: (value - 32.0) * 5.0 / 9.0,
+    ("°C", "K"): lambda value: value - 273.15,
+    ("kWh", "Wh"): lambda value: value / 1000.0,
+    ("kWh", "MWh"): lambda value: value * 1000.0,
+}
+
+
+def normalize_light_unit(unit: str | None) -> str | None:
+    """Normalize recognized light-unit aliases to their canonical representation."""
+    if unit is None:
+        return None
+
+    normalized = unit.strip().casefold()
+    if normalized in LIGHT_ILLUMINANCE_UNIT_ALIASES:
+        return "lx"
+
+    return unit
+
+
+def light_device_class_for_unit(unit: str | None) -> str | None:
+    """Return a safe light device class fallback for known illuminance units."""
+    if unit is None:
+        return None
+
+    normalized = unit.strip().casefold()
+    if normalized in LIGHT_ILLUMINANCE_UNIT_ALIASES:
+        return "illuminance"
+
+    return None
+
+
+def metadata_key(attrs: Mapping[str, Any]) -> tuple[Any, Any, Any]:
+    """Return the source attributes a compiled converter depends on."""
+    return (attrs.get("unit_of_measurement"), attrs.get("device_class"), attrs.get("state_class"))
+
+
+def _round(value: float) -> float:
+    # Conversions introduce float noise (e.g. 70 °F); keep recorder states tidy.
+    return round(value, 6)
+
+
+@dataclass(frozen=True)
+class ValueConverter:
+    """Parse one binding's source states into its canonical unit.
+
+    ``unit`` is the unit the proxy reports, ``source_unit`` what the source
+    reports. ``scale`` is set when the two differ and a conversion is known;
+    ``unit_drift`` when they differ and the source unit is kept unconverted.
+    """
+
+    numeric: bool
+    unit: str | None
+    device_class: str | None
+    state_class: str | None
+    source_unit: str | None = None
+    scale: Callable[[float], float] | None = None
+    unit_drift: bool = False
+
+    def convert(self, raw_value: object) -> float | int | str | None:
+        """Return a HA-safe native value, or None for unavailable and non-numeric states."""
+        if raw_value is None:
+            return None
+
+        if isinstance(raw_value, str):
+            normalized = raw_value.strip()
+            if normalized.casefold() in UNAVAILABLE_SENSOR_STATES:
+                return None
+        else:
+            normalized = raw_value
+
+        if not self.numeric:
+            return normalized
+
+        if isinstance(normalized, (int, float)):
+            numeric_value = float(normalized)
+            if self.scale is None:
+                return normalized
+        else:
+            try:
+                numeric_value = float(str(normalized).replace(",", "."))
+            except (TypeError, ValueError):
+                return None
+
+        if self.scale is not None:
+            numeric_value = _round(self.scale(numeric_value))
+        return int(numeric_value) if numeric_value.is_integer() else numeric_value
+
+
+def compile_converter(
+    metric_type: str,
+    attrs: Mapping[str, Any],
+    metadata: Mapping[str, Mapping[str, Any]],
+) -> ValueConverter:
+    """Compile the converter for ``metric_type`` given the source's current attributes.
+
+    Known units are converted to the metric's canonical unit. Unknown units are
+    kept as reported (never relabel without converting) and flagged as drift.
+    Source device/state classes win over the metric defaults.
+    """
+    expected = metadata.get(metric_type)
+    source_unit = attrs.get("unit_of_measurement")
+    source_device_class = attrs.get("device_class")
+    source_state_class = attrs.get("state_class")
+    if expected is None:
+        return ValueConverter(
+            numeric=False,
+            unit=source_unit,
+            device_class=source_device_class,
+            state_class=source_state_class,
+            source_unit=source_unit,
+        )
+
+    if metric_type == "light":
+        unit = normalize_light_unit(source_unit)
+        return ValueConverter(
+            numeric=True,
+            unit=unit,
+            device_class=source_device_class or light_device_class_for_unit(unit),
+            state_class=source_state_class or expected.get("state_class"),
+            source_unit=source_unit,
+        )
+
+    expected_unit = expected.get("unit")
+    device_class = source_device_class or expected.get("device_class")
+    state_class = source_state_class or expected.get("state_class")
+    if not expected_unit or not source_unit or source_unit == expected_unit:
+        return ValueConverter(
+            numeric=True,
+            unit=source_unit or expected_unit,
+            device_class=device_class,
+            state_class=state_class,
+            source_unit=source_unit,
+        )
+
+    scale = UNIT_CONVERSIONS.get((expected_unit, source_unit))
+    return ValueConverter(
+        numeric=True,
+        unit=expected_unit if scale is not None else source_unit,
+        device_class=device_class,
+        state_class=state_class,
+        source_unit=source_unit,
+        scale=scale,
+        unit_drift=scale is None,
+    )
@@ -26,6 +26,8 @@
     sound: "plantrun.ui.sound",
   };
   const THEME_QUERY = "(prefers-color-scheme: light)";
+  // Chart series are downsampled server-side; request only what each view renders.
+  const SERIES_POINTS = { tile: 14, inspector: 24 };
   // Experimental Home Assistant native history deeplink hack.
   // HA's more-info history dialog is hard-coded to ~24h and does not accept
   // an injected run window. The full /history panel does accept start/end
@@ -83,6 +85,7 @@
       this._hass = null;
       this._runs = [];
       this._summaries = {};
+      this._series = {};
       this._activeRunId = "";
       this._selectedRunId = "";
       this._filter = "active";
@@ -191,8 +194,9 @@
       this._error = "";
       this.render();
       try {
-        const payload = await this._hass.callWS({ type: "plantrun/get_runs" });
+        const payload = await this._hass.callWS({ type: "plantrun/get_runs", include_history: false });
         this._runs = Array.isArray(payload?.runs) ? payload.runs : [];
+        this._series = {};
         this._activeRunId = payload?.active_run_id || "";
         const ids = new Set(this._runs.map((run) => run.id));
         if (!keepSelection || !ids.has(this._selectedRunId)) {
@@ -207,6 +211,7 @@
             }
           })
         );
+        await this._loadRunSeries(this._selectedRun());
       } catch (err) {
         this._error = err?.message || "PlantRun is not loaded yet.";
       } finally {
@@ -391,9 +396,9 @@
 
     _renderSensorTile(run, binding) {
       const entityId = binding.sensor_id;
-      const history = this._bindingHistory(run, binding);
+      const points = this._bindingHistory(run, binding);
+      const storedCount = this._storedSampleCount(run, binding);
       const latest = this._entityState(entityId);
-      const points = history.slice(-14);
       const max = Math.max(...points.map((point) => Number(point.value)).filter(Number.isFinite), 1);
       const bars = points
         .map((point) => {
@@ -402,7 +407,7 @@
           return `<span style="height:${height}px"></span>`;
         })
         .join("");
-      const historyLabel = history.length ? `${history.length} stored sample${history.length === 1 ? "" : "s"}` : "No stored samples yet";
+      const historyLabel = storedCount ? `${storedCount} stored sample${storedCount === 1 ? "" : "s"}` : "No stored samples yet";
       return `
         <article class="sensor-tile" data-sensor-tile data-run-id="${S.escapeHtml(run.id)}" data-entity-id="${S.escapeHtml(entityId)}" data-binding-id="${S.escapeHtml(binding.id || "")}">
           <div class="sensor-head">
@@ -712,8 +717,40 @@
       `;
     }
 
-    _bindingHistory(run, binding) {
-      return Array.isArray(run?.sensor_history?.[binding?.metric_type]) ? run.sensor_history[binding.metric_type] : [];
+    _seriesKey(runId, bindingId, points) {
+      return `${runId}:${bindingId}:${points}`;
+    }
+
+    async _loadBindingSeries(runId, bindingId, points) {
+      const key = this._seriesKey(runId, bindingId, points);
+      if (!this._hass || !bindingId || this._series[key]) return this._series[key] || null;
+      try {
+        this._series[key] = await this._hass.callWS({
+          type: "plantrun/get_run_binding_series",
+          run_id: runId,
+          binding_id: bindingId,
+          points,
+        });
+      } catch (_err) {
+        this._series[key] = { points: [], source_points: 0 };
+      }
+      return this._series[key];
+    }
+
+    async _loadRunSeries(run) {
+      const bindings = Array.isArray(run?.bindings) ? run.bindings : [];
+      await Promise.all(bindings.map((binding) => this._loadBindingSeries(run.id, binding.id, SERIES_POINTS.tile)));
+    }
+
+    _bindingHistory(run, binding, points = SERIES_POINTS.tile) {
+      const series = this._series[this._seriesKey(run?.id, binding?.id, points)];
+      return Array.isArray(series?.points) ? series.points : [];
+    }
+
+    _storedSampleCount(run, binding) {
+      const series = this._series[this._seriesKey(run?.id, binding?.id, SERIES_POINTS.tile)];
+      if (Number.isFinite(series?.source_points)) return series.source_points;
+      return Number(run?.sensor_history_counts?.[binding?.metric_type]) || 0;
     }
 
     _historyWindow(run) {
@@ -749,11 +786,12 @@
       const run = this._runs.find((item) => item.id === panel.run_id);
       const binding = run?.bindings?.find((item) => item.id === panel.binding_id || item.sensor_id === panel.entity_id);
       const context = panel.context || this._fallbackHistoryContext(run, binding, panel.entity_id);
-      const history = this._bindingHistory(run, binding).slice(-24);
+      const history = this._bindingHistory(run, binding, SERIES_POINTS.inspector);
+      const storedCount = this._storedSampleCount(run, binding);
       const summary = context.orphaned
         ? "This binding is orphaned right now because the linked Home Assistant sensor no longer exists."
         : history.length
-          ? `Showing ${history.length} stored PlantRun sample${history.length === 1 ? "" : "s"} inside this run window.`
+          ? `Showing ${history.length} of ${storedCount || history.length} stored PlantRun sample${storedCount === 1 ? "" : "s"} inside this run window.`
           : "No stored PlantRun samples yet for this linked sensor in the current run window.";
       const points = history
         .map((point) => {
@@ -876,6 +914,7 @@
         this._selectedRunId = target.dataset.runId;
         this._detailDraft = null;
         this.render();
+        this._loadRunSeries(this._selectedRun()).then(() => this.render());
       } else if (action === "refresh") {
         this._refreshRuns();
       } else if (action === "open-wizard") {
@@ -1432,6 +1471,7 @@
         });
         const context = payload?.context || fallbackContext;
         if (this._openNativeHistory(context)) return;
+        await this._loadBindingSeries(runId, binding.id, SERIES_POINTS.inspector);
         this._historyInspector = {
           run_id: runId,
           entity_id: entityId,
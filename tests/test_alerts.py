@@ -0,0 +1,90 @@
+import importlib.util
+import sys
+import types
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+PLANTRUN_DIR = ROOT / "custom_components" / "plantrun"
+
+
+def _load_module(name: str, path: Path):
+    spec = importlib.util.spec_from_file_location(name, path)
+    assert spec and spec.loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+custom_components = types.ModuleType("custom_components")
+custom_components.__path__ = [str(ROOT / "custom_components")]
+sys.modules.setdefault("custom_components", custom_components)
+plantrun_pkg = types.ModuleType("custom_components.plantrun")
+plantrun_pkg.__path__ = [str(PLANTRUN_DIR)]
+sys.modules["custom_components.plantrun"] = plantrun_pkg
+
+MODELS = _load_module("custom_components.plantrun.models", PLANTRUN_DIR / "models.py")
+ALERTS = _load_module("custom_components.plantrun.alerts", PLANTRUN_DIR / "alerts.py")
+RunData = MODELS.RunData
+AlertRule = ALERTS.AlertRule
+ThresholdMonitor = ALERTS.ThresholdMonitor
+
+
+class TestAlertRules(unittest.TestCase):
+    def test_rules_parse_from_base_config(self) -> None:
+        run = RunData(
+            id="runA",
+            friendly_name="Tent A",
+            start_time="2026-03-01T00:00:00+00:00",
+            base_config={"alert_rules": {"temperature": {"high": "30", "hysteresis": 0.5, "min_duration_s": 60}}},
+        )
+        rule = ALERTS.alert_rule_for(run, "temperature")
+        self.assertEqual(rule, AlertRule("temperature", high=30.0, hysteresis=0.5, min_duration_s=60.0))
+        self.assertIsNone(ALERTS.alert_rule_for(run, "humidity"))
+
+    def test_malformed_rules_are_rejected(self) -> None:
+        for raw in (
+            {"temperature": {}},
+            {"temperature": {"high": "hot"}},
+            {"temperature": {"high": 20, "low": 25}},
+            {"temperature": {"high": 20, "hysteresis": -1}},
+            ["temperature"],
+        ):
+            with self.assertRaises(ValueError):
+                ALERTS.parse_alert_rules(raw)
+
+
+class TestThresholdMonitor(unittest.TestCase):
+    def test_excursion_must_last_min_duration(self) -> None:
+        monitor = ThresholdMonitor(AlertRule("temperature", high=30.0, min_duration_s=300))
+        self.assertEqual(monitor.update(31.0, 0.0), [])
+        self.assertEqual(monitor.pending_deadline, 300.0)
+        self.assertEqual(monitor.update(29.0, 100.0), [])
+        self.assertIsNone(monitor.pending_deadline)
+
+        monitor.update(31.0, 200.0)
+        self.assertIsNone(monitor.check(400.0))
+        transition = monitor.check(500.0)
+        self.assertEqual((transition.state, transition.kind, transition.since), ("triggered", "high", 200.0))
+        self.assertEqual(monitor.update(32.0, 600.0), [])
+
+    def test_hysteresis_delays_clearing(self) -> None:
+        monitor = ThresholdMonitor(AlertRule("humidity", low=40.0, hysteresis=2.0))
+        [triggered] = monitor.update(39.0, 0.0)
+        self.assertEqual((triggered.state, triggered.kind, triggered.threshold), ("triggered", "low", 40.0))
+        self.assertEqual(monitor.update(41.0, 10.0), [])
+        [cleared] = monitor.update(42.0, 20.0)
+        self.assertEqual((cleared.state, cleared.kind), ("cleared", "low"))
+        self.assertIsNone(monitor.alerting)
+
+    def test_unavailable_values_keep_state_and_swings_report_both_sides(self) -> None:
+        monitor = ThresholdMonitor(AlertRule("temperature", high=30.0, low=15.0))
+        monitor.update(31.0, 0.0)
+        self.assertEqual(monitor.update(None, 10.0), [])
+        self.assertEqual(monitor.alerting, "high")
+        transitions = monitor.update(10.0, 20.0)
+        self.assertEqual([(item.state, item.kind) for item in transitions], [("cleared", "high"), ("triggered", "low")])
+
+
+if __name__ == "__main__":
+    unittest.main()
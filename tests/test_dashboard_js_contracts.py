@@ -127,6 +127,13 @@ class DashboardJsContractsTests(unittest.TestCase):
         self.assertIn(".hero.has-image", source)
         self.assertIn("var(--hero-image)", source)
 
+    def test_panel_charts_use_server_downsampled_series_instead_of_raw_history(self):
+        source = PANEL_JS.read_text(encoding="utf-8")
+        self.assertIn('type: "plantrun/get_runs", include_history: false', source)
+        self.assertIn('type: "plantrun/get_run_binding_series"', source)
+        self.assertIn("const SERIES_POINTS = { tile: 14, inspector: 24 };", source)
+        self.assertNotIn("run?.sensor_history?.[binding?.metric_type]", source)
+
 
 if __name__ == "__main__":
     unittest.main()
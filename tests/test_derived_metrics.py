@@ -0,0 +1,158 @@
+import importlib.util
+import sys
+import types
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+PLANTRUN_DIR = ROOT / "custom_components" / "plantrun"
+
+
+def _load_module(name: str, path: Path):
+    spec = importlib.util.spec_from_file_location(name, path)
+    assert spec and spec.loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+custom_components = types.ModuleType("custom_components")
+custom_components.__path__ = [str(ROOT / "custom_components")]
+sys.modules.setdefault("custom_components", custom_components)
+plantrun_pkg = types.ModuleType("custom_components.plantrun")
+plantrun_pkg.__path__ = [str(PLANTRUN_DIR)]
+sys.modules["custom_components.plantrun"] = plantrun_pkg
+
+DERIVED = _load_module("custom_components.plantrun.derived_metrics", PLANTRUN_DIR / "derived_metrics.py")
+MODELS = _load_module("custom_components.plantrun.models", PLANTRUN_DIR / "models.py")
+SUMMARY = _load_module("custom_components.plantrun.summary", PLANTRUN_DIR / "summary.py")
+RunData = MODELS.RunData
+
+T0 = datetime(2026, 3, 1, tzinfo=timezone.utc).timestamp()
+
+
+class TestVaporPressureDeficit(unittest.TestCase):
+    def test_vpd_matches_tetens_reference_values(self) -> None:
+        self.assertAlmostEqual(DERIVED.saturation_vapor_pressure_kpa(25.0), 3.1677, places=3)
+        self.assertAlmostEqual(DERIVED.vapor_pressure_deficit_kpa(25.0, 60.0), 1.2671, places=3)
+        self.assertEqual(DERIVED.vapor_pressure_deficit_kpa(25.0, 100.0), 0.0)
+        self.assertIsNone(DERIVED.vapor_pressure_deficit_kpa(25.0, 140.0))
+
+    def test_tracker_needs_both_sides_and_respects_skew(self) -> None:
+        tracker = DERIVED.VpdTracker(max_skew_s=600)
+        self.assertIsNone(tracker.update("temperature", 25.0, T0))
+        self.assertAlmostEqual(tracker.update("humidity", 60.0, T0 + 60), 1.2671, places=3)
+        self.assertIsNone(tracker.update("humidity", 60.0, T0 + 3600))
+        self.assertIsNotNone(tracker.update("temperature", 25.0, T0 + 3660))
+        self.assertIsNone(tracker.update("temperature", None, T0 + 3700))
+
+    def test_vpd_series_merges_sorted_series_in_one_pass(self) -> None:
+        series = DERIVED.vpd_series(
+            [(T0, 25.0), (T0 + 120, 25.0)],
+            [(T0 + 60, 60.0), (T0 + 180, 100.0)],
+        )
+        self.assertEqual([ts for ts, _value in series], [T0 + 60, T0 + 120, T0 + 180])
+        self.assertEqual(series[-1][1], 0.0)
+
+
+class TestDailyLightIntegral(unittest.TestCase):
+    def test_held_rate_accrues_and_resets_at_local_midnight(self) -> None:
+        tz = timezone(timedelta(hours=2))
+        # 21:00 local on 2026-03-01.
+        start = datetime(2026, 3, 1, 21, 0, tzinfo=tz).timestamp()
+        integral = DERIVED.DayIntegral(tz)
+        integral.add(1000.0, start)
+        integral.advance(start + 3600)
+        self.assertAlmostEqual(integral.value, 3.6)
+        self.assertEqual(integral.day, "2026-03-01")
+
+        integral.advance(start + 4 * 3600)
+        self.assertEqual(integral.day, "2026-03-02")
+        self.assertEqual(integral.closed[0], "2026-03-01")
+        self.assertAlmostEqual(integral.closed[1], 10.8)
+        self.assertAlmostEqual(integral.value, 3.6)
+
+    def test_rate_is_held_for_at_most_the_max_gap(self) -> None:
+        integral = DERIVED.DayIntegral(timezone.utc, max_gap_s=600)
+        integral.add(500.0, T0)
+        integral.advance(T0 + 3600)
+        self.assertAlmostEqual(integral.value, 0.3)
+
+    def test_daily_light_integrals_splits_days(self) -> None:
+        series = [(T0 + 22 * 3600, 100.0), (T0 + 24 * 3600, 200.0)]
+        days = DERIVED.daily_light_integrals(series, timezone.utc, end_ts=T0 + 25 * 3600)
+        self.assertEqual(set(days), {"2026-03-01", "2026-03-02"})
+        self.assertAlmostEqual(days["2026-03-01"], 0.72)
+        self.assertAlmostEqual(days["2026-03-02"], 0.72)
+
+    def test_ppfd_sources_are_not_scaled(self) -> None:
+        self.assertEqual(DERIVED.ppfd_factor("µmol/m²/s"), 1.0)
+        self.assertEqual(DERIVED.ppfd_factor("lx"), 0.0185)
+        self.assertEqual(DERIVED.ppfd_factor(None, 0.02), 0.02)
+
+
+class TestDerivedSummaries(unittest.TestCase):
+    def _run(self, **extra):
+        return RunData(
+            id="runV",
+            friendly_name="Tent V",
+            start_time="2026-03-01T00:00:00+00:00",
+            end_time="2026-03-03T00:00:00+00:00",
+            status="ended",
+            sensor_history={
+                "temperature": [
+                    {"timestamp": "2026-03-01T10:00:00+00:00", "value": 25.0},
+                    {"timestamp": "2026-03-01T11:00:00+00:00", "value": 20.0},
+                ],
+                "humidity": [{"timestamp": "2026-03-01T10:00:30+00:00", "value": 60.0}],
+                "light": [
+                    {"timestamp": "2026-03-01T12:00:00+00:00", "value": 54054.0},
+                    {"timestamp": "2026-03-01T14:00:00+00:00", "value": 0.0},
+                    {"timestamp": "2026-03-02T12:00:00+00:00", "value": 27027.0},
+                    {"timestamp": "2026-03-02T13:00:00+00:00", "value": 0.0},
+                ],
+            },
+            **extra,
+        )
+
+    def test_run_summary_includes_vpd_and_dli(self) -> None:
+        summary = SUMMARY.build_run_summary(self._run())
+        self.assertAlmostEqual(summary["vpd"]["start"], 1.2671, places=3)
+        self.assertAlmostEqual(summary["vpd"]["end"], 0.9352, places=3)
+        # 54054 lx * 0.0185 = 1000 µmol/m²/s for 2 h -> 7.2 mol/m²/d; then 1 h at half.
+        self.assertAlmostEqual(summary["dli"]["max"], 7.2, places=3)
+        self.assertAlmostEqual(summary["dli"]["min"], 1.8, places=3)
+
+    def test_ppfd_factor_override_and_day_window(self) -> None:
+        run = self._run(base_config={"light_ppfd_factor": 0.037})
+        start = datetime(2026, 3, 2, tzinfo=timezone.utc)
+        end = start + timedelta(days=1) - timedelta(microseconds=1)
+        accumulators = SUMMARY.build_window_accumulators(run, start=start, end=end)
+        self.assertEqual(accumulators["dli"].count, 1)
+        self.assertAlmostEqual(accumulators["dli"].max, 3.6, places=3)
+        self.assertEqual(accumulators["vpd"].count, 0)
+
+    def test_dli_days_follow_the_home_assistant_time_zone(self) -> None:
+        tz = timezone(timedelta(hours=11))
+        utc_summary = SUMMARY.build_run_summary(self._run())
+        local_summary = SUMMARY.build_run_summary(self._run(), time_zone=tz)
+        self.assertAlmostEqual(utc_summary["dli"]["max"], 7.2, places=3)
+        # 12:00 UTC is 23:00 local: the first pulse splits over two local days.
+        self.assertAlmostEqual(local_summary["dli"]["max"], 5.4, places=3)
+
+        start = datetime(2026, 3, 2, tzinfo=timezone.utc)
+        local_day = datetime(2026, 3, 2, tzinfo=tz)
+        accumulators = SUMMARY.build_window_accumulators(
+            self._run(),
+            start=start,
+            end=start + timedelta(days=1) - timedelta(microseconds=1),
+            tz=tz,
+            dli_window=(local_day, local_day + timedelta(days=1) - timedelta(microseconds=1)),
+        )
+        self.assertEqual(accumulators["dli"].count, 1)
+        self.assertAlmostEqual(accumulators["dli"].max, 5.4, places=3)
+
+
+if __name__ == "__main__":
+    unittest.main()
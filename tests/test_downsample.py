@@ -0,0 +1,143 @@
+import importlib.util
+import sys
+import types
+import unittest
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+PLANTRUN_DIR = ROOT / "custom_components" / "plantrun"
+
+
+def _load_module(name: str, path: Path):
+    spec = importlib.util.spec_from_file_location(name, path)
+    assert spec and spec.loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+custom_components = types.ModuleType("custom_components")
+custom_components.__path__ = [str(ROOT / "custom_components")]
+sys.modules.setdefault("custom_components", custom_components)
+plantrun_pkg = types.ModuleType("custom_components.plantrun")
+plantrun_pkg.__path__ = [str(PLANTRUN_DIR)]
+sys.modules["custom_components.plantrun"] = plantrun_pkg
+
+MODELS = _load_module("custom_components.plantrun.models", PLANTRUN_DIR / "models.py")
+_load_module("custom_components.plantrun.summary", PLANTRUN_DIR / "summary.py")
+DOWNSAMPLE = _load_module("custom_components.plantrun.downsample", PLANTRUN_DIR / "downsample.py")
+RunData = MODELS.RunData
+
+
+def _hourly_run(hours: int, *, end_time: str | None = "2026-03-10T00:00:00+00:00") -> RunData:
+    return RunData(
+        id="run-series",
+        friendly_name="Tent Series",
+        start_time="2026-03-01T00:00:00+00:00",
+        end_time=end_time,
+        status="ended" if end_time else "active",
+        sensor_history={
+            "temperature": [
+                {
+                    "timestamp": f"2026-03-{1 + i // 24:02d}T{i % 24:02d}:00:00+00:00",
+                    "value": 30.0 if i == 50 else 20.0 + (i % 6) * 0.5,
+                }
+                for i in range(hours)
+            ]
+        },
+    )
+
+
+class TestDownsample(unittest.TestCase):
+    def test_lttb_keeps_endpoints_and_respects_threshold(self) -> None:
+        series = [(float(i), float(i % 7)) for i in range(500)]
+        sampled = DOWNSAMPLE.lttb(series, 40)
+        self.assertEqual(len(sampled), 40)
+        self.assertEqual(sampled[0], series[0])
+        self.assertEqual(sampled[-1], series[-1])
+        self.assertEqual(sampled, sorted(sampled))
+
+    def test_minmax_preserves_spikes(self) -> None:
+        series = [(float(i), 1.0) for i in range(100)]
+        series[37] = (37.0, 99.0)
+        sampled = DOWNSAMPLE.minmax_buckets(series, 10)
+        self.assertLessEqual(len(sampled), 10)
+        self.assertIn((37.0, 99.0), sampled)
+
+    def test_short_series_returned_unchanged(self) -> None:
+        series = [(0.0, 1.0), (1.0, 2.0)]
+        self.assertEqual(DOWNSAMPLE.downsample(series, 50), series)
+        with self.assertRaises(ValueError):
+            DOWNSAMPLE.downsample(series, 50, method="median")
+
+    def test_binding_series_is_windowed_and_downsampled(self) -> None:
+        run = _hourly_run(24 * 12)
+        series = DOWNSAMPLE.build_binding_series(run, "temperature", max_points=24)
+
+        self.assertEqual(series["source_points"], 24 * 9 + 1)
+        self.assertEqual(len(series["points"]), 24)
+        self.assertEqual(series["points"][0]["timestamp"], "2026-03-01T00:00:00+00:00")
+        self.assertEqual(series["points"][-1]["timestamp"], "2026-03-10T00:00:00+00:00")
+        self.assertIn(30.0, [point["value"] for point in series["points"]])
+
+    def test_legacy_untimestamped_history_is_still_charted(self) -> None:
+        run = RunData(
+            id="run-legacy",
+            friendly_name="Legacy",
+            start_time="2026-03-01T00:00:00+00:00",
+            sensor_history={"humidity": [{"value": 50 + i} for i in range(10)]},
+        )
+        series = DOWNSAMPLE.build_binding_series(run, "humidity", max_points=4)
+        self.assertEqual(series["source_points"], 10)
+        self.assertEqual([point["value"] for point in series["points"]][0], 50.0)
+        self.assertNotIn("timestamp", series["points"][0])
+
+    def test_cache_reuses_series_until_revision_changes(self) -> None:
+        run = _hourly_run(48)
+        cache = DOWNSAMPLE.DownsampledSeriesCache(max_entries=4)
+
+        first = cache.get_or_build(run, "temperature", revision=1, max_points=10)
+        second = cache.get_or_build(run, "temperature", revision=1, max_points=10)
+        third = cache.get_or_build(run, "temperature", revision=2, max_points=10)
+
+        self.assertEqual(first, second)
+        self.assertIs(first["points"], second["points"])
+        self.assertIsNot(first["points"], third["points"])
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+    def test_cache_rebuilds_the_open_run_window_on_every_call(self) -> None:
+        run = _hourly_run(48, end_time=None)
+        cache = DOWNSAMPLE.DownsampledSeriesCache(max_entries=4)
+        early = datetime(2026, 3, 2, 12, tzinfo=timezone.utc)
+        late = datetime(2026, 3, 5, tzinfo=timezone.utc)
+
+        clipped = cache.get_or_build(run, "temperature", revision=1, max_points=100, now=early)
+        full = cache.get_or_build(run, "temperature", revision=1, max_points=100, now=late)
+        again = cache.get_or_build(run, "temperature", revision=1, max_points=100, now=late)
+
+        self.assertEqual((clipped["source_points"], full["source_points"]), (37, 48))
+        self.assertEqual(full["run_window"]["effective_end"], late.isoformat())
+        self.assertIs(full["points"], again["points"])
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+    def test_aligned_series_share_one_grid(self) -> None:
+        run = _hourly_run(48)
+        run.sensor_history["energy"] = [
+            {"timestamp": f"2026-03-01T0{hour}:30:00+00:00", "value": 10.0 + hour} for hour in range(3)
+        ]
+        aligned = DOWNSAMPLE.build_aligned_series(run, ["temperature", "energy"], interval_s=86400)
+        self.assertEqual(aligned["timestamps"][:2], ["2026-03-01T00:00:00+00:00", "2026-03-02T00:00:00+00:00"])
+        self.assertEqual(len(aligned["timestamps"]), 10)
+        self.assertEqual(aligned["values"]["energy"][:2], [12.0, None])
+        self.assertIsNotNone(aligned["values"]["temperature"][1])
+        self.assertIsNone(aligned["values"]["temperature"][2])
+
+        capped = DOWNSAMPLE.build_aligned_series(run, ["temperature"], interval_s=60)
+        self.assertLessEqual(len(capped["timestamps"]), 2000)
+        self.assertGreater(capped["interval_s"], 60)
+
+
+if __name__ == "__main__":
+    unittest.main()
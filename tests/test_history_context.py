@@ -122,5 +122,32 @@ class TestBindingHistoryContext(unittest.TestCase):
         self.assertEqual(context["error"], "source_entity_missing")
 
 
+    def test_persisted_context_omits_moving_end_for_open_runs(self) -> None:
+        run = RunData.from_dict(
+            {
+                "id": "runE",
+                "friendly_name": "Tent E",
+                "start_time": "2026-05-01T10:00:00+00:00",
+                "bindings": [{"id": "bind3", "metric_type": "temperature", "sensor_id": "sensor.t3"}],
+            }
+        )
+        binding = run.get_binding("bind3")
+        assert binding is not None
+
+        context = HISTORY_CONTEXT.build_persisted_binding_history_context(run, binding, source_exists=True)
+        self.assertIsNone(context["run_end"])
+        self.assertNotIn("effective_end", context["run_window"])
+        self.assertEqual(
+            context,
+            HISTORY_CONTEXT.build_persisted_binding_history_context(run, binding, source_exists=True),
+        )
+
+        run.status = "ended"
+        run.end_time = "2026-06-01T10:00:00+00:00"
+        ended = HISTORY_CONTEXT.build_persisted_binding_history_context(run, binding, source_exists=True)
+        self.assertEqual(ended["run_end"], "2026-06-01T10:00:00+00:00")
+        self.assertEqual(ended["run_window"]["effective_end"], "2026-06-01T10:00:00+00:00")
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,341 @@
+import asyncio
+import importlib.util
+import sys
+import types
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+PLANTRUN_DIR = ROOT / "custom_components" / "plantrun"
+
+
+def _load_module(name: str, path: Path):
+    spec = importlib.util.spec_from_file_location(name, path)
+    assert spec and spec.loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+ha = types.ModuleType("homeassistant")
+sys.modules.setdefault("homeassistant", ha)
+core = types.ModuleType("homeassistant.core")
+core.HomeAssistant = object
+core.Event = object
+core.callback = lambda func: func
+sys.modules["homeassistant.core"] = core
+const_mod = types.ModuleType("homeassistant.const")
+const_mod.EVENT_HOMEASSISTANT_FINAL_WRITE = "homeassistant_final_write"
+sys.modules["homeassistant.const"] = const_mod
+helpers = types.ModuleType("homeassistant.helpers")
+storage_mod = types.ModuleType("homeassistant.helpers.storage")
+storage_mod.Store = object
+event_mod = types.ModuleType("homeassistant.helpers.event")
+event_mod.subscriptions = []
+event_mod.intervals = []
+
+
+def _track_state(_hass, entity_ids, action):
+    record = {"entity_ids": list(entity_ids), "action": action, "active": True}
+    event_mod.subscriptions.append(record)
+    return lambda: record.update(active=False)
+
+
+def _track_interval(_hass, action, interval):
+    event_mod.intervals.append((action, interval))
+    return lambda: None
+
+
+event_mod.async_track_state_change_event = _track_state
+event_mod.async_track_time_interval = _track_interval
+sys.modules["homeassistant.helpers"] = helpers
+sys.modules["homeassistant.helpers.storage"] = storage_mod
+sys.modules["homeassistant.helpers.event"] = event_mod
+
+custom_components = types.ModuleType("custom_components")
+custom_components.__path__ = [str(ROOT / "custom_components")]
+sys.modules.setdefault("custom_components", custom_components)
+plantrun_pkg = types.ModuleType("custom_components.plantrun")
+plantrun_pkg.__path__ = [str(PLANTRUN_DIR)]
+sys.modules["custom_components.plantrun"] = plantrun_pkg
+
+CONST = _load_module("custom_components.plantrun.const", PLANTRUN_DIR / "const.py")
+MODELS = _load_module("custom_components.plantrun.models", PLANTRUN_DIR / "models.py")
+SUMMARY = _load_module("custom_components.plantrun.summary", PLANTRUN_DIR / "summary.py")
+DISPATCHER = _load_module("custom_components.plantrun.source_dispatcher", PLANTRUN_DIR / "source_dispatcher.py")
+INGESTION = _load_module("custom_components.plantrun.ingestion", PLANTRUN_DIR / "ingestion.py")
+RunData = MODELS.RunData
+
+START = datetime(2026, 3, 1, tzinfo=timezone.utc)
+
+
+class FakeStorage:
+    def __init__(self, runs):
+        self.runs = runs
+        self.commits = []
+        self.scheduled = []
+        self.listeners = []
+
+    def get_run(self, run_id):
+        return next((run for run in self.runs if run.id == run_id), None)
+
+    def async_add_change_listener(self, listener):
+        self.listeners.append(listener)
+        return lambda: self.listeners.remove(listener)
+
+    async def async_commit_runs(self, run_ids):
+        self.commits.append(sorted(run_ids))
+
+    def async_schedule_commit_runs(self, run_ids, *, delay_s):
+        self.scheduled.append((sorted(run_ids), delay_s))
+
+
+class FakeBus:
+    def __init__(self):
+        self.once = {}
+
+    def async_listen_once(self, event_type, listener):
+        self.once[event_type] = listener
+        return lambda: self.once.pop(event_type, None)
+
+
+def _hass(on_job=None):
+    jobs = []
+
+    async def async_add_executor_job(job):
+        jobs.append(job)
+        result = job()
+        if on_job is not None:
+            on_job()
+        return result
+
+    return types.SimpleNamespace(bus=FakeBus(), async_add_executor_job=async_add_executor_job, jobs=jobs)
+
+
+def _run(run_id, bindings, **extra):
+    return RunData.from_dict(
+        {
+            "id": run_id,
+            "friendly_name": run_id,
+            "start_time": START.isoformat(),
+            "bindings": [{"metric_type": metric, "sensor_id": sensor} for metric, sensor in bindings],
+            **extra,
+        }
+    )
+
+
+def _event(entity_id, value, at, unit=None):
+    return types.SimpleNamespace(
+        data={
+            "entity_id": entity_id,
+            "new_state": types.SimpleNamespace(
+                state=value,
+                attributes={"unit_of_measurement": unit} if unit else {},
+                last_updated=START + timedelta(seconds=at),
+            ),
+        }
+    )
+
+
+class TestSampleBuffer(unittest.TestCase):
+    def test_samples_are_thinned_per_bucket_but_meter_drops_are_kept(self):
+        buffer = INGESTION.SampleBuffer(60, cumulative=True)
+        buffer.add(0, 1.0, "sensor.meter")
+        buffer.add(30, 1.2, "sensor.meter")
+        buffer.add(45, 0.1, "sensor.meter")
+        buffer.add(70, 0.3, "sensor.meter")
+
+        self.assertEqual(buffer.values, [1.2, 0.1, 0.3])
+        points = buffer.drain()
+        self.assertEqual(points[0]["timestamp"], datetime.fromtimestamp(30, tz=timezone.utc).isoformat())
+        self.assertEqual(len(buffer), 0)
+
+    def test_retention_compacts_to_low_water_mark_and_keeps_recent_samples(self):
+        points = [
+            {"timestamp": (START + timedelta(minutes=index)).isoformat(), "value": float(index % 5)}
+            for index in range(300)
+        ]
+        retained = INGESTION.retain_metric_history(points, max_points=100)
+
+        self.assertLessEqual(len(retained), 50)
+        self.assertEqual(retained[-25:], points[-25:])
+        self.assertIsNone(INGESTION.retain_metric_history(points[:100], max_points=100))
+
+
+class TestSampleIngestor(unittest.TestCase):
+    def setUp(self):
+        event_mod.subscriptions.clear()
+
+    def test_shared_source_feeds_open_runs_and_flushes_in_one_write(self):
+        tent_a = _run("runA", [("temperature", "sensor.climate"), ("energy", "sensor.meter")])
+        tent_b = _run("runB", [("temperature", "sensor.climate")])
+        old = _run("runOld", [("humidity", "sensor.old")], status="ended", end_time=START.isoformat())
+        storage = FakeStorage([tent_a, tent_b, old])
+        dispatcher = DISPATCHER.SourceStateDispatcher(None, CONST.METRIC_METADATA)
+        ingestor = INGESTION.SampleIngestor(_hass(), storage, dispatcher)
+        ingestor.async_start()
+
+        self.assertEqual(dispatcher.entity_ids, {"sensor.climate", "sensor.meter"})
+        climate = next(record for record in event_mod.subscriptions if record["entity_ids"] == ["sensor.climate"])
+        meter = next(record for record in event_mod.subscriptions if record["entity_ids"] == ["sensor.meter"])
+        climate["action"](_event("sensor.climate", "71.6", 10, unit="°F"))
+        climate["action"](_event("sensor.climate", "unavailable", 20))
+        for at, value in ((0, "1000"), (120, "1050"), (240, "1150")):
+            meter["action"](_event("sensor.meter", value, at, unit="Wh"))
+        self.assertEqual(ingestor.pending_samples, 5)
+
+        written = asyncio.run(ingestor.async_flush())
+
+        self.assertEqual(written, 5)
+        self.assertEqual(storage.commits, [["runA", "runB"]])
+        self.assertEqual([point["value"] for point in tent_b.sensor_history["temperature"]], [22])
+        self.assertEqual(tent_a.sensor_history["temperature"][0]["entity_id"], "sensor.climate")
+        self.assertAlmostEqual(SUMMARY.run_energy_kwh(tent_a, now=START + timedelta(hours=1)), 0.15)
+        self.assertEqual(asyncio.run(ingestor.async_flush()), 0)
+        self.assertEqual(len(storage.commits), 1)
+
+    def test_capped_energy_series_compacts_rarely_and_keeps_integrator_cursor(self):
+        run = _run("runA", [("energy", "sensor.meter")], base_config={CONST.CONF_SAMPLE_RESOLUTION_S: 0})
+        storage = FakeStorage([run])
+        dispatcher = DISPATCHER.SourceStateDispatcher(None, CONST.METRIC_METADATA)
+        hass = _hass()
+        ingestor = INGESTION.SampleIngestor(hass, storage, dispatcher, max_points=40)
+        ingestor.async_start()
+        action = event_mod.subscriptions[-1]["action"]
+        now = START + timedelta(days=1)
+
+        lengths = []
+        for at in range(60):
+            action(_event("sensor.meter", str(1000 + 10 * at), 60 * at, unit="Wh"))
+            asyncio.run(ingestor.async_flush())
+            SUMMARY.run_energy_kwh(run, now=now)
+            lengths.append(len(run.sensor_history["energy"]))
+
+        # Compacted once at 41 points down to 20, then left alone for 19 more flushes.
+        shrinks = [index for index in range(1, len(lengths)) if lengths[index] < lengths[index - 1]]
+        self.assertEqual(shrinks, [40])
+        self.assertEqual(len(hass.jobs), 1)
+        self.assertEqual(lengths[40], 20)
+        self.assertEqual(lengths[-1], 39)
+        self.assertEqual(run.energy_state["processed"], 39)
+        # A rebuild would only have counted the 39 retained samples.
+        self.assertEqual(run.energy_state["accumulator"]["count"], 60)
+        self.assertAlmostEqual(SUMMARY.run_energy_kwh(run, now=now), 0.59)
+
+    def test_compaction_past_the_integrator_resets_its_state(self):
+        run = _run("runA", [("energy", "sensor.meter")], base_config={CONST.CONF_SAMPLE_RESOLUTION_S: 0})
+        storage = FakeStorage([run])
+        dispatcher = DISPATCHER.SourceStateDispatcher(None, CONST.METRIC_METADATA)
+        ingestor = INGESTION.SampleIngestor(_hass(), storage, dispatcher, max_points=40)
+        ingestor.async_start()
+        action = event_mod.subscriptions[-1]["action"]
+        now = START + timedelta(days=1)
+
+        for at in range(10):
+            action(_event("sensor.meter", str(1000 + 10 * at), 60 * at, unit="Wh"))
+        asyncio.run(ingestor.async_flush())
+        SUMMARY.run_energy_kwh(run, now=now)
+        self.assertEqual(run.energy_state["processed"], 10)
+
+        # The integrator lags behind while 31 more samples push the series past the cap.
+        for at in range(10, 41):
+            action(_event("sensor.meter", str(1000 + 10 * at), 60 * at, unit="Wh"))
+        asyncio.run(ingestor.async_flush())
+
+        self.assertEqual(len(run.sensor_history["energy"]), 20)
+        self.assertEqual(run.energy_state, {})
+        self.assertAlmostEqual(SUMMARY.run_energy_kwh(run, now=now), 0.4)
+
+    def test_periodic_flush_delays_the_save_and_keeps_samples_added_during_compaction(self):
+        run = _run("runA", [("temperature", "sensor.climate")], base_config={CONST.CONF_SAMPLE_RESOLUTION_S: 0})
+        run.sensor_history["temperature"] = [
+            {"timestamp": (START + timedelta(minutes=index)).isoformat(), "value": float(index % 5)}
+            for index in range(40)
+        ]
+        late = {"timestamp": (START + timedelta(hours=2)).isoformat(), "value": 30.0}
+        storage = FakeStorage([run])
+        dispatcher = DISPATCHER.SourceStateDispatcher(None, CONST.METRIC_METADATA)
+        hass = _hass(on_job=lambda: run.sensor_history["temperature"].append(late))
+        ingestor = INGESTION.SampleIngestor(hass, storage, dispatcher, max_points=40, save_delay_s=600)
+        ingestor.async_start()
+        event_mod.subscriptions[-1]["action"](_event("sensor.climate", "21.0", 3600))
+
+        asyncio.run(ingestor._async_flush_interval())
+
+        history = run.sensor_history["temperature"]
+        self.assertEqual(len(hass.jobs), 1)
+        self.assertLessEqual(len(history), 21)
+        self.assertIs(history[-1], late)
+        self.assertEqual(storage.commits, [])
+        self.assertEqual(storage.scheduled, [(["runA"], 600)])
+
+    def test_flush_run_before_freeze_drops_samples_after_end(self):
+        run = _run("runA", [("temperature", "sensor.climate")], base_config={CONST.CONF_SAMPLE_RESOLUTION_S: 0})
+        other = _run("runB", [("humidity", "sensor.air")])
+        storage = FakeStorage([run, other])
+        dispatcher = DISPATCHER.SourceStateDispatcher(None, CONST.METRIC_METADATA)
+        ingestor = INGESTION.SampleIngestor(_hass(), storage, dispatcher)
+        ingestor.async_start()
+        climate = next(record for record in event_mod.subscriptions if record["entity_ids"] == ["sensor.climate"])
+        air = next(record for record in event_mod.subscriptions if record["entity_ids"] == ["sensor.air"])
+        for at, value in ((60, "21.0"), (120, "22.0"), (180, "23.0")):
+            climate["action"](_event("sensor.climate", value, at))
+        air["action"](_event("sensor.air", "55", 60))
+
+        # Back-dated end between the second and third sample.
+        run.end_time = (START + timedelta(seconds=150)).isoformat()
+        run.status = "ended"
+        self.assertEqual(ingestor.async_flush_run("runA"), 2)
+
+        self.assertEqual([point["value"] for point in run.sensor_history["temperature"]], [21, 22])
+        self.assertEqual(storage.commits, [])
+        self.assertEqual(ingestor.pending_samples, 1)
+        self.assertEqual(asyncio.run(ingestor.async_flush()), 1)
+        self.assertEqual(storage.commits, [["runB"]])
+
+    def test_pending_samples_are_flushed_on_final_write(self):
+        run = _run("runA", [("temperature", "sensor.climate")])
+        storage = FakeStorage([run])
+        dispatcher = DISPATCHER.SourceStateDispatcher(None, CONST.METRIC_METADATA)
+        hass = _hass()
+        ingestor = INGESTION.SampleIngestor(hass, storage, dispatcher)
+        ingestor.async_start()
+        event_mod.subscriptions[-1]["action"](_event("sensor.climate", "21.0", 1))
+
+        listener = hass.bus.once[const_mod.EVENT_HOMEASSISTANT_FINAL_WRITE]
+        asyncio.run(listener(types.SimpleNamespace(data={})))
+
+        self.assertEqual(storage.commits, [["runA"]])
+        self.assertEqual(ingestor.pending_samples, 0)
+        asyncio.run(ingestor.async_shutdown())
+        self.assertEqual(storage.commits, [["runA"]])
+
+    def test_routes_follow_run_status_and_bindings(self):
+        run = _run("runA", [("temperature", "sensor.climate")])
+        storage = FakeStorage([run])
+        dispatcher = DISPATCHER.SourceStateDispatcher(None, CONST.METRIC_METADATA)
+        ingestor = INGESTION.SampleIngestor(_hass(), storage, dispatcher)
+        ingestor.async_start()
+
+        run.status = "ended"
+        storage.listeners[0]({"runA"})
+        self.assertEqual(dispatcher.entity_ids, set())
+
+        run.status = "active"
+        run.base_config = {CONST.CONF_SAMPLE_RESOLUTION_S: 0}
+        storage.listeners[0]({"runA"})
+        action = event_mod.subscriptions[-1]["action"]
+        action(_event("sensor.climate", "21.0", 1))
+        action(_event("sensor.climate", "21.5", 2))
+        asyncio.run(ingestor.async_shutdown())
+
+        self.assertEqual([point["value"] for point in run.sensor_history["temperature"]], [21, 21.5])
+        self.assertFalse(event_mod.subscriptions[-1]["active"])
+        self.assertEqual(storage.listeners, [])
+        self.assertEqual(ingestor.hass.bus.once, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
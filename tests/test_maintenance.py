@@ -0,0 +1,193 @@
+import asyncio
+import importlib.util
+import sys
+import types
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+PLANTRUN_DIR = ROOT / "custom_components" / "plantrun"
+
+
+def _load_module(name: str, path: Path):
+    spec = importlib.util.spec_from_file_location(name, path)
+    assert spec and spec.loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+ha = types.ModuleType("homeassistant")
+sys.modules.setdefault("homeassistant", ha)
+core = types.ModuleType("homeassistant.core")
+core.HomeAssistant = object
+sys.modules["homeassistant.core"] = core
+helpers = types.ModuleType("homeassistant.helpers")
+storage_mod = types.ModuleType("homeassistant.helpers.storage")
+storage_mod.Store = object
+sys.modules["homeassistant.helpers"] = helpers
+sys.modules["homeassistant.helpers.storage"] = storage_mod
+
+custom_components = types.ModuleType("custom_components")
+custom_components.__path__ = [str(ROOT / "custom_components")]
+sys.modules.setdefault("custom_components", custom_components)
+plantrun_pkg = types.ModuleType("custom_components.plantrun")
+plantrun_pkg.__path__ = [str(PLANTRUN_DIR)]
+sys.modules["custom_components.plantrun"] = plantrun_pkg
+
+INDEX = _load_module("custom_components.plantrun.rollup_index", PLANTRUN_DIR / "rollup_index.py")
+MODELS = _load_module("custom_components.plantrun.models", PLANTRUN_DIR / "models.py")
+SUMMARY = _load_module("custom_components.plantrun.summary", PLANTRUN_DIR / "summary.py")
+MAINTENANCE = _load_module("custom_components.plantrun.maintenance", PLANTRUN_DIR / "maintenance.py")
+RunData = MODELS.RunData
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+END = START + timedelta(days=10)
+
+
+class FakeStorage:
+    def __init__(self, runs):
+        self.runs = runs
+        self.daily_rollups = {}
+        self.rollup_aggregates = {}
+        self.rollup_index = INDEX.RollupDayIndex()
+        self.commits = []
+
+    async def async_commit_runs(self, run_ids):
+        self.commits.append(list(run_ids))
+
+
+def _ended_run(run_id="run-old", *, energy=None, temperature=None):
+    return RunData(
+        id=run_id,
+        friendly_name="Old Tent",
+        start_time=START.isoformat(),
+        end_time=END.isoformat(),
+        status="ended",
+        sensor_history={
+            "temperature": temperature if temperature is not None else [],
+            "energy": energy if energy is not None else [],
+        },
+    )
+
+
+def _minutely(metric_values, *, offset_minutes=0):
+    return [
+        {"timestamp": (START + timedelta(minutes=offset_minutes + index)).isoformat(), "value": value}
+        for index, value in enumerate(metric_values)
+    ]
+
+
+class TestMaintenance(unittest.TestCase):
+    def test_orphaned_rollups_are_pruned_and_bytes_reported(self):
+        storage = FakeStorage([_ended_run("run-live")])
+        storage.daily_rollups.update({"run-live": {"2026-01-02": {"a": 1}}, "run-gone": {"2026-01-02": {"a": 1}}})
+        storage.rollup_aggregates.update({"run-gone": {"weekly": {}}})
+        storage.rollup_index.latest("run-gone", storage.daily_rollups["run-gone"])
+
+        report = asyncio.run(MAINTENANCE.async_run_maintenance(storage, now=START))
+
+        self.assertEqual(set(storage.daily_rollups), {"run-live"})
+        self.assertEqual(storage.rollup_aggregates, {})
+        self.assertEqual(report["orphaned_runs"], 1)
+        self.assertGreater(report["reclaimed_bytes"], 0)
+        self.assertEqual(storage.commits, [[]])
+
+    def test_recently_ended_runs_keep_full_history(self):
+        run = _ended_run(temperature=_minutely([20.0 + (index % 7) for index in range(3000)]))
+        storage = FakeStorage([run])
+
+        report = asyncio.run(MAINTENANCE.async_run_maintenance(storage, now=END + timedelta(days=5)))
+
+        self.assertEqual(len(run.sensor_history["temperature"]), 3000)
+        self.assertEqual(report["compacted_runs"], 0)
+        self.assertEqual(storage.commits, [])
+
+    def test_old_ended_runs_are_downsampled_after_freezing_summary(self):
+        values = [20.0 + (index % 7) for index in range(3000)]
+        run = _ended_run(temperature=_minutely(values) + [{"timestamp": (END + timedelta(hours=1)).isoformat(), "value": 99.0}])
+        storage = FakeStorage([run])
+        expected_stats = SUMMARY.build_run_summary(run)["temperature"]
+
+        report = asyncio.run(MAINTENANCE.async_run_maintenance(storage, now=END + timedelta(days=31), max_points=200))
+
+        history = run.sensor_history["temperature"]
+        self.assertEqual(len(history), 200)
+        self.assertTrue(all(point["value"] != 99.0 for point in history))
+        self.assertEqual(run.final_summary["summary"]["temperature"], expected_stats)
+        self.assertEqual(report["compacted_runs"], 1)
+        self.assertEqual(report["dropped_points"], 2801)
+        self.assertGreater(report["reclaimed_bytes"], 0)
+        self.assertEqual(storage.commits, [["run-old"]])
+
+        again = asyncio.run(MAINTENANCE.async_run_maintenance(storage, now=END + timedelta(days=32), max_points=200))
+        self.assertEqual(again["compacted_runs"], 0)
+
+    def test_compaction_runs_in_executor_and_estimates_reclaimed_bytes(self):
+        points = _minutely([20.0 + (index % 7) for index in range(3000)])
+        run = _ended_run(temperature=points)
+        storage = FakeStorage([run])
+        jobs = []
+
+        async def executor(job):
+            jobs.append(job)
+            return job()
+
+        report = asyncio.run(
+            MAINTENANCE.async_run_maintenance(
+                storage, now=END + timedelta(days=31), max_points=200, executor=executor
+            )
+        )
+
+        self.assertEqual(len(jobs), 1)
+        exact = MAINTENANCE.payload_bytes(points) - MAINTENANCE.payload_bytes(run.sensor_history["temperature"])
+        self.assertAlmostEqual(report["reclaimed_bytes"] / exact, 1.0, delta=0.05)
+
+    def test_energy_compaction_keeps_meter_resets(self):
+        values = [index * 0.01 for index in range(1500)] + [index * 0.01 for index in range(1500)]
+        run = _ended_run(energy=_minutely(values))
+        expected = SUMMARY.run_energy_kwh(run)
+        run.energy_state = {}
+
+        run_storage = FakeStorage([run])
+        asyncio.run(MAINTENANCE.async_run_maintenance(run_storage, now=END + timedelta(days=31), max_points=50))
+
+        compacted = run.sensor_history["energy"]
+        self.assertLess(len(compacted), 60)
+        self.assertEqual(run_storage.commits, [["run-old"]])
+        self.assertEqual(run.energy_state, {})
+        run.final_summary = None
+        self.assertAlmostEqual(SUMMARY.run_energy_kwh(run), expected, places=6)
+
+    def test_compacted_ended_run_keeps_its_frozen_energy_cost(self):
+        tariff_mod = sys.modules["custom_components.plantrun.tariff"]
+        bands = [tariff_mod.TariffBand.from_dict(band) for band in tariff_mod.parse_tariff_spec("22:00-06:00=0.10")]
+        pricing = {
+            "energy_price_per_kwh": 0.30,
+            "energy_currency": "EUR",
+            "energy_tariff": tariff_mod.TariffSchedule(bands, default_price=0.30),
+        }
+        run = _ended_run(energy=_minutely([(index % 97) * 0.001 + index * index * 1e-6 for index in range(3000)]))
+        storage = FakeStorage([run])
+
+        asyncio.run(
+            MAINTENANCE.async_run_maintenance(storage, now=END + timedelta(days=31), max_points=50, **pricing)
+        )
+
+        frozen = run.final_summary["summary"]
+        self.assertEqual(run.energy_state, {})
+        self.assertEqual(
+            SUMMARY.run_energy_totals(run, **pricing), (frozen["energy_kwh"], frozen["energy_cost"])
+        )
+        self.assertEqual(SUMMARY.run_energy_cost(run, pricing["energy_tariff"]), frozen["energy_cost"])
+
+    def test_legacy_untimestamped_history_is_left_alone(self):
+        legacy = [{"value": float(index)} for index in range(5000)]
+        self.assertIsNone(
+            MAINTENANCE.compact_metric_history(legacy, start=START, end=END, max_points=100)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
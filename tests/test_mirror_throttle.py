@@ -0,0 +1,71 @@
+import importlib.util
+import sys
+import types
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+PLANTRUN_DIR = ROOT / "custom_components" / "plantrun"
+
+
+def _load_module(name: str, path: Path):
+    spec = importlib.util.spec_from_file_location(name, path)
+    assert spec and spec.loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+custom_components = types.ModuleType("custom_components")
+custom_components.__path__ = [str(ROOT / "custom_components")]
+sys.modules.setdefault("custom_components", custom_components)
+plantrun_pkg = types.ModuleType("custom_components.plantrun")
+plantrun_pkg.__path__ = [str(PLANTRUN_DIR)]
+sys.modules["custom_components.plantrun"] = plantrun_pkg
+
+THROTTLE = _load_module("custom_components.plantrun.mirror_throttle", PLANTRUN_DIR / "mirror_throttle.py")
+
+
+class TestMirrorGate(unittest.TestCase):
+    def _gate(self, **limits):
+        return THROTTLE.MirrorGate(THROTTLE.MirrorThrottle.from_metadata(limits))
+
+    def test_disabled_throttle_forwards_everything(self):
+        gate = self._gate()
+        self.assertEqual([gate.decide(value, 0.0) for value in (1, 1, 2)], [THROTTLE.MIRROR_FORWARD] * 3)
+        self.assertEqual(gate.counters, {"forwarded": 3, "dropped": 0, "deferred": 0})
+
+    def test_min_interval_defers_significant_changes(self):
+        gate = self._gate(min_interval_s=10)
+        self.assertEqual(gate.decide(20.0, 0.0), THROTTLE.MIRROR_FORWARD)
+        self.assertEqual(gate.decide(21.0, 5.0), THROTTLE.MIRROR_DEFER)
+        self.assertEqual(gate.decide(21.0, 10.0), THROTTLE.MIRROR_FORWARD)
+        self.assertEqual(gate.counters, {"forwarded": 2, "dropped": 0, "deferred": 1})
+
+    def test_absolute_and_relative_deadbands(self):
+        gate = self._gate(deadband_abs=0.5)
+        gate.decide(20.0, 0.0)
+        self.assertEqual(gate.decide(20.4, 1.0), THROTTLE.MIRROR_DROP)
+        self.assertEqual(gate.decide(20.6, 2.0), THROTTLE.MIRROR_FORWARD)
+
+        gate = self._gate(deadband_rel=0.05)
+        gate.decide(1000, 0.0)
+        self.assertEqual(gate.decide(1040, 1.0), THROTTLE.MIRROR_DROP)
+        self.assertEqual(gate.decide(1060, 2.0), THROTTLE.MIRROR_FORWARD)
+
+    def test_max_age_forces_update_inside_deadband(self):
+        gate = self._gate(deadband_abs=1.0, max_age_s=60)
+        gate.decide(20.0, 0.0)
+        self.assertEqual(gate.decide(20.1, 30.0), THROTTLE.MIRROR_DROP)
+        self.assertEqual(gate.decide(20.1, 60.0), THROTTLE.MIRROR_FORWARD)
+
+    def test_unavailable_values_always_pass(self):
+        gate = self._gate(min_interval_s=60, deadband_abs=1.0)
+        gate.decide(20.0, 0.0)
+        self.assertEqual(gate.decide(None, 1.0), THROTTLE.MIRROR_FORWARD)
+        self.assertEqual(gate.decide(20.0, 2.0), THROTTLE.MIRROR_FORWARD)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import importlib.util
+import sys
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+MODULE_PATH = ROOT / "custom_components" / "plantrun" / "resample.py"
+
+spec = importlib.util.spec_from_file_location("plantrun_resample", MODULE_PATH)
+assert spec and spec.loader
+resample_mod = importlib.util.module_from_spec(spec)
+sys.modules["plantrun_resample"] = resample_mod
+spec.loader.exec_module(resample_mod)
+
+T0 = 1_772_323_200.0  # 2026-03-01T00:00:00Z
+
+
+class TestAsOfAlignment(unittest.TestCase):
+    def test_merge_series_yields_each_sample_in_time_order(self) -> None:
+        merged = list(
+            resample_mod.merge_series({"temperature": [(T0, 20.0), (T0 + 120, 22.0)], "humidity": [(T0 + 60, 55.0)]})
+        )
+        self.assertEqual(
+            [(ts - T0, key, value) for ts, key, value in merged],
+            [(0, "temperature", 20.0), (60, "humidity", 55.0), (120, "temperature", 22.0)],
+        )
+
+    def test_asof_join_respects_tolerance(self) -> None:
+        joined = resample_mod.asof_join(
+            [(T0, 1.0), (T0 + 100, 2.0), (T0 + 1000, 3.0)],
+            [(T0 + 50, 10.0), (T0 + 100, 11.0)],
+            tolerance_s=300,
+        )
+        self.assertEqual([row[2] for row in joined], [None, 11.0, None])
+
+
+class TestFixedIntervalResampling(unittest.TestCase):
+    def test_resample_mean_and_last_use_epoch_aligned_buckets(self) -> None:
+        series = [(T0 + 10, 1.0), (T0 + 50, 3.0), (T0 + 3700, 5.0)]
+        self.assertEqual(resample_mod.resample(series, 3600), [(T0, 2.0), (T0 + 3600, 5.0)])
+        self.assertEqual(resample_mod.resample(series, 3600, method="last"), [(T0, 3.0), (T0 + 3600, 5.0)])
+        with self.assertRaises(ValueError):
+            resample_mod.resample(series, 3600, method="median")
+
+    def test_resample_aligned_builds_one_grid_for_all_series(self) -> None:
+        interval_s, columns = resample_mod.resample_aligned(
+            {"temperature": [(T0 + 10, 20.0), (T0 + 7300, 24.0)], "energy": [(T0 + 20, 1.0), (T0 + 30, 1.5)]},
+            3600,
+            start=T0,
+            end=T0 + 3 * 3600 - 1,
+            method={"energy": "last"},
+        )
+        self.assertEqual(interval_s, 3600)
+        self.assertEqual(columns["timestamps"], [T0, T0 + 3600, T0 + 7200])
+        self.assertEqual(columns["temperature"], [20.0, None, 24.0])
+        self.assertEqual(columns["energy"], [1.5, None, None])
+
+        _interval_s, filled = resample_mod.resample_aligned(
+            {"energy": [(T0 + 20, 1.0)]}, 3600, start=T0, end=T0 + 7200, fill_forward=True
+        )
+        self.assertEqual(filled["energy"], [1.0, 1.0, 1.0])
+
+        capped, columns = resample_mod.resample_aligned(
+            {"energy": [(T0 + 20, 1.0)]}, 60, start=T0, end=T0 + 86400, max_buckets=10
+        )
+        self.assertGreater(capped, 60)
+        self.assertLessEqual(len(columns["timestamps"]), 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
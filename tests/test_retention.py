@@ -1,7 +1,10 @@
+import asyncio
 import importlib.util
 import sys
 import types
 import unittest
+import unittest.mock
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parents[1]
@@ -34,15 +37,25 @@ plantrun_pkg = types.ModuleType("custom_components.plantrun")
 plantrun_pkg.__path__ = [str(PLANTRUN_DIR)]
 sys.modules["custom_components.plantrun"] = plantrun_pkg
 
+INDEX = _load_module("custom_components.plantrun.rollup_index", PLANTRUN_DIR / "rollup_index.py")
 MODELS = _load_module("custom_components.plantrun.models", PLANTRUN_DIR / "models.py")
-_load_module("custom_components.plantrun.summary", PLANTRUN_DIR / "summary.py")
+SUMMARY = _load_module("custom_components.plantrun.summary", PLANTRUN_DIR / "summary.py")
 RETENTION = _load_module("custom_components.plantrun.retention", PLANTRUN_DIR / "retention.py")
 RunData = MODELS.RunData
 
 
 class FakeStorage:
-    def __init__(self):
+    def __init__(self, runs=None):
         self._daily_rollups = {}
+        self.rollup_index = INDEX.RollupDayIndex()
+        self.rollup_aggregates = {}
+        self.runs = runs or []
+        self.batches = []
+
+    async def async_set_daily_rollups(self, batch, *, dirty=False):
+        self.batches.append(batch)
+        for run_id, day, summary in batch:
+            self._daily_rollups.setdefault(run_id, {})[day] = summary
 
     @property
     def daily_rollups(self):
@@ -112,6 +125,276 @@ class TestRetention(unittest.TestCase):
         self.assertEqual(summary["summary_meta"]["history_state"], "empty")
         self.assertEqual(summary["energy_currency"], "CAD")
 
+    def test_ended_run_serves_frozen_final_summary(self):
+        storage = FakeStorage()
+        run = RunData(
+            id="run1",
+            friendly_name="Tent",
+            start_time="2026-03-01T00:00:00+00:00",
+            end_time="2026-03-02T00:00:00+00:00",
+            status="ended",
+            sensor_history={
+                "energy": [
+                    {"timestamp": "2026-03-01T01:00:00+00:00", "value": 10.0},
+                    {"timestamp": "2026-03-01T23:00:00+00:00", "value": 16.0},
+                ]
+            },
+        )
+        SUMMARY.freeze_final_summary(run, energy_price_per_kwh=0.5, energy_currency="eur")
+        run = RunData.from_dict(run.to_dict())
+        run.sensor_history["energy"][1]["value"] = 99.0  # not read while frozen
+
+        summary = RETENTION.get_summary_with_rollup_fallback(
+            storage, run, energy_price_per_kwh=0.5, energy_currency="eur"
+        )
+        self.assertEqual(summary["summary_meta"]["source"], "final")
+        self.assertEqual(summary["energy_kwh"], 6.0)
+        self.assertEqual(summary["energy_cost"], 3.0)
+
+        repriced = RETENTION.get_summary_with_rollup_fallback(
+            storage, run, energy_price_per_kwh=1.0, energy_currency="eur"
+        )
+        self.assertEqual(repriced["energy_cost"], 6.0)
+
+        SUMMARY.clear_final_summary(run)  # explicit history edit
+        self.assertEqual(RETENTION.get_summary_with_rollup_fallback(storage, run)["energy_kwh"], 89.0)
+
+        run.status = "active"
+        run.end_time = None
+        self.assertIsNone(SUMMARY.frozen_final_summary(run))
+
+    def test_backfill_recaptures_partial_days_and_stops_at_run_end(self):
+        run = RunData(
+            id="run1",
+            friendly_name="Tent",
+            start_time="2026-03-01T06:00:00+00:00",
+            end_time="2026-03-03T12:00:00+00:00",
+            status="ended",
+            sensor_history={
+                "energy": [
+                    {"timestamp": "2026-03-01T06:00:00+00:00", "value": 1.0},
+                    {"timestamp": "2026-03-01T20:00:00+00:00", "value": 3.0},
+                    {"timestamp": "2026-03-02T20:00:00+00:00", "value": 7.0},
+                ]
+            },
+        )
+        rollups = {"2026-03-01": {"day_complete": True}, "2026-03-02": {"energy_kwh": 1.0}}
+        days = RETENTION.missing_rollup_days(run, rollups, today=datetime(2026, 3, 10).date())
+        self.assertEqual(days, ["2026-03-02", "2026-03-03"])
+        self.assertEqual(RETENTION.missing_rollup_days(run, {}, today=datetime(2026, 3, 10).date(), max_days=8), days)
+
+        _start, day_end = RETENTION.day_bounds("2026-03-01")
+        as_of = SUMMARY.build_run_summary(run, energy_price_per_kwh=0.5, as_of=day_end)
+        self.assertEqual((as_of["energy_kwh"], as_of["energy_cost"]), (2.0, 1.0))
+        self.assertEqual(run.energy_state, {})
+
+    def test_compaction_folds_days_into_weeks_then_months(self):
+        def _day(day, value, kwh):
+            return {
+                "energy_kwh": kwh,
+                "day_stats": {
+                    "temperature": {
+                        "count": 2,
+                        "sum": value * 2,
+                        "min": value - 1,
+                        "max": value + 1,
+                        "start": value,
+                        "end": value,
+                        "quantiles": {},
+                        "time_in_range": {"below_s": 0.0, "within_s": 3600.0, "above_s": 0.0},
+                    }
+                },
+            }
+
+        rollups = {
+            "2026-01-05": _day("2026-01-05", 20.0, 1.0),
+            "2026-01-06": _day("2026-01-06", 24.0, 2.5),
+            "2026-01-12": _day("2026-01-12", 22.0, 4.0),
+            "2026-03-30": _day("2026-03-30", 25.0, 9.0),
+        }
+        aggregates = {}
+        folded = RETENTION.compact_run_rollups(
+            rollups, aggregates, today=datetime(2026, 4, 1).date(), daily_days=30, weekly_days=365
+        )
+
+        self.assertEqual(folded, 3)
+        self.assertEqual(list(rollups), ["2026-03-30"])
+        week = aggregates["weekly"]["2026-W02"]
+        self.assertEqual((week["start_day"], week["end_day"], week["days"]), ("2026-01-05", "2026-01-06", 2))
+        self.assertEqual(week["energy_kwh"], 2.5)
+        self.assertEqual(week["stats"]["temperature"]["count"], 4)
+        self.assertEqual(week["stats"]["temperature"]["sum"], 88.0)
+        self.assertEqual((week["stats"]["temperature"]["min"], week["stats"]["temperature"]["max"]), (19.0, 25.0))
+        self.assertEqual(week["stats"]["temperature"]["time_in_range"]["within_s"], 7200.0)
+
+        RETENTION.compact_run_rollups(rollups, aggregates, today=datetime(2027, 2, 1).date(), daily_days=30, weekly_days=365)
+        self.assertEqual(set(aggregates["monthly"]), {"2026-01"})
+        month = aggregates["monthly"]["2026-01"]
+        self.assertEqual((month["days"], month["energy_kwh"]), (3, 4.0))
+        self.assertEqual(set(aggregates["weekly"]), {"2026-W14"})
+
+    def test_rollup_index_tracks_latest_and_ranges_without_resorting(self):
+        index = INDEX.RollupDayIndex()
+        rollups = {"2026-03-03": {}, "2026-03-01": {}, "2026-03-02": {}}
+        self.assertEqual(index.latest("run1", rollups), "2026-03-03")
+
+        rollups["2026-03-05"] = {}
+        index.add("run1", "2026-03-05")
+        rollups["2026-03-04"] = {}
+        index.add("run1", "2026-03-04")
+        index.add("run1", "2026-03-04")
+        self.assertEqual(index.latest("run1", rollups), "2026-03-05")
+        self.assertEqual(
+            index.day_range("run1", rollups, start_day="2026-03-02", end_day="2026-03-04"),
+            ["2026-03-02", "2026-03-03", "2026-03-04"],
+        )
+
+        rollups.pop("2026-03-05")  # mutated in place without the index, e.g. compaction
+        self.assertEqual(index.latest("run1", rollups), "2026-03-04")
+
+    def test_rollup_columns_page_with_cursor_and_energy_deltas(self):
+        storage = FakeStorage()
+        storage.daily_rollups["run1"] = {
+            f"2026-03-0{day}": {
+                "energy_kwh": float(day * 2),
+                "energy_cost": float(day),
+                "day_stats": {
+                    "temperature": {"count": 2, "sum": 40.0 + day * 2, "min": 19.0, "max": 23.0 + day},
+                    "dli": {"count": 1, "sum": 10.0 + day, "min": 10.0 + day, "max": 10.0 + day},
+                },
+            }
+            for day in range(1, 6)
+        }
+
+        first = RETENTION.build_rollup_columns(storage, "run1", start_day="2026-03-02", limit=2)
+        self.assertEqual(first["days"], ["2026-03-02", "2026-03-03"])
+        self.assertEqual(first["energy_kwh_delta"], [2.0, 2.0])
+        self.assertEqual(first["temp_avg"], [22.0, 23.0])
+        self.assertEqual(first["temp_max"], [25.0, 26.0])
+        self.assertIsNone(first["humidity_avg"][0])
+        self.assertEqual(first["dli_avg"], [12.0, 13.0])
+        self.assertEqual(first["vpd_avg"], [None, None])
+        self.assertEqual(first["next_cursor"], "2026-03-03")
+
+        second = RETENTION.build_rollup_columns(storage, "run1", start_day="2026-03-02", limit=2, cursor=first["next_cursor"])
+        self.assertEqual(second["days"], ["2026-03-04", "2026-03-05"])
+        self.assertIsNone(second["next_cursor"])
+
+        storage.rollup_aggregates["run1"] = {
+            "weekly": {
+                "2026-W10": {"start_day": "2026-03-02", "end_day": "2026-03-08", "days": 7, "energy_kwh": 9.0, "stats": {}},
+                "2026-W09": {"start_day": "2026-02-23", "end_day": "2026-03-01", "days": 7, "energy_kwh": 4.0, "stats": {}},
+            }
+        }
+        weekly = RETENTION.build_rollup_columns(storage, "run1", resolution="weekly")
+        self.assertEqual(weekly["days"], ["2026-W09", "2026-W10"])
+        self.assertEqual(weekly["energy_kwh_delta"], [None, 5.0])
+
+    def test_day_stats_are_clipped_to_day_and_serializable(self):
+        run = RunData(
+            id="run1",
+            friendly_name="Tent",
+            start_time="2026-03-01T00:00:00+00:00",
+            end_time="2026-03-03T00:00:00+00:00",
+            status="ended",
+            sensor_history={
+                "temperature": [
+                    {"timestamp": "2026-03-01T23:00:00+00:00", "value": 30.0},
+                    {"timestamp": "2026-03-02T01:00:00+00:00", "value": 22.0},
+                    {"timestamp": "2026-03-02T03:00:00+00:00", "value": 24.0},
+                ]
+            },
+        )
+
+        day_stats = RETENTION.build_day_stats(run, "2026-03-02")
+        self.assertEqual(set(day_stats), {"temperature"})
+        self.assertEqual(day_stats["temperature"]["count"], 2)
+        self.assertEqual(day_stats["temperature"]["max"], 24.0)
+        self.assertEqual(RETENTION.build_day_stats(run, "2026-03-05"), {})
+
+
+    def test_rollup_dli_covers_the_local_day_and_waits_for_it_to_close(self):
+        run = RunData(
+            id="runL",
+            friendly_name="Tent L",
+            start_time="2026-03-01T00:00:00+00:00",
+            end_time="2026-03-04T00:00:00+00:00",
+            status="ended",
+            base_config={"light_ppfd_factor": 1.0},
+            sensor_history={
+                "light": [
+                    {"timestamp": "2026-03-02T02:00:00+00:00", "value": 1000.0},
+                    {"timestamp": "2026-03-02T06:00:00+00:00", "value": 0.0},
+                ]
+            },
+        )
+        west = timezone(timedelta(hours=-5))
+        # Local 2026-03-02 runs 05:00 UTC Mar 2 to 05:00 UTC Mar 3: one hour of light.
+        self.assertAlmostEqual(RETENTION.build_day_stats(run, "2026-03-02", tz=west)["dli"]["max"], 3.6)
+        self.assertAlmostEqual(RETENTION.build_day_stats(run, "2026-03-02")["dli"]["max"], 14.4)
+
+        storage = FakeStorage([run])
+        asyncio.run(RETENTION.async_capture_daily_rollups(storage, today=datetime(2026, 3, 3).date(), time_zone=west))
+        self.assertEqual(
+            {day: rollup["day_complete"] for day, rollup in storage.daily_rollups["runL"].items()},
+            {"2026-03-01": True, "2026-03-02": False},
+        )
+        asyncio.run(RETENTION.async_capture_daily_rollups(storage, today=datetime(2026, 3, 4).date(), time_zone=west))
+        self.assertEqual([day for _run_id, day, _summary in storage.batches[-1]], ["2026-03-02", "2026-03-03"])
+        self.assertTrue(storage.daily_rollups["runL"]["2026-03-02"]["day_complete"])
+
+    def test_backfill_walks_each_run_once_and_yields_between_runs(self):
+        def _points(values, hours=7):
+            start = datetime(2026, 3, 1, 1, tzinfo=timezone.utc)
+            return [
+                {"timestamp": (start + timedelta(hours=hours * index)).isoformat(), "value": value}
+                for index, value in enumerate(values)
+            ]
+
+        run = RunData(
+            id="runB",
+            friendly_name="Tent B",
+            start_time="2026-03-01T00:00:00+00:00",
+            end_time="2026-03-04T12:00:00+00:00",
+            status="ended",
+            base_config={"light_ppfd_factor": 1.0},
+            sensor_history={
+                "temperature": _points([20.0 + index % 5 for index in range(12)]),
+                "humidity": _points([55.0 + index % 3 for index in range(12)], hours=5),
+                "light": _points([800.0 * (index % 2) for index in range(12)], hours=3),
+                "energy": _points([float(index * index) for index in range(12)]),
+            },
+        )
+        tariff_mod = sys.modules["custom_components.plantrun.tariff"]
+        bands = [tariff_mod.TariffBand.from_dict(band) for band in tariff_mod.parse_tariff_spec("22:00-06:00=0.10")]
+        pricing = {"energy_tariff": tariff_mod.TariffSchedule(bands, default_price=0.30)}
+        west = timezone(timedelta(hours=-5))
+        days = ["2026-03-01", "2026-03-02", "2026-03-03", "2026-03-04"]
+        cuts = [RETENTION.day_bounds(day)[1] for day in days]
+
+        walked = SUMMARY.build_run_summaries_as_of(run, cuts, time_zone=west, **pricing)
+        for cut, summary in zip(cuts, walked):
+            self.assertEqual(summary, SUMMARY.build_run_summary(run, as_of=cut, time_zone=west, **pricing))
+        self.assertEqual(run.energy_state, {})
+        self.assertEqual(walked[-1]["energy_kwh"], SUMMARY.run_energy_kwh(run))
+        self.assertEqual(
+            RETENTION.build_days_stats(run, days + ["2026-03-09"], tz=west),
+            [RETENTION.build_day_stats(run, day, tz=west) for day in days] + [{}],
+        )
+
+        second = RunData(id="runC", friendly_name="Tent C", start_time="2026-03-02T00:00:00+00:00")
+        storage = FakeStorage([run, second])
+        sleep = unittest.mock.AsyncMock()
+        with unittest.mock.patch.object(RETENTION.asyncio, "sleep", sleep):
+            captured = asyncio.run(
+                RETENTION.async_capture_daily_rollups(
+                    storage, today=datetime(2026, 3, 6).date(), time_zone=west, **pricing
+                )
+            )
+        sleep.assert_awaited_once_with(0)
+        self.assertEqual(captured["runB"], days)
+        self.assertEqual(storage.daily_rollups["runB"]["2026-03-03"]["energy_kwh"], walked[2]["energy_kwh"])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -28,6 +28,8 @@ def _install_homeassistant_stubs() -> None:
     class SensorEntity:
         _attr_has_entity_name = False
         _attr_should_poll = True
+        available = True
+        extra_state_attributes = None
 
         async def async_added_to_hass(self) -> None:
             return None
@@ -41,6 +43,14 @@ def _install_homeassistant_stubs() -> None:
         def schedule_update_ha_state(self, _force_refresh: bool = False) -> None:
             return None
 
+        @property
+        def unique_id(self):
+            return getattr(self, "_attr_unique_id", None)
+
+        @property
+        def native_value(self):
+            return getattr(self, "_attr_native_value", None)
+
     sensor_mod.SensorEntity = SensorEntity
     sys.modules["homeassistant.components"] = components
     sys.modules["homeassistant.components.sensor"] = sensor_mod
@@ -70,8 +80,18 @@ def _install_homeassistant_stubs() -> None:
 
     core.HomeAssistant = HomeAssistant
     core.Event = Event
+    core.callback = lambda func: func
     sys.modules["homeassistant.core"] = core
 
+    entity_registry = types.ModuleType("homeassistant.helpers.entity_registry")
+    entity_registry.async_get = lambda hass: hass.entity_registry
+    entity_registry.async_entries_for_config_entry = lambda registry, entry_id: [
+        entity_entry for entity_entry in registry.entries.values() if entity_entry.config_entry_id == entry_id
+    ]
+    sys.modules["homeassistant.helpers.entity_registry"] = entity_registry
+    helpers = sys.modules.setdefault("homeassistant.helpers", types.ModuleType("homeassistant.helpers"))
+    helpers.entity_registry = entity_registry
+
     entity_platform = types.ModuleType("homeassistant.helpers.entity_platform")
     entity_platform.AddEntitiesCallback = object
     sys.modules["homeassistant.helpers.entity_platform"] = entity_platform
@@ -97,7 +117,13 @@ def _install_homeassistant_stubs() -> None:
     def async_track_state_change_event(_hass, _entity_ids, _callback):
         return lambda: None
 
+    def async_call_later(_hass, delay, action):
+        event_mod._scheduled.append((delay, action))
+        return lambda: None
+
+    event_mod._scheduled = []
     event_mod.async_track_state_change_event = async_track_state_change_event
+    event_mod.async_call_later = async_call_later
     sys.modules["homeassistant.helpers.event"] = event_mod
 
 
@@ -121,12 +147,14 @@ def _load_sensor_module():
     coordinator_mod.PlantRunCoordinator = PlantRunCoordinator
     sys.modules["custom_components.plantrun.coordinator"] = coordinator_mod
 
+    run_lookup = _load_module("custom_components.plantrun.run_lookup", PLANTRUN_DIR / "run_lookup.py")
     sensor = _load_module("custom_components.plantrun.sensor", PLANTRUN_DIR / "sensor.py")
-    return sensor, models
+    return sensor, models, run_lookup
 
 
 _install_homeassistant_stubs()
-SENSOR_MODULE, MODELS_MODULE = _load_sensor_module()
+SENSOR_MODULE, MODELS_MODULE, RUN_LOOKUP_MODULE = _load_sensor_module()
+SUMMARY_MODULE = sys.modules["custom_components.plantrun.summary"]
 Binding = MODELS_MODULE.Binding
 RunData = MODELS_MODULE.RunData
 
@@ -135,6 +163,16 @@ class FakeCoordinator:
     def __init__(self, data):
         self.data = data
         self._listeners = []
+        self.run_lookup = RUN_LOOKUP_MODULE.RunLookup(lambda: self.data)
+        self.changed_run_ids = None
+        self._tick_listeners = []
+
+    def run_changed(self, run_id):
+        return self.changed_run_ids is None or run_id in self.changed_run_ids
+
+    def async_add_tick_listener(self, action):
+        self._tick_listeners.append(action)
+        return lambda: self._tick_listeners.remove(action)
 
     def async_add_listener(self, callback):
         self._listeners.append(callback)
@@ -154,9 +192,36 @@ class FakeEntry:
         self.unload_callbacks.append(callback)
 
 
+class FakeEntityRegistry:
+    def __init__(self) -> None:
+        self.entries = {}
+        self.removed = []
+
+    def add(self, unique_id: str, config_entry_id: str) -> str:
+        entity_id = f"sensor.{unique_id}"
+        self.entries[entity_id] = types.SimpleNamespace(
+            entity_id=entity_id,
+            domain="sensor",
+            unique_id=unique_id,
+            config_entry_id=config_entry_id,
+        )
+        return entity_id
+
+    def async_get_entity_id(self, domain, _platform, unique_id):
+        for entity_entry in self.entries.values():
+            if entity_entry.domain == domain and entity_entry.unique_id == unique_id:
+                return entity_entry.entity_id
+        return None
+
+    def async_remove(self, entity_id) -> None:
+        self.entries.pop(entity_id)
+        self.removed.append(entity_id)
+
+
 class FakeHass:
     def __init__(self, domain: str, entry_id: str, coordinator) -> None:
         self.data = {domain: {entry_id: {"coordinator": coordinator}}}
+        self.entity_registry = FakeEntityRegistry()
         self.states = types.SimpleNamespace(
             get=lambda _entity_id: types.SimpleNamespace(state="21.4", attributes={})
         )
@@ -304,6 +369,52 @@ class TestDynamicBindingEntities(unittest.TestCase):
         coordinator._listeners[0]()
         self.assertFalse(proxy.available)
 
+    def test_removed_bindings_and_runs_drop_their_registry_entries(self) -> None:
+        const = sys.modules["custom_components.plantrun.const"]
+
+        run = RunData.from_dict(
+            {
+                "id": "runA",
+                "friendly_name": "Tent A",
+                "start_time": "2026-03-01T00:00:00",
+                "bindings": [
+                    {"metric_type": "temperature", "sensor_id": "sensor.t1"},
+                    {"metric_type": "humidity", "sensor_id": "sensor.h1"},
+                ],
+            }
+        )
+        coordinator = FakeCoordinator([run])
+        entry = FakeEntry("entry-1")
+        hass = FakeHass(const.DOMAIN, entry.entry_id, coordinator)
+        registry = hass.entity_registry
+        ghost_id = registry.add("plantrun_runGone_cultivar", entry.entry_id)
+        registry.add("other_integration_sensor", "entry-2")
+        added_batches = []
+
+        def _async_add_entities(entities):
+            added_batches.append(list(entities))
+            for entity in entities:
+                registry.add(entity.unique_id, entry.entry_id)
+
+        asyncio.run(SENSOR_MODULE.async_setup_entry(hass, entry, _async_add_entities))
+        self.assertEqual(registry.removed, [ghost_id])
+
+        proxies = [
+            entity for entity in added_batches[0] if isinstance(entity, SENSOR_MODULE.PlantRunProxySensor)
+        ]
+        removed_proxy, kept_proxy = proxies
+        run.bindings = [binding for binding in run.bindings if binding.metric_type == "humidity"]
+        coordinator._listeners[0]()
+
+        self.assertEqual(registry.removed[1:], [f"sensor.{removed_proxy.unique_id}"])
+        self.assertIn(f"sensor.{kept_proxy.unique_id}", registry.entries)
+        self.assertEqual(len(added_batches), 1)
+
+        coordinator.data = []
+        coordinator._listeners[0]()
+        remaining = {entity_entry.unique_id for entity_entry in registry.entries.values()}
+        self.assertEqual(remaining, {"plantrun_total_runs", "other_integration_sensor"})
+
     def test_run_energy_entities_use_ha_compatible_state_classes(self) -> None:
         coordinator = FakeCoordinator([])
 
@@ -337,7 +448,18 @@ class TestDynamicBindingEntities(unittest.TestCase):
         proxy._apply_source_metadata({"unit_of_measurement": "Wh"})
         self.assertEqual(proxy._attr_state_class, "total_increasing")
         self.assertEqual(proxy._attr_device_class, "energy")
-        self.assertEqual(proxy._attr_native_unit_of_measurement, "Wh")
+        self.assertEqual(proxy._attr_native_unit_of_measurement, "kWh")
+        self.assertEqual(proxy._normalize_source_native_value("1500"), 1.5)
+
+    def test_unconvertible_unit_is_kept_and_converter_compiled_once(self) -> None:
+        proxy = _build_proxy_sensor("humidity", "sensor.humidity")
+        proxy._apply_source_metadata({"unit_of_measurement": "g/m³"})
+        converter = proxy._converter
+        proxy._apply_source_metadata({"unit_of_measurement": "g/m³"})
+
+        self.assertIs(proxy._converter, converter)
+        self.assertEqual(proxy._attr_native_unit_of_measurement, "g/m³")
+        self.assertEqual(proxy._normalize_source_native_value("9.5"), 9.5)
 
     def test_light_metadata_sets_illuminance_device_class_only_for_canonical_lx(self) -> None:
         proxy = _build_proxy_sensor("light", "sensor.light_alias")
@@ -424,6 +546,8 @@ class TestDynamicBindingEntities(unittest.TestCase):
         self.assertEqual(attrs["binding_id"], "bind_ctx")
         self.assertEqual(attrs["source_entity_id"], "sensor.temp")
         self.assertEqual(attrs["history_context"]["binding_status"], "bound")
+        self.assertIsNone(attrs["history_context"]["run_end"])
+        self.assertIs(proxy.extra_state_attributes["history_context"], attrs["history_context"])
 
         unavailable_state = types.SimpleNamespace(state="unavailable")
         proxy.hass = types.SimpleNamespace(
@@ -474,7 +598,7 @@ class TestProxyStateChangeThreadSafety(unittest.TestCase):
             captured["callback"] = callback
             return lambda: None
 
-        SENSOR_MODULE.async_track_state_change_event = _capture_track
+        sys.modules["custom_components.plantrun.source_dispatcher"].async_track_state_change_event = _capture_track
 
         class _States:
             @staticmethod
@@ -500,10 +624,11 @@ class TestProxyStateChangeThreadSafety(unittest.TestCase):
 
         event = types.SimpleNamespace(
             data={
+                "entity_id": "sensor.t1",
                 "new_state": types.SimpleNamespace(
                     state="21.4",
                     attributes={"unit_of_measurement": "°C"},
-                )
+                ),
             }
         )
         captured["callback"](event)
@@ -512,5 +637,528 @@ class TestProxyStateChangeThreadSafety(unittest.TestCase):
         self.assertEqual(calls["written"], 0)
 
 
+class TestRunLookup(unittest.TestCase):
+    def test_lookup_tracks_appended_runs_and_replaced_bindings(self) -> None:
+        first = RunData(id="run-1", friendly_name="A", start_time="2026-03-01T00:00:00+00:00")
+        first.bindings.append(Binding(metric_type="temperature", sensor_id="sensor.t", id="b1"))
+        coordinator = FakeCoordinator([first])
+        lookup = coordinator.run_lookup
+
+        self.assertIs(lookup.run("run-1"), first)
+        self.assertEqual(lookup.binding("run-1", "b1").sensor_id, "sensor.t")
+        self.assertIsNone(lookup.binding("run-1", "missing"))
+
+        second = RunData(id="run-2", friendly_name="B", start_time="2026-03-01T00:00:00+00:00")
+        coordinator.data.append(second)
+        self.assertIs(lookup.run("run-2"), second)
+
+        first.bindings = []
+        self.assertIsNone(lookup.binding("run-1", "b1"))
+
+    def test_invalidate_picks_up_runs_replaced_in_place(self) -> None:
+        original = RunData(id="run-1", friendly_name="A", start_time="2026-03-01T00:00:00+00:00")
+        coordinator = FakeCoordinator([original])
+        lookup = coordinator.run_lookup
+        self.assertIs(lookup.run("run-1"), original)
+
+        replacement = RunData(id="run-1", friendly_name="A2", start_time="2026-03-01T00:00:00+00:00")
+        coordinator.data[0] = replacement
+        lookup.invalidate()
+        self.assertIs(lookup.runs_by_id["run-1"], replacement)
+
+
+class TestEnergySensors(unittest.TestCase):
+    def test_energy_sensors_read_the_integrator_without_building_a_summary(self) -> None:
+        run = RunData(
+            id="run-energy",
+            friendly_name="Tent",
+            start_time="2026-03-01T00:00:00+00:00",
+            sensor_history={
+                "energy": [
+                    {"timestamp": "2026-03-01T01:00:00+00:00", "value": 10.0},
+                    {"timestamp": "2026-03-01T02:00:00+00:00", "value": 12.5},
+                ]
+            },
+        )
+        coordinator = FakeCoordinator([run])
+        pricing = {"energy_price_per_kwh": 0.4, "energy_currency": "EUR"}
+        energy = SENSOR_MODULE.PlantRunEnergySensor(coordinator, run.id, **pricing)
+        cost = SENSOR_MODULE.PlantRunEnergyCostSensor(coordinator, run.id, **pricing)
+
+        builds = []
+        original = SUMMARY_MODULE.build_run_summary
+
+        def counting_build(*args, **kwargs):
+            builds.append(args[0].id)
+            return original(*args, **kwargs)
+
+        SUMMARY_MODULE.build_run_summary = counting_build
+        try:
+            self.assertAlmostEqual(energy.native_value, 2.5)
+            self.assertAlmostEqual(cost.native_value, 1.0)
+            self.assertEqual(builds, [])
+        finally:
+            SUMMARY_MODULE.build_run_summary = original
+
+
+class TestTargetedEntityUpdates(unittest.TestCase):
+    def _count_writes(self, entity):
+        writes = []
+        entity.async_write_ha_state = lambda: writes.append(entity.native_value)
+        return writes
+
+    def test_only_entities_of_changed_runs_write_state(self) -> None:
+        run_a = RunData(id="runA", friendly_name="A", start_time="2026-03-01T00:00:00+00:00")
+        run_b = RunData(id="runB", friendly_name="B", start_time="2026-03-01T00:00:00+00:00")
+        coordinator = FakeCoordinator([run_a, run_b])
+        status_a = SENSOR_MODULE.PlantRunStatusSensor(coordinator, "runA")
+        status_b = SENSOR_MODULE.PlantRunStatusSensor(coordinator, "runB")
+        writes_a, writes_b = self._count_writes(status_a), self._count_writes(status_b)
+
+        status_a._handle_coordinator_update()
+        status_b._handle_coordinator_update()
+        self.assertEqual((writes_a, writes_b), (["active"], ["active"]))
+
+        run_a.status = "ended"
+        coordinator.changed_run_ids = {"runA"}
+        status_a._handle_coordinator_update()
+        status_b._handle_coordinator_update()
+        self.assertEqual((writes_a, writes_b), (["active", "ended"], ["active"]))
+
+    def test_unchanged_value_skips_state_write(self) -> None:
+        run = RunData(id="runA", friendly_name="A", start_time="2026-03-01T00:00:00+00:00")
+        coordinator = FakeCoordinator([run])
+        phase = SENSOR_MODULE.PlantRunActivePhaseSensor(coordinator, "runA")
+        writes = self._count_writes(phase)
+
+        phase._handle_coordinator_update()
+        run.notes.append(MODELS_MODULE.Note(text="watered", timestamp="2026-03-02T00:00:00+00:00"))
+        coordinator.changed_run_ids = {"runA"}
+        phase._handle_coordinator_update()
+        self.assertEqual(len(writes), 1)
+
+
+class TestProxyMirrorThrottle(unittest.TestCase):
+    def test_chatty_source_is_throttled_and_last_change_flushed(self) -> None:
+        run = RunData.from_dict(
+            {
+                "id": "runM",
+                "friendly_name": "Tent M",
+                "start_time": "2026-03-01T00:00:00",
+                "bindings": [{"metric_type": "temperature", "sensor_id": "sensor.t1"}],
+            }
+        )
+        proxy = SENSOR_MODULE.PlantRunProxySensor(
+            coordinator=FakeCoordinator([run]),
+            run_id="runM",
+            run_name="Tent M",
+            binding=run.bindings[0],
+        )
+        proxy.hass = types.SimpleNamespace(states=types.SimpleNamespace(get=lambda _entity_id: None))
+        written = []
+        proxy.schedule_update_ha_state = lambda _force_refresh=False: written.append(proxy._attr_native_value)
+        proxy.async_write_ha_state = lambda: written.append(proxy._attr_native_value)
+        clock = {"now": 0.0}
+        original_monotonic = SENSOR_MODULE.monotonic
+        SENSOR_MODULE.monotonic = lambda: clock["now"]
+        event_mod = sys.modules["homeassistant.helpers.event"]
+        event_mod._scheduled.clear()
+
+        def _emit(value, at):
+            clock["now"] = at
+            proxy._handle_source_state_change(
+                types.SimpleNamespace(
+                    data={"new_state": types.SimpleNamespace(state=value, attributes={"unit_of_measurement": "°C"})}
+                )
+            )
+
+        try:
+            _emit("21.0", 0.0)
+            _emit("21.02", 1.0)
+            _emit("22.0", 2.0)
+            self.assertEqual(written, [21])
+            self.assertEqual(proxy.mirror_counters, {"forwarded": 1, "dropped": 1, "deferred": 1})
+
+            self.assertEqual(len(event_mod._scheduled), 1)
+            delay, flush = event_mod._scheduled[0]
+            self.assertEqual(delay, 8.0)
+            clock["now"] = 10.0
+            flush(None)
+            self.assertEqual(written, [21, 22])
+            self.assertEqual(proxy.mirror_counters, {"forwarded": 1, "dropped": 1, "deferred": 1})
+            # Mirrored writes keep the write-on-change fingerprint current.
+            proxy._async_write_state_if_changed()
+            self.assertEqual(written, [21, 22])
+        finally:
+            SENSOR_MODULE.monotonic = original_monotonic
+
+
+class TestDormantRuns(unittest.TestCase):
+    def _added_proxy(self, run, **kwargs):
+        dispatcher_mod = sys.modules["custom_components.plantrun.source_dispatcher"]
+        original_track = dispatcher_mod.async_track_state_change_event
+        dispatcher_mod.async_track_state_change_event = lambda _hass, _entity_ids, _action: lambda: None
+        self.addCleanup(setattr, dispatcher_mod, "async_track_state_change_event", original_track)
+        coordinator = FakeCoordinator([run])
+        hass = types.SimpleNamespace(
+            states=types.SimpleNamespace(get=lambda _entity_id: types.SimpleNamespace(state="21.4", attributes={}))
+        )
+        dispatcher = dispatcher_mod.SourceStateDispatcher(hass, SENSOR_MODULE.METRIC_METADATA)
+        proxy = SENSOR_MODULE.PlantRunProxySensor(
+            coordinator=coordinator,
+            run_id=run.id,
+            run_name=run.friendly_name,
+            binding=run.bindings[0],
+            source_dispatcher=dispatcher,
+            **kwargs,
+        )
+        proxy.hass = hass
+        asyncio.run(proxy.async_added_to_hass())
+        return proxy, coordinator, dispatcher
+
+    def _run(self, **extra):
+        return RunData.from_dict(
+            {
+                "id": "runD",
+                "friendly_name": "Tent D",
+                "start_time": "2026-03-01T00:00:00+00:00",
+                "bindings": [{"metric_type": "temperature", "sensor_id": "sensor.t1"}],
+                **extra,
+            }
+        )
+
+    def test_ended_run_proxy_stops_listening_and_freezes_value(self) -> None:
+        run = self._run()
+        proxy, coordinator, dispatcher = self._added_proxy(run)
+        self.assertEqual(dispatcher.entity_ids, {"sensor.t1"})
+
+        run.status = "ended"
+        run.end_time = "2026-04-01T00:00:00+00:00"
+        proxy._handle_coordinator_update()
+        self.assertEqual(dispatcher.entity_ids, set())
+        self.assertTrue(proxy.available)
+        self.assertEqual(proxy._attr_native_value, 21.4)
+        self.assertTrue(proxy.extra_state_attributes["dormant"])
+
+        run.status = "active"
+        run.end_time = None
+        proxy._handle_coordinator_update()
+        self.assertEqual(dispatcher.entity_ids, {"sensor.t1"})
+
+    def test_unavailable_policy_drops_value_of_ended_run(self) -> None:
+        run = self._run()
+        proxy, _coordinator, dispatcher = self._added_proxy(
+            run, dormant_policy=SENSOR_MODULE.DORMANT_POLICY_UNAVAILABLE
+        )
+        run.status = "ended"
+        proxy._handle_coordinator_update()
+        self.assertEqual(dispatcher.entity_ids, set())
+        self.assertFalse(proxy.available)
+        self.assertIsNone(proxy._attr_native_value)
+
+    def test_proxy_of_already_ended_run_uses_recorded_value(self) -> None:
+        run = self._run(
+            status="ended",
+            end_time="2026-04-01T00:00:00+00:00",
+            sensor_history={
+                "temperature": [
+                    {"timestamp": "2026-03-31T23:00:00+00:00", "value": 19.5},
+                    {"timestamp": "2026-04-02T00:00:00+00:00", "value": 30.0},
+                ]
+            },
+        )
+        proxy, _coordinator, dispatcher = self._added_proxy(run)
+        self.assertEqual(dispatcher.entity_ids, set())
+        self.assertEqual(proxy._attr_native_value, 19.5)
+        self.assertTrue(proxy.available)
+
+    def test_summary_sensors_of_ended_runs_drop_tick_listener(self) -> None:
+        run = RunData(id="runD", friendly_name="D", start_time="2026-03-01T00:00:00+00:00")
+        coordinator = FakeCoordinator([run])
+        energy = SENSOR_MODULE.PlantRunEnergySensor(coordinator, "runD")
+        energy.hass = None
+        writes = []
+        energy.async_write_ha_state = lambda: writes.append(energy.native_value)
+        asyncio.run(energy.async_added_to_hass())
+        self.assertEqual(len(coordinator._tick_listeners), 1)
+
+        run.status = "ended"
+        run.end_time = "2026-04-01T00:00:00+00:00"
+        coordinator.changed_run_ids = {"runD"}
+        energy._handle_coordinator_update()
+        self.assertEqual(coordinator._tick_listeners, [])
+        self.assertEqual(len(writes), 1)
+
+        energy._last_written_state = None
+        coordinator.changed_run_ids = {"other"}
+        energy._handle_coordinator_update()
+        self.assertEqual(len(writes), 1)
+
+
+class TestSourceStateDispatcher(unittest.TestCase):
+    def test_shared_source_uses_one_subscription_and_fans_out(self) -> None:
+        dispatcher_mod = sys.modules["custom_components.plantrun.source_dispatcher"]
+        subscriptions = []
+
+        def _track(_hass, entity_ids, action):
+            record = {"entity_ids": list(entity_ids), "action": action, "active": True}
+            subscriptions.append(record)
+            return lambda: record.update(active=False)
+
+        original_track = dispatcher_mod.async_track_state_change_event
+        dispatcher_mod.async_track_state_change_event = _track
+        try:
+            dispatcher = dispatcher_mod.SourceStateDispatcher(hass=None)
+            received = []
+            remove_a = dispatcher.async_add_listener("sensor.t1", lambda event: received.append(("a", event)))
+            remove_b = dispatcher.async_add_listener("sensor.t1", lambda event: received.append(("b", event)))
+            dispatcher.async_add_listener("sensor.h1", lambda event: received.append(("h", event)))
+
+            self.assertEqual([record["entity_ids"] for record in subscriptions], [["sensor.t1"], ["sensor.h1"]])
+            subscriptions[0]["action"](types.SimpleNamespace(data={"entity_id": "sensor.t1"}))
+            self.assertEqual([name for name, _event in received], ["a", "b"])
+
+            remove_a()
+            self.assertTrue(subscriptions[0]["active"])
+            remove_b()
+            self.assertFalse(subscriptions[0]["active"])
+            self.assertEqual(dispatcher.entity_ids, {"sensor.h1"})
+
+            dispatcher.async_shutdown()
+            self.assertFalse(subscriptions[1]["active"])
+        finally:
+            dispatcher_mod.async_track_state_change_event = original_track
+
+
+    def test_runs_bound_to_one_source_share_its_group_and_normalization(self) -> None:
+        dispatcher_mod = sys.modules["custom_components.plantrun.source_dispatcher"]
+        value_converter = sys.modules["custom_components.plantrun.value_converter"]
+        original_track = dispatcher_mod.async_track_state_change_event
+        original_compile = dispatcher_mod.compile_converter
+        compiles = []
+
+        def _compile(*args):
+            compiles.append(args[1])
+            return value_converter.compile_converter(*args)
+
+        dispatcher_mod.async_track_state_change_event = lambda _hass, _entity_ids, _action: lambda: None
+        dispatcher_mod.compile_converter = _compile
+        try:
+            runs = [
+                RunData.from_dict(
+                    {
+                        "id": run_id,
+                        "friendly_name": run_id,
+                        "start_time": "2026-03-01T00:00:00+00:00",
+                        "bindings": [{"metric_type": "temperature", "sensor_id": "sensor.shared"}],
+                    }
+                )
+                for run_id in ("runA", "runB")
+            ]
+            coordinator = FakeCoordinator(runs)
+            hass = types.SimpleNamespace(
+                states=types.SimpleNamespace(get=lambda _entity_id: None),
+            )
+            dispatcher = dispatcher_mod.SourceStateDispatcher(hass, SENSOR_MODULE.METRIC_METADATA)
+            proxies = []
+            for run in runs:
+                proxy = SENSOR_MODULE.PlantRunProxySensor(
+                    coordinator=coordinator,
+                    run_id=run.id,
+                    run_name=run.friendly_name,
+                    binding=run.bindings[0],
+                    source_dispatcher=dispatcher,
+                )
+                proxy.hass = hass
+                proxy.schedule_update_ha_state = lambda _force_refresh=False: None
+                asyncio.run(proxy.async_added_to_hass())
+                proxies.append(proxy)
+
+            self.assertIs(proxies[0]._source_group, proxies[1]._source_group)
+            compiles.clear()
+            state = types.SimpleNamespace(state="68", attributes={"unit_of_measurement": "°F"})
+            event = types.SimpleNamespace(data={"entity_id": "sensor.shared", "new_state": state})
+            for proxy in proxies:
+                proxy._handle_source_state_change(event)
+
+            self.assertEqual(len(compiles), 1)
+            self.assertEqual([proxy._attr_native_value for proxy in proxies], [20, 20])
+            self.assertEqual([proxy._attr_native_unit_of_measurement for proxy in proxies], ["°C", "°C"])
+        finally:
+            dispatcher_mod.async_track_state_change_event = original_track
+            dispatcher_mod.compile_converter = original_compile
+
+
+class TestDerivedRunSensors(unittest.TestCase):
+    def _added(self, sensor_cls, run, states):
+        dispatcher_mod = sys.modules["custom_components.plantrun.source_dispatcher"]
+        original_track = dispatcher_mod.async_track_state_change_event
+        dispatcher_mod.async_track_state_change_event = lambda _hass, _entity_ids, _action: lambda: None
+        self.addCleanup(setattr, dispatcher_mod, "async_track_state_change_event", original_track)
+        coordinator = FakeCoordinator([run])
+        hass = types.SimpleNamespace(
+            states=types.SimpleNamespace(get=states.get),
+            config=types.SimpleNamespace(time_zone="UTC"),
+        )
+        dispatcher = dispatcher_mod.SourceStateDispatcher(hass, SENSOR_MODULE.METRIC_METADATA)
+        sensor = sensor_cls(coordinator, run.id, source_dispatcher=dispatcher)
+        sensor.hass = hass
+        sensor.async_write_ha_state = lambda: None
+        asyncio.run(sensor.async_added_to_hass())
+        return sensor, coordinator, dispatcher
+
+    def test_vpd_sensor_pairs_sources_and_follows_binding_changes(self) -> None:
+        run = RunData.from_dict(
+            {
+                "id": "runV",
+                "friendly_name": "Tent V",
+                "start_time": "2026-03-01T00:00:00+00:00",
+                "bindings": [
+                    {"metric_type": "temperature", "sensor_id": "sensor.t1"},
+                    {"metric_type": "humidity", "sensor_id": "sensor.h1"},
+                ],
+            }
+        )
+        states = {
+            "sensor.t1": types.SimpleNamespace(state="77", attributes={"unit_of_measurement": "°F"}),
+            "sensor.h1": types.SimpleNamespace(state="60", attributes={"unit_of_measurement": "%"}),
+        }
+        vpd, coordinator, dispatcher = self._added(SENSOR_MODULE.PlantRunVpdSensor, run, states)
+        self.assertEqual(dispatcher.entity_ids, {"sensor.t1", "sensor.h1"})
+        self.assertEqual(vpd.native_value, 1.267)
+
+        state = types.SimpleNamespace(state="100", attributes={"unit_of_measurement": "%"})
+        vpd._handle_source_event("humidity", types.SimpleNamespace(data={"new_state": state}))
+        self.assertEqual(vpd.native_value, 0.0)
+
+        run.bindings = [binding for binding in run.bindings if binding.metric_type == "temperature"]
+        coordinator.run_lookup.invalidate()
+        vpd._handle_coordinator_update()
+        self.assertEqual(dispatcher.entity_ids, {"sensor.t1"})
+        self.assertFalse(vpd.available)
+
+        run.status = "ended"
+        vpd._handle_coordinator_update()
+        self.assertEqual(dispatcher.entity_ids, set())
+
+    def test_dli_sensor_seeds_from_history_and_accrues_on_tick(self) -> None:
+        now = SENSOR_MODULE.time()
+        today = SENSOR_MODULE.datetime.fromtimestamp(now, SENSOR_MODULE.timezone.utc).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        run = RunData.from_dict(
+            {
+                "id": "runL",
+                "friendly_name": "Tent L",
+                "start_time": "2026-03-01T00:00:00+00:00",
+                "bindings": [{"metric_type": "light", "sensor_id": "sensor.lux"}],
+                "base_config": {"light_ppfd_factor": 1.0},
+                "sensor_history": {"light": [{"timestamp": today.isoformat(), "value": 100.0}]},
+            }
+        )
+        states = {"sensor.lux": types.SimpleNamespace(state="0", attributes={"unit_of_measurement": "lx"})}
+        dli, coordinator, _dispatcher = self._added(SENSOR_MODULE.PlantRunDliSensor, run, states)
+        elapsed = min(now - today.timestamp(), sys.modules["custom_components.plantrun.const"].DERIVED_MAX_GAP_S)
+        self.assertAlmostEqual(dli.native_value, round(100.0 * elapsed / 1e6, 2), places=2)
+        self.assertEqual(dli.extra_state_attributes["day"], today.date().isoformat())
+        self.assertEqual(len(coordinator._tick_listeners), 1)
+
+        state = types.SimpleNamespace(state="500", attributes={"unit_of_measurement": "µmol/m²/s"})
+        dli._handle_source_event("light", types.SimpleNamespace(data={"new_state": state}))
+        before = dli._integral.total
+        dli._integral.advance(dli._integral._last_ts + 3600)
+        self.assertAlmostEqual(dli._integral.total - before, 500.0 * 3600)
+
+
+    def test_dli_sensor_accrues_source_state_older_than_the_seed(self) -> None:
+        run = RunData.from_dict(
+            {
+                "id": "runL",
+                "friendly_name": "Tent L",
+                "start_time": "2026-03-01T00:00:00+00:00",
+                "bindings": [{"metric_type": "light", "sensor_id": "sensor.par"}],
+            }
+        )
+        held_since = SENSOR_MODULE.datetime.fromtimestamp(SENSOR_MODULE.time() - 3600, SENSOR_MODULE.timezone.utc)
+        states = {
+            "sensor.par": types.SimpleNamespace(
+                state="500", attributes={"unit_of_measurement": "µmol/m²/s"}, last_updated=held_since
+            )
+        }
+        dli, _coordinator, _dispatcher = self._added(SENSOR_MODULE.PlantRunDliSensor, run, states)
+        before = dli._integral.total
+        dli._integral.advance(dli._integral.last_ts + 600)
+        self.assertAlmostEqual(dli._integral.total - before, 500.0 * 600)
+
+
+class TestProxyThresholdAlerts(unittest.TestCase):
+    def test_rule_fires_bus_events_with_min_duration_and_hysteresis(self) -> None:
+        dispatcher_mod = sys.modules["custom_components.plantrun.source_dispatcher"]
+        original_track = dispatcher_mod.async_track_state_change_event
+        dispatcher_mod.async_track_state_change_event = lambda _hass, _entity_ids, _action: lambda: None
+        self.addCleanup(setattr, dispatcher_mod, "async_track_state_change_event", original_track)
+        original_call_later = SENSOR_MODULE.async_call_later
+        scheduled = []
+
+        def _call_later(_hass, delay, action):
+            scheduled.append((delay, action))
+            return lambda: None
+
+        SENSOR_MODULE.async_call_later = _call_later
+        self.addCleanup(setattr, SENSOR_MODULE, "async_call_later", original_call_later)
+
+        run = RunData.from_dict(
+            {
+                "id": "runAl",
+                "friendly_name": "Tent Alert",
+                "start_time": "2026-03-01T00:00:00+00:00",
+                "bindings": [{"metric_type": "temperature", "sensor_id": "sensor.t1"}],
+                "base_config": {
+                    "alert_rules": {"temperature": {"high": 30, "hysteresis": 1, "min_duration_s": 120}}
+                },
+            }
+        )
+        fired = []
+        hass = types.SimpleNamespace(
+            states=types.SimpleNamespace(get=lambda _entity_id: None),
+            bus=types.SimpleNamespace(async_fire=lambda event_type, data: fired.append((event_type, data))),
+        )
+        proxy = SENSOR_MODULE.PlantRunProxySensor(
+            coordinator=FakeCoordinator([run]),
+            run_id=run.id,
+            run_name=run.friendly_name,
+            binding=run.bindings[0],
+            source_dispatcher=dispatcher_mod.SourceStateDispatcher(hass, SENSOR_MODULE.METRIC_METADATA),
+        )
+        proxy.hass = hass
+        proxy.schedule_update_ha_state = lambda _force_refresh=False: None
+        asyncio.run(proxy.async_added_to_hass())
+
+        def _event(value, ts):
+            state = types.SimpleNamespace(
+                state=str(value),
+                attributes={"unit_of_measurement": "°C"},
+                last_updated=SENSOR_MODULE.datetime.fromtimestamp(ts, SENSOR_MODULE.timezone.utc),
+            )
+            proxy._handle_source_state_change(types.SimpleNamespace(data={"new_state": state}))
+
+        now = SENSOR_MODULE.time()
+        _event(31, now - 60)
+        self.assertEqual(fired, [])
+        self.assertEqual(len(scheduled), 1)
+        self.assertAlmostEqual(scheduled[0][0], 60, delta=5)
+
+        _event(32, now + 200)  # a later event past the deadline triggers without the timer
+        self.assertEqual([data["state"] for _type, data in fired], ["triggered"])
+        event_type, data = fired[0]
+        self.assertEqual(event_type, "plantrun_alert")
+        self.assertEqual((data["run_id"], data["metric_type"], data["kind"], data["threshold"]), ("runAl", "temperature", "high", 30.0))
+
+        _event(29.5, now + 300)
+        self.assertEqual(len(fired), 1)
+        _event(28.5, now + 360)
+        self.assertEqual([data["state"] for _type, data in fired], ["triggered", "cleared"])
+
+
 if __name__ == "__main__":
     unittest.main()
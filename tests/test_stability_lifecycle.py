@@ -1,5 +1,6 @@
 import asyncio
 import base64
+import contextlib
 import importlib.util
 import json
 import shutil
@@ -7,6 +8,7 @@ import sys
 import tempfile
 import types
 import unittest
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parents[1]
@@ -47,6 +49,9 @@ def _install_homeassistant_stubs() -> None:
     def Coerce(_type):
         return _type
 
+    def Range(min=None, max=None):
+        return (min, max)
+
     def Any(*args):
         return args[0] if args else None
 
@@ -57,6 +62,7 @@ def _install_homeassistant_stubs() -> None:
     vol.All = All
     vol.Length = Length
     vol.Coerce = Coerce
+    vol.Range = Range
     vol.Any = Any
     sys.modules["voluptuous"] = vol
 
@@ -152,14 +158,23 @@ def _install_homeassistant_stubs() -> None:
         def __init__(self, data=None):
             self.data = data or {}
 
+    class Event:
+        def __init__(self, data=None):
+            self.data = data or {}
+
     def callback(func):
         return func
 
     core.HomeAssistant = HomeAssistant
+    core.Event = Event
     core.ServiceCall = ServiceCall
     core.callback = callback
     sys.modules["homeassistant.core"] = core
 
+    const_mod = types.ModuleType("homeassistant.const")
+    const_mod.EVENT_HOMEASSISTANT_FINAL_WRITE = "homeassistant_final_write"
+    sys.modules["homeassistant.const"] = const_mod
+
     data_flow = types.ModuleType("homeassistant.data_entry_flow")
     data_flow.FlowResult = dict
     sys.modules["homeassistant.data_entry_flow"] = data_flow
@@ -196,6 +211,31 @@ def _install_homeassistant_stubs() -> None:
     entity_registry_mod.async_entries_for_config_entry = async_entries_for_config_entry
     sys.modules["homeassistant.helpers.entity_registry"] = entity_registry_mod
 
+    event_mod = types.ModuleType("homeassistant.helpers.event")
+    event_mod._tracked = []
+
+    def async_track_utc_time_change(_hass, action, **kwargs):
+        event_mod._tracked.append(("time_change", action, kwargs))
+        return lambda: None
+
+    def async_call_later(_hass, delay, action):
+        event_mod._tracked.append(("call_later", action, {"delay": delay}))
+        return lambda: None
+
+    def async_track_time_interval(_hass, action, interval):
+        event_mod._tracked.append(("time_interval", action, {"interval": interval}))
+        return lambda: None
+
+    def async_track_state_change_event(_hass, entity_ids, action):
+        event_mod._tracked.append(("state_change", action, {"entity_ids": list(entity_ids)}))
+        return lambda: None
+
+    event_mod.async_track_utc_time_change = async_track_utc_time_change
+    event_mod.async_track_time_interval = async_track_time_interval
+    event_mod.async_track_state_change_event = async_track_state_change_event
+    event_mod.async_call_later = async_call_later
+    sys.modules["homeassistant.helpers.event"] = event_mod
+
     aiohttp_client = types.ModuleType("homeassistant.helpers.aiohttp_client")
     aiohttp_client._session = object()
 
@@ -222,8 +262,32 @@ class FakeStorage:
         self.active_run_id = None
         self.saved_runs = []
         self.calls = []
+        self.daily_rollups = {}
+        self.rollup_aggregates = {}
+        self.rollup_index = types.SimpleNamespace(add=lambda *_args: None, drop_run=lambda *_args: None)
+        self.change_listeners = []
         FakeStorage.instances.append(self)
 
+    def async_add_change_listener(self, listener):
+        self.change_listeners.append(listener)
+        return lambda: self.change_listeners.remove(listener)
+
+    async def async_commit_runs(self, run_ids):
+        self.calls.append(("commit_runs", sorted(run_ids)))
+
+    @contextlib.asynccontextmanager
+    async def async_batched_saves(self):
+        self.calls.append(("batch", "start"))
+        yield
+        self.calls.append(("batch", "end"))
+
+    async def async_set_daily_rollups(self, rollups, *, dirty=False):
+        rollups = list(rollups)
+        self.calls.append(("set_daily_rollups", len(rollups)))
+        for run_id, day, summary in rollups:
+            self.daily_rollups.setdefault(run_id, {})[day] = summary
+        return len(rollups)
+
     async def async_load(self):
         return None
 
@@ -262,6 +326,9 @@ class FakeCoordinator:
     async def async_request_refresh(self):
         return None
 
+    async def async_shutdown(self):
+        return None
+
 
 class FakeServices:
     def __init__(self):
@@ -292,6 +359,9 @@ class FakeConfigEntries:
     async def async_unload_platforms(self, _entry, _platforms):
         return True
 
+    def async_entries(self, _domain):
+        return []
+
 
 class FakeHTTP:
     def __init__(self):
@@ -415,6 +485,7 @@ class StabilityLifecycleTests(unittest.TestCase):
             config_entries=FakeConfigEntries(),
             async_add_executor_job=async_add_executor_job,
             entity_registry=FakeEntityRegistry(),
+            bus=types.SimpleNamespace(async_listen_once=lambda _event_type, _listener: lambda: None),
         )
         hass._executor_calls = executor_calls
         return hass
@@ -452,6 +523,35 @@ class StabilityLifecycleTests(unittest.TestCase):
         self.assertIn("storage", entry.runtime_data)
         self.assertIn("coordinator", entry.runtime_data)
 
+    def test_scheduled_rollups_capture_missing_days_in_one_write(self):
+        event_mod = sys.modules["homeassistant.helpers.event"]
+        event_mod._tracked.clear()
+        hass = self._build_hass()
+        entry = sys.modules["homeassistant.config_entries"].ConfigEntry("entry-rollups")
+        asyncio.run(self.integration.async_setup_entry(hass, entry))
+
+        storage = entry.runtime_data["storage"]
+        start = datetime.now(timezone.utc).replace(hour=12, minute=0, second=0, microsecond=0) - timedelta(days=3)
+        storage.runs.append(self.models.RunData(id="run-sched", friendly_name="Tent", start_time=start.isoformat()))
+
+        kinds = {kind: (action, kwargs) for kind, action, kwargs in event_mod._tracked}
+        self.assertEqual(kinds["time_change"][1], {"hour": 0, "minute": 5, "second": 0})
+        asyncio.run(kinds["time_change"][0](datetime.now(timezone.utc)))
+        asyncio.run(kinds["call_later"][0](datetime.now(timezone.utc)))
+
+        self.assertEqual(
+            [call for call in storage.calls if call[0] in ("set_daily_rollups", "batch")],
+            [
+                ("batch", "start"),
+                ("set_daily_rollups", 3),
+                ("batch", "end"),
+                ("batch", "start"),
+                ("set_daily_rollups", 0),
+                ("batch", "end"),
+            ],
+        )
+        self.assertEqual(len(storage.daily_rollups["run-sched"]), 3)
+
     def test_setup_entry_removes_only_known_legacy_singleton_entities(self):
         hass = self._build_hass()
         entry = sys.modules["homeassistant.config_entries"].ConfigEntry("entry-cleanup")
@@ -28,6 +28,7 @@ class _StubStore:
         self.saved = data
 
 
+
 def _install_homeassistant_stubs() -> None:
     ha = types.ModuleType("homeassistant")
     sys.modules.setdefault("homeassistant", ha)
@@ -152,5 +153,67 @@ class TestStoreMigration(unittest.TestCase):
         self.assertIsNone(storage.active_run_id)
 
 
+    def test_run_commits_notify_change_listeners_with_run_ids(self) -> None:
+        import asyncio
+
+        models = sys.modules["custom_components.plantrun.models"]
+        storage = PlantRunStorage(object())
+        events = []
+        remove = storage.async_add_change_listener(events.append)
+        run = models.RunData(id="run1", friendly_name="Run A", start_time="2026-03-01T00:00:00")
+
+        asyncio.run(storage.async_add_run(run))
+        asyncio.run(storage.async_update_run(run))
+        asyncio.run(storage.async_set_active_run_id("run1"))
+        asyncio.run(storage.async_commit_runs([]))
+        remove()
+        asyncio.run(storage.async_update_run(run))
+
+        self.assertEqual(events, [{"run1"}, {"run1"}])
+
+
+class TestDelayedCommit(unittest.TestCase):
+    def test_scheduled_commits_share_one_delayed_save_that_is_not_restarted(self) -> None:
+        storage = PlantRunStorage(object())
+        storage.runs = [STORE_MODULE.RunData(id="run1", friendly_name="A", start_time="2026-03-01T00:00:00")]
+        notified = []
+        storage.async_add_change_listener(notified.append)
+        delays = []
+        storage._store.async_delay_save = lambda data_func, delay: delays.append((data_func, delay))
+
+        storage.async_schedule_commit_runs(["run1"], delay_s=900)
+        storage.async_schedule_commit_runs(["run1"], delay_s=900)
+        self.assertEqual(len(delays), 1)
+        self.assertEqual(notified, [{"run1"}, {"run1"}])
+        self.assertEqual(storage.run_revision("run1"), 2)
+
+        payload = delays[0][0]()
+        self.assertEqual(payload["runs"][0]["id"], "run1")
+        storage.async_schedule_commit_runs(["run1"], delay_s=900)
+        self.assertEqual(len(delays), 2)
+
+    def test_batched_saves_write_once_when_the_block_exits(self) -> None:
+        import asyncio
+
+        storage = PlantRunStorage(object())
+        writes = []
+
+        async def _save(data):
+            writes.append(data)
+
+        storage._store.async_save = _save
+
+        async def _run() -> None:
+            async with storage.async_batched_saves():
+                await storage.async_set_daily_rollups([("run1", "2026-03-01", {"energy_kwh": 1.0})])
+                await storage.async_commit_runs([])
+                self.assertEqual(writes, [])
+            self.assertEqual(len(writes), 1)
+            await storage.async_commit_runs([])
+            self.assertEqual(len(writes), 2)
+
+        asyncio.run(_run())
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,135 @@
+import importlib.util
+import random
+import sys
+import types
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+PLANTRUN_DIR = ROOT / "custom_components" / "plantrun"
+
+
+def _load_module(name: str, path: Path):
+    spec = importlib.util.spec_from_file_location(name, path)
+    assert spec and spec.loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+custom_components = types.ModuleType("custom_components")
+custom_components.__path__ = [str(ROOT / "custom_components")]
+sys.modules.setdefault("custom_components", custom_components)
+plantrun_pkg = types.ModuleType("custom_components.plantrun")
+plantrun_pkg.__path__ = [str(PLANTRUN_DIR)]
+sys.modules["custom_components.plantrun"] = plantrun_pkg
+
+STATS = _load_module("custom_components.plantrun.streaming_stats", PLANTRUN_DIR / "streaming_stats.py")
+
+
+class TestP2Quantile(unittest.TestCase):
+    def test_estimates_track_exact_quantiles(self) -> None:
+        rng = random.Random(42)
+        samples = [rng.gauss(24.0, 2.0) for _ in range(5000)]
+        ordered = sorted(samples)
+        for p in (0.05, 0.5, 0.95):
+            estimator = STATS.P2Quantile(p)
+            for value in samples:
+                estimator.add(value)
+            exact = ordered[int(p * (len(ordered) - 1))]
+            self.assertAlmostEqual(estimator.value(), exact, delta=0.15)
+
+    def test_small_samples_are_exact(self) -> None:
+        estimator = STATS.P2Quantile(0.5)
+        self.assertIsNone(estimator.value())
+        for value in (3.0, 1.0, 2.0):
+            estimator.add(value)
+        self.assertEqual(estimator.value(), 2.0)
+
+    def test_serialized_state_resumes_identically(self) -> None:
+        rng = random.Random(7)
+        samples = [rng.uniform(0, 100) for _ in range(400)]
+        straight = STATS.P2Quantile(0.95)
+        for value in samples:
+            straight.add(value)
+
+        resumed = STATS.P2Quantile(0.95)
+        for value in samples[:150]:
+            resumed.add(value)
+        resumed = STATS.P2Quantile.from_dict(resumed.to_dict())
+        for value in samples[150:]:
+            resumed.add(value)
+
+        self.assertEqual(straight.value(), resumed.value())
+
+
+class TestTimeInRange(unittest.TestCase):
+    def test_sample_and_hold_attribution(self) -> None:
+        acc = STATS.TimeInRange(18.0, 28.0)
+        acc.add(0, 25.0)
+        acc.add(3600, 29.0)
+        acc.add(3 * 3600, 17.0)
+        acc.add(4 * 3600, 20.0)
+        acc.add(3600, 40.0)  # out of order, ignored
+
+        summary = acc.summary()
+        self.assertEqual(summary["within_hours"], 1.0)
+        self.assertEqual(summary["above_hours"], 2.0)
+        self.assertEqual(summary["below_hours"], 1.0)
+
+
+class TestMetricAccumulator(unittest.TestCase):
+    def test_summary_round_trip_keeps_stats(self) -> None:
+        acc = STATS.MetricAccumulator(value_range=(None, 28.0))
+        for index, value in enumerate((21.0, 23.0, 29.0, 22.0)):
+            acc.add(value, index * 1800.0)
+
+        restored = STATS.MetricAccumulator.from_dict(acc.to_dict())
+        self.assertEqual(acc.summary(), restored.summary())
+        self.assertEqual(restored.summary()["avg"], 23.75)
+        self.assertEqual(restored.summary()["time_in_range"]["above_hours"], 0.5)
+
+    def test_empty_accumulator_reports_nulls(self) -> None:
+        summary = STATS.MetricAccumulator().summary()
+        self.assertIsNone(summary["avg"])
+        self.assertIsNone(summary["p50"])
+        self.assertIsNone(summary["time_in_range"])
+
+
+class TestEnergyAccumulator(unittest.TestCase):
+    def test_counter_reset_sums_monotonic_segments(self) -> None:
+        acc = STATS.EnergyAccumulator()
+        for hour, value in enumerate((100.0, 101.0, 102.5, 0.3, 1.3)):
+            acc.add(value, hour * 3600.0)
+        self.assertAlmostEqual(acc.total_kwh, 3.8)
+        self.assertEqual((acc.resets, acc.swaps, acc.segments), (1, 0, 2))
+
+    def test_meter_swap_rebaselines_without_counting(self) -> None:
+        acc = STATS.EnergyAccumulator()
+        acc.add(50.0, 0.0)
+        acc.add(52.0, 3600.0)
+        acc.add(1500.0, 7200.0)  # swapped in a meter with a much larger lifetime total
+        acc.add(1501.0, 10800.0)
+        acc.add(900.0, 14400.0)  # swapped again, to a smaller non-zero meter
+        acc.add(901.5, 18000.0)
+        self.assertAlmostEqual(acc.total_kwh, 4.5)
+        self.assertEqual(acc.swaps, 2)
+
+    def test_source_change_and_jitter(self) -> None:
+        acc = STATS.EnergyAccumulator()
+        acc.add(10.0, source="sensor.plug_a")
+        acc.add(12.0, source="sensor.plug_a")
+        acc.add(11.9, source="sensor.plug_a")  # jitter, ignored
+        acc.add(12.4, source="sensor.plug_a")
+        acc.add(7.0, source="sensor.plug_b")
+        acc.add(8.0, source="sensor.plug_b")
+        self.assertAlmostEqual(acc.total_kwh, 3.4)
+
+        restored = STATS.EnergyAccumulator.from_dict(acc.to_dict())
+        restored.add(9.0, source="sensor.plug_b")
+        self.assertAlmostEqual(restored.total_kwh, 4.4)
+
+
+if __name__ == "__main__":
+    unittest.main()
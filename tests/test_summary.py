@@ -115,6 +115,57 @@ class TestSummary(unittest.TestCase):
         self.assertEqual(summary["energy_kwh"], 4.0)
         self.assertEqual(summary["energy_cost"], 2.0)
 
+    def test_summary_energy_survives_counter_reset_and_resumes_incrementally(self) -> None:
+        run = RunData(
+            id="run-reset",
+            friendly_name="Tent Reset",
+            start_time="2026-03-01T00:00:00+00:00",
+            sensor_history={
+                "energy": [
+                    {"timestamp": "2026-03-01T00:00:00+00:00", "value": 40.0},
+                    {"timestamp": "2026-03-01T01:00:00+00:00", "value": 41.0},
+                    {"timestamp": "2026-03-01T02:00:00+00:00", "value": 0.5},
+                ]
+            },
+        )
+
+        self.assertEqual(SUMMARY.build_run_summary(run)["energy_kwh"], 1.5)
+        self.assertEqual(run.energy_state["processed"], 3)
+
+        run.sensor_history["energy"].append({"timestamp": "2026-03-01T03:00:00+00:00", "value": 1.5})
+        self.assertEqual(SUMMARY.run_energy_kwh(run), 2.5)
+        self.assertEqual(run.energy_state["accumulator"]["count"], 4)
+
+        restored = RunData.from_dict(run.to_dict())
+        self.assertEqual(SUMMARY.run_energy_kwh(restored), 2.5)
+        restored.sensor_history["energy"] = restored.sensor_history["energy"][:2]  # rewritten history rebuilds
+        self.assertEqual(SUMMARY.run_energy_kwh(restored), 1.0)
+
+    def test_summary_reports_quantiles_and_time_in_range(self) -> None:
+        run = RunData(
+            id="run-climate",
+            friendly_name="Tent Climate",
+            start_time="2026-03-01T00:00:00+00:00",
+            end_time="2026-03-01T06:00:00+00:00",
+            base_config={"metric_ranges": {"temperature": {"high": 28}}},
+            sensor_history={
+                "temperature": [
+                    {"timestamp": f"2026-03-01T0{hour}:00:00+00:00", "value": value}
+                    for hour, value in enumerate((24.0, 29.0, 30.0, 26.0, 25.0, 24.5))
+                ],
+                "humidity": [{"timestamp": "2026-03-01T01:00:00+00:00", "value": 55.0}],
+            },
+        )
+
+        summary = SUMMARY.build_run_summary(run)
+        temperature = summary["temperature"]
+        self.assertAlmostEqual(temperature["p50"], 25.5, delta=0.5)
+        self.assertEqual(temperature["time_in_range"]["above_hours"], 2.0)
+        self.assertEqual(temperature["time_in_range"]["within_hours"], 3.0)
+        self.assertIsNone(temperature["time_in_range"]["low"])
+        self.assertEqual(summary["humidity"]["time_in_range"]["within_hours"], 0.0)
+        self.assertIsNone(summary["water"]["p95"])
+
     def test_instrumentation_does_not_change_summary_payload(self) -> None:
         run = RunData(
             id="run-instrumented",
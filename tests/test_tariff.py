@@ -0,0 +1,145 @@
+import importlib.util
+import sys
+import types
+import unittest
+from datetime import datetime, timezone
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+ROOT = Path(__file__).resolve().parents[1]
+PLANTRUN_DIR = ROOT / "custom_components" / "plantrun"
+
+
+def _load_module(name: str, path: Path):
+    spec = importlib.util.spec_from_file_location(name, path)
+    assert spec and spec.loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+custom_components = types.ModuleType("custom_components")
+custom_components.__path__ = [str(ROOT / "custom_components")]
+sys.modules.setdefault("custom_components", custom_components)
+plantrun_pkg = types.ModuleType("custom_components.plantrun")
+plantrun_pkg.__path__ = [str(PLANTRUN_DIR)]
+sys.modules["custom_components.plantrun"] = plantrun_pkg
+
+MODELS = _load_module("custom_components.plantrun.models", PLANTRUN_DIR / "models.py")
+TARIFF = _load_module("custom_components.plantrun.tariff", PLANTRUN_DIR / "tariff.py")
+SUMMARY = _load_module("custom_components.plantrun.summary", PLANTRUN_DIR / "summary.py")
+RunData = MODELS.RunData
+
+
+def _ts(value: str) -> float:
+    return datetime.fromisoformat(value).timestamp()
+
+
+def _night_schedule(**kwargs):
+    bands = [TARIFF.TariffBand.from_dict(band) for band in TARIFF.parse_tariff_spec("22:00-06:00=0.10")]
+    return TARIFF.TariffSchedule(bands, default_price=0.30, **kwargs)
+
+
+class TestTariffSchedule(unittest.TestCase):
+    def test_spec_round_trip_and_validation(self) -> None:
+        bands = TARIFF.parse_tariff_spec("22:00-06:00=0.18; 06:00-22:00=0.32@mon-fri")
+        self.assertEqual(bands[1]["weekdays"], [0, 1, 2, 3, 4])
+        self.assertEqual(TARIFF.format_tariff_spec(bands), "22:00-06:00=0.18; 06:00-22:00=0.32@mon,tue,wed,thu,fri")
+        with self.assertRaises(ValueError):
+            TARIFF.parse_tariff_spec("22:00=0.18")
+
+    def test_segments_split_at_band_boundaries_across_midnight(self) -> None:
+        schedule = _night_schedule()
+        segments = schedule.segments(_ts("2026-03-02T20:00:00+00:00"), _ts("2026-03-03T08:00:00+00:00"))
+        self.assertEqual([price for _start, _end, price in segments], [0.30, 0.10, 0.30])
+        self.assertEqual(segments[1][1] - segments[1][0], 8 * 3600)
+        cost = schedule.interval_cost(12.0, _ts("2026-03-02T20:00:00+00:00"), _ts("2026-03-03T08:00:00+00:00"))
+        self.assertAlmostEqual(cost, 4 * 0.30 + 8 * 0.10)
+
+    def test_bands_follow_local_time_zone(self) -> None:
+        schedule = _night_schedule(tz=ZoneInfo("Europe/Berlin"))
+        self.assertEqual(schedule.price_at(_ts("2026-03-02T21:30:00+00:00")), 0.10)
+        self.assertEqual(schedule.price_at(_ts("2026-03-02T05:30:00+00:00")), 0.30)
+
+    def test_closed_hours_are_costed_once(self) -> None:
+        schedule = _night_schedule()
+        hourly: dict[str, float] = {}
+        start = _ts("2026-03-02T21:00:00+00:00")
+        TARIFF.spread_hourly_kwh(hourly, start, start + 2 * 3600, 2.0)
+        cost, cache = TARIFF.hourly_energy_cost(hourly, schedule, last_ts=start + 2 * 3600, cache=None)
+        self.assertAlmostEqual(cost, 0.30 + 0.10)
+        self.assertEqual(cache["closed_through"], int(start) + 3600)
+        self.assertEqual(hourly, {})
+
+        cache["closed_cost"] += 100.0  # prove closed hours are not re-priced
+        cost, _cache = TARIFF.hourly_energy_cost(hourly, schedule, last_ts=start + 2 * 3600, cache=cache)
+        self.assertAlmostEqual(cost, 100.40)
+
+        other = TARIFF.TariffSchedule(default_price=0.20)
+        self.assertIsNone(TARIFF.hourly_energy_cost(hourly, other, last_ts=start + 2 * 3600, cache=cache)[0])
+
+    def test_unpriced_hours_are_bounded(self) -> None:
+        hourly: dict[str, float] = {}
+        start = _ts("2026-03-02T00:00:00+00:00")
+        TARIFF.spread_hourly_kwh(hourly, start, start + 10 * 3600, 10.0)
+        cache = TARIFF.discard_unpriced_hours(hourly, None, last_ts=start + 10 * 3600, keep_hours=4)
+        self.assertEqual(sorted(hourly), [str(int(start) + hour * 3600) for hour in range(6, 10)])
+        self.assertEqual(cache["closed_through"], int(start) + 5 * 3600)
+        self.assertIsNone(TARIFF.hourly_energy_cost(hourly, _night_schedule(), last_ts=start + 10 * 3600, cache=cache)[0])
+
+    def test_price_entity_state_binds_current_price(self) -> None:
+        schedule = TARIFF.TariffSchedule(default_price=0.25, price_entity_id="sensor.spot_price")
+        bound = TARIFF.bind_price_entity(schedule, types.SimpleNamespace(state="0.41"))
+        self.assertEqual(bound.default_price, 0.41)
+        self.assertEqual(bound.key, schedule.key)
+        self.assertIs(TARIFF.bind_price_entity(schedule, types.SimpleNamespace(state="unavailable")), schedule)
+
+
+class TestTariffSummary(unittest.TestCase):
+    def test_summary_cost_follows_time_of_use_bands(self) -> None:
+        run = RunData(
+            id="run-tou",
+            friendly_name="Tent Night",
+            start_time="2026-03-02T20:00:00+00:00",
+            end_time="2026-03-03T08:00:00+00:00",
+            sensor_history={
+                "energy": [
+                    {"timestamp": f"2026-03-0{2 + (20 + hour) // 24}T{(20 + hour) % 24:02d}:00:00+00:00", "value": 5.0 + hour}
+                    for hour in range(13)
+                ]
+            },
+        )
+        prefs = SUMMARY.summary_energy_preferences_from_options(
+            {"electricity_price_per_kwh": 0.30, "tariff_bands": [{"start": "22:00", "end": "06:00", "price": 0.10}]}
+        )
+        summary = SUMMARY.build_run_summary(run, **prefs)
+        self.assertEqual(summary["energy_kwh"], 12.0)
+        self.assertAlmostEqual(summary["energy_cost"], 4 * 0.30 + 8 * 0.10)
+        self.assertEqual(summary["energy_pricing"], "time_of_use")
+        self.assertIsNone(SUMMARY.summary_energy_preferences_from_options({})["energy_tariff"])
+
+    def test_open_run_keeps_only_open_hours_and_reprices_on_tariff_change(self) -> None:
+        run = RunData(
+            id="run-open",
+            friendly_name="Tent Open",
+            start_time="2026-03-02T20:00:00+00:00",
+            sensor_history={
+                "energy": [
+                    {"timestamp": f"2026-03-0{2 + (20 + hour) // 24}T{(20 + hour) % 24:02d}:00:00+00:00", "value": 5.0 + hour}
+                    for hour in range(13)
+                ]
+            },
+        )
+        now = datetime(2026, 3, 3, 8, 30, tzinfo=timezone.utc)
+        night = _night_schedule()
+        self.assertAlmostEqual(SUMMARY.run_energy_cost(run, night, now=now), 4 * 0.30 + 8 * 0.10)
+        self.assertEqual(run.energy_state["hourly_kwh"], {})
+
+        flat = TARIFF.TariffSchedule(default_price=0.20)
+        self.assertAlmostEqual(SUMMARY.run_energy_cost(run, flat, now=now), 12 * 0.20)
+        self.assertEqual(run.energy_state["tariff_cache"]["key"], flat.key)
+
+
+if __name__ == "__main__":
+    unittest.main()
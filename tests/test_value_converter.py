@@ -0,0 +1,64 @@
+import importlib.util
+import sys
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+MODULE_PATH = ROOT / "custom_components" / "plantrun" / "value_converter.py"
+
+spec = importlib.util.spec_from_file_location("plantrun_value_converter", MODULE_PATH)
+assert spec and spec.loader
+converter_mod = importlib.util.module_from_spec(spec)
+sys.modules["plantrun_value_converter"] = converter_mod
+spec.loader.exec_module(converter_mod)
+
+compile_converter = converter_mod.compile_converter
+
+METADATA = {
+    "temperature": {"device_class": "temperature", "state_class": "measurement", "unit": "°C"},
+    "energy": {"device_class": "energy", "state_class": "total_increasing", "unit": "kWh"},
+    "light": {"state_class": "measurement"},
+}
+
+
+class TestValueConverter(unittest.TestCase):
+    def test_fahrenheit_source_is_converted_to_celsius(self):
+        converter = compile_converter("temperature", {"unit_of_measurement": "°F"}, METADATA)
+
+        self.assertEqual(converter.unit, "°C")
+        self.assertFalse(converter.unit_drift)
+        self.assertEqual(converter.convert("212"), 100)
+        self.assertEqual(converter.convert("70"), 21.111111)
+        self.assertEqual(converter.convert(32), 0)
+
+    def test_energy_units_scale_to_kwh(self):
+        self.assertEqual(compile_converter("energy", {"unit_of_measurement": "Wh"}, METADATA).convert("2500"), 2.5)
+        self.assertEqual(compile_converter("energy", {"unit_of_measurement": "MWh"}, METADATA).convert("0,5"), 500)
+
+    def test_canonical_unit_passes_values_through(self):
+        converter = compile_converter("temperature", {"unit_of_measurement": "°C"}, METADATA)
+
+        self.assertIsNone(converter.scale)
+        self.assertEqual(converter.convert("21.4"), 21.4)
+        self.assertEqual(converter.convert(21), 21)
+        self.assertIsNone(converter.convert(" Unavailable "))
+        self.assertIsNone(converter.convert("warm"))
+
+    def test_unknown_unit_is_kept_and_flagged(self):
+        converter = compile_converter("temperature", {"unit_of_measurement": "°Ré"}, METADATA)
+
+        self.assertTrue(converter.unit_drift)
+        self.assertEqual(converter.unit, "°Ré")
+        self.assertEqual(converter.convert("16"), 16)
+
+    def test_light_aliases_and_unknown_metrics(self):
+        light = compile_converter("light", {"unit_of_measurement": "Lux"}, METADATA)
+        self.assertEqual((light.unit, light.device_class), ("lx", "illuminance"))
+
+        other = compile_converter("camera", {"unit_of_measurement": None}, METADATA)
+        self.assertFalse(other.numeric)
+        self.assertEqual(other.convert(" snapshot "), "snapshot")
+
+
+if __name__ == "__main__":
+    unittest.main()